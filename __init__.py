@@ -1,7 +1,3 @@
-import os
+from .celery_app import app as celery_app
 
-if os.environ.get("DJANGO_DEBUG") == "true":
-    from .celery_app import app as celery_app
-
-
-    __all__ = ("celery_app",)
+__all__ = ("celery_app",)
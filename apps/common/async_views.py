@@ -0,0 +1,188 @@
+"""
+Async (ASGI) execution path for /graphql/.
+
+AsyncAuthenticatedGraphQLView runs query operations on the event loop:
+ - root fields with an `aresolve_<field>` method on the root Query type run
+   natively async (Django async ORM),
+ - every other resolver runs through sync_to_async so ORM access never
+   blocks the loop,
+ - graphql-core gathers independent root fields of one operation
+   concurrently,
+ - cache and Redis calls (persisted queries, the cost check, the response
+   cache, replica pins, rate limits) run through sync_to_async too, so a
+   slow round trip does not stall the other requests on the loop.
+
+Mutations, GraphiQL and malformed requests fall back to the sync view in a
+worker thread, so transaction handling stays exactly as in WSGI mode.
+"""
+
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.db.models import Manager, Model, QuerySet
+from django.http import HttpResponse
+from graphene.utils.str_converters import to_snake_case
+from graphene_django.views import HttpError
+from graphql import ExecutionResult, execute
+
+from social_media_feed.db_router import read_from_replica, replica_allowed
+from .rate_limit import RateLimitMiddleware, add_rate_limit_headers
+from .views import AuthenticatedGraphQLView, PreparedOperation
+
+
+def _resolve_in_thread(next, root, info, args):
+    result = next(root, info, **args)
+    # Evaluate lazy querysets here rather than on the event loop
+    if isinstance(result, Manager):
+        result = result.all()
+    if isinstance(result, QuerySet):
+        return list(result)
+    return result
+
+
+def _is_loaded_attribute(root, field_name):
+    """True if resolving the field is a plain attribute read on a model."""
+    if not isinstance(root, Model):
+        return False
+    try:
+        field = root._meta.get_field(field_name)
+    except Exception:
+        return False
+    return field.concrete and not field.is_relation and field.attname in root.__dict__
+
+
+class AsyncResolverMiddleware:
+    """
+    Graphene middleware used by the async view to dispatch resolvers.
+    Must come last in the middleware list (only rate limiting goes after
+    it): graphql-core makes the last middleware the outermost one, so this
+    wraps all the others.
+    """
+
+    def resolve(self, next, root, info, **args):
+        field_name = to_snake_case(info.field_name)
+
+        if info.path.prev is None:
+            graphene_type = getattr(info.parent_type, "graphene_type", None)
+            async_resolver = getattr(graphene_type, f"aresolve_{field_name}", None)
+            if async_resolver is not None:
+                return async_resolver(root, info, **args)
+
+        if _is_loaded_attribute(root, field_name):
+            return next(root, info, **args)
+
+        return sync_to_async(_resolve_in_thread)(next, root, info, args)
+
+
+class AsyncRateLimitMiddleware(RateLimitMiddleware):
+    """
+    RateLimitMiddleware for the async view: takes the token in a worker
+    thread (the Redis backend is a blocking call). Goes after
+    AsyncResolverMiddleware so it also sees root fields with an async
+    resolver, which that middleware calls directly.
+    """
+
+    def resolve(self, next, root, info, **args):
+        if info.path.prev is not None:
+            return next(root, info, **args)
+
+        async def limited():
+            await sync_to_async(self.enforce)(info)
+            result = next(root, info, **args)
+            return await result if isawaitable(result) else result
+
+        return limited()
+
+
+class AsyncAuthenticatedGraphQLView(AuthenticatedGraphQLView):
+    """
+    ASGI variant of AuthenticatedGraphQLView (see module docstring).
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        return self.adispatch(request, *args, **kwargs)
+
+    # Django serves a class-based view async only when all its handlers are
+    async def get(self, request, *args, **kwargs):
+        return await self.adispatch(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        return await self.adispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        await sync_to_async(self.authenticate_request)(request)
+
+        # Parsing, persisted-query lookups and the cost check read the cache
+        prepared = await sync_to_async(self.prepare_async_operation)(request)
+        if prepared is None:
+            return await sync_to_async(self.graphql_dispatch)(request, *args, **kwargs)
+
+        try:
+            result = await self.aexecute_operation(request, prepared)
+        except Exception as e:
+            result = ExecutionResult(errors=[e])
+
+        status_code = 200
+        response = {}
+        if result.errors:
+            response["errors"] = [self.format_error(e) for e in result.errors]
+        if result.errors and any(not getattr(e, "path", None) for e in result.errors):
+            status_code = 400
+        else:
+            response["data"] = result.data
+
+        http_response = HttpResponse(
+            status=status_code,
+            content=self.json_encode(request, response),
+            content_type="application/json",
+        )
+        add_rate_limit_headers(request, http_response)
+        return self.add_cache_headers(request, http_response)
+
+    def prepare_async_operation(self, request):
+        """
+        Return a PreparedOperation if the request is a plain query that can
+        run on the event loop, otherwise None (sync fallback).
+        """
+        if request.method.lower() not in ("get", "post") or self.batch:
+            return None
+        try:
+            data = self.parse_body(request)
+            if self.graphiql and self.can_display_graphiql(request, data):
+                return None
+            query, variables, operation_name, _id = self.get_graphql_params(request, data)
+            prepared = self.prepare_operation(request, data, query, variables, operation_name)
+        except HttpError:
+            return None
+
+        if isinstance(prepared, PreparedOperation) and prepared.is_query:
+            return prepared
+        return None
+
+    async def aexecute_operation(self, request, prepared):
+        plan = await sync_to_async(self.get_cache_plan)(request, prepared)
+        if plan is not None:
+            cached = await sync_to_async(plan.get)()
+            if cached is not None:
+                return ExecutionResult(data=cached)
+
+        middleware = list(self.get_middleware(request) or [])
+        limited = any(isinstance(m, RateLimitMiddleware) for m in middleware)
+        middleware = [
+            *(m for m in middleware if not isinstance(m, RateLimitMiddleware)),
+            AsyncResolverMiddleware(),
+            *([AsyncRateLimitMiddleware()] if limited else []),
+        ]
+        allowed = await sync_to_async(replica_allowed)(request.user)
+        with read_from_replica(request.user, allowed=allowed):
+            result = execute(
+                self.schema.graphql_schema,
+                prepared.document,
+                **self.get_execute_options(request, prepared, middleware),
+            )
+            if isawaitable(result):
+                result = await result
+
+        if plan is not None and not result.errors:
+            await sync_to_async(plan.set)(result.data)
+        return result
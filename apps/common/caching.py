@@ -0,0 +1,17 @@
+"""
+Helpers for code that relies on the default cache being shared.
+
+Cache-backed fast paths (e.g. the refresh-token blacklist) are only
+correct when every process reads the same cache; with a per-process
+backend they fall back to the database.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PER_PROCESS_BACKENDS = (LocMemCache, DummyCache)
+
+
+def cache_is_shared(alias="default"):
+    """True if writes to the `alias` cache are visible to other processes."""
+    return not isinstance(caches[alias], PER_PROCESS_BACKENDS)
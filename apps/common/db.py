@@ -0,0 +1,94 @@
+"""
+Database helpers that work the same with persistent connections, Django's
+psycopg pool and PgBouncer in transaction mode.
+"""
+import time
+
+from django.db import connections
+
+
+def server_side_cursors_enabled(using="default"):
+    connection = connections[using]
+    return connection.vendor == "postgresql" and not connection.settings_dict.get("DISABLE_SERVER_SIDE_CURSORS")
+
+
+def iterate_in_chunks(queryset, chunk_size=2000):
+    """
+    Stream a large queryset without loading it into memory.
+
+    Uses a server-side cursor where available. Behind PgBouncer (transaction
+    mode) or on other backends, falls back to keyset pagination on the
+    primary key, so each chunk is a separate short query; rows then come
+    back in primary key order.
+    """
+    if server_side_cursors_enabled(queryset.db):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    pk_name = queryset.model._meta.pk.attname
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(chunk[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1]
+        if isinstance(last, dict):
+            last_pk = last.get(pk_name, last.get("pk"))
+        else:
+            last_pk = getattr(last, "pk", None)
+        if last_pk is None:
+            raise ValueError("iterate_in_chunks needs the primary key in values() querysets")
+
+
+def raw_delete(queryset):
+    """
+    DELETE the queryset's rows with a single statement and return the count.
+
+    Unlike QuerySet.delete() this does not collect related rows in Python,
+    cascade, or send pre/post_delete signals: the caller must already have
+    deleted (in the same transaction) every row that references these.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def connection_stats(using="default"):
+    """
+    Connection health for /health/db/: checkout latency of a trivial query
+    and, when pooling is enabled, the psycopg pool statistics.
+    """
+    connection = connections[using]
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    checkout_ms = (time.perf_counter() - started) * 1000
+
+    stats = {
+        "alias": using,
+        "vendor": connection.vendor,
+        "checkout_ms": round(checkout_ms, 2),
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE"),
+        "health_checks": connection.settings_dict.get("CONN_HEALTH_CHECKS"),
+        "server_side_cursors": server_side_cursors_enabled(using),
+        "pooled": False,
+    }
+
+    pool = getattr(connection, "pool", None)
+    if pool is not None:
+        pool_stats = pool.get_stats()
+        requests = pool_stats.get("requests_num", 0)
+        stats.update({
+            "pooled": True,
+            "pool_min": pool.min_size,
+            "pool_max": pool.max_size,
+            "pool_size": pool_stats.get("pool_size", 0),
+            "pool_available": pool_stats.get("pool_available", 0),
+            "waiting": pool_stats.get("requests_waiting", 0),
+            "requests": requests,
+            "avg_wait_ms": round(pool_stats.get("requests_wait_ms", 0) / requests, 2) if requests else 0.0,
+            "timeouts": pool_stats.get("requests_errors", 0),
+        })
+    return stats
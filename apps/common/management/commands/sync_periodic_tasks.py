@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from apps.common.periodic import sync_periodic_tasks
+
+
+class Command(BaseCommand):
+    help = "Make django_celery_beat's periodic tasks match settings.CELERY_BEAT_SCHEDULE (run on deploy)."
+
+    def handle(self, *args, **options):
+        result = sync_periodic_tasks()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Synced {len(result['synced'])} periodic tasks; removed {result['removed'] or 'none'}"
+        ))
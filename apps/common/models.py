@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class Watermark(models.Model):
+    """
+    How far an incremental job has got: the last primary key it processed
+    and/or when it last ran. See apps/common/watermarks.py.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
@@ -0,0 +1,31 @@
+"""
+Sync the periodic task registry (settings.CELERY_BEAT_SCHEDULE) into
+django_celery_beat's tables, which beat's DatabaseScheduler reads.
+
+Entries the sync creates are marked as managed: they are updated to match
+the registry on every sync and deleted once removed from it. Tasks added
+by hand in the admin are left alone.
+"""
+from django.conf import settings
+from django.db import transaction
+from django_celery_beat.models import PeriodicTask
+from django_celery_beat.schedulers import ModelEntry
+
+MANAGED_DESCRIPTION = "Managed by sync_periodic_tasks (settings.CELERY_BEAT_SCHEDULE)"
+
+
+def sync_periodic_tasks(schedule=None):
+    """
+    Create or update a PeriodicTask per registry entry and delete managed
+    ones no longer declared. Returns {"synced": [...], "removed": [...]}.
+    """
+    schedule = settings.CELERY_BEAT_SCHEDULE if schedule is None else schedule
+    with transaction.atomic():
+        for name, entry in schedule.items():
+            ModelEntry.from_entry(name, **entry)
+        PeriodicTask.objects.filter(name__in=schedule).update(description=MANAGED_DESCRIPTION, enabled=True)
+
+        stale = PeriodicTask.objects.filter(description=MANAGED_DESCRIPTION).exclude(name__in=schedule)
+        removed = sorted(stale.values_list("name", flat=True))
+        stale.delete()
+    return {"synced": sorted(schedule), "removed": removed}
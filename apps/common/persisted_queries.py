@@ -0,0 +1,192 @@
+"""
+Automatic persisted queries (APQ) and a parsed-document cache for /graphql/.
+
+Clients may send `extensions.persistedQuery.sha256Hash` instead of (or along
+with) the query text, following the Apollo APQ protocol:
+ - hash only: the query is looked up in the store; if unknown the client gets
+   a `PersistedQueryNotFound` error and retries with the full text.
+ - hash + query: the hash is verified and the query is registered.
+
+In allowlist mode (GRAPHQL_PERSISTED_QUERIES["ALLOWLIST_ONLY"]) only queries
+listed in the manifest file are executed and nothing new can be registered.
+The manifest is a JSON object mapping sha256 hashes to query text.
+
+Parsed and validated documents are kept in a process-wide LRU keyed by the
+query hash, so hot queries skip parsing and validation entirely.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import parse, validate
+
+
+DEFAULTS = {
+    "ALLOWLIST_ONLY": False,
+    "MANIFEST": None,
+    "DOCUMENT_CACHE_SIZE": 256,
+    "TIMEOUT": 60 * 60 * 24,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "GRAPHQL_PERSISTED_QUERIES", {})}
+
+
+class PersistedQueryError(Exception):
+    """Raised when a persisted-query request cannot be served."""
+
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_persisted_query_hash(extensions):
+    """Extract the sha256 hash from the request's APQ extension, if any."""
+    extensions = extensions or {}
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            raise PersistedQueryError("Extensions are invalid JSON.", "BAD_REQUEST")
+
+    persisted = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+    if not persisted:
+        return None
+
+    if persisted.get("version", 1) != 1:
+        raise PersistedQueryError("Unsupported persisted query version.", "PERSISTED_QUERY_NOT_SUPPORTED")
+    return persisted.get("sha256Hash")
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def load_manifest():
+    """Load the allowlist manifest once per process."""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                path = get_config()["MANIFEST"]
+                if path:
+                    with open(path, encoding="utf-8") as f:
+                        _manifest = json.load(f)
+                else:
+                    _manifest = {}
+    return _manifest
+
+
+def reset_manifest():
+    global _manifest
+    _manifest = None
+
+
+def store_key(sha256_hash):
+    return f"apq:{sha256_hash}"
+
+
+def resolve_query(extensions, query):
+    """
+    Return the query text to execute for this request.
+    `extensions` is the request's GraphQL extensions (dict or JSON string).
+    Raises PersistedQueryError for unknown, mismatched or disallowed queries.
+    """
+    config = get_config()
+    sha256_hash = get_persisted_query_hash(extensions)
+
+    if config["ALLOWLIST_ONLY"]:
+        manifest = load_manifest()
+        if sha256_hash is None and query:
+            sha256_hash = query_hash(query)
+        if sha256_hash not in manifest:
+            raise PersistedQueryError("PersistedQueryNotAllowed", "PERSISTED_QUERY_NOT_ALLOWED")
+        return manifest[sha256_hash]
+
+    if sha256_hash is None:
+        return query
+
+    if query:
+        if query_hash(query) != sha256_hash:
+            raise PersistedQueryError("provided sha does not match query", "BAD_REQUEST")
+        cache.set(store_key(sha256_hash), query, timeout=config["TIMEOUT"])
+        return query
+
+    query = load_manifest().get(sha256_hash) or cache.get(store_key(sha256_hash))
+    if query is None:
+        raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+    return query
+
+
+class DocumentCache:
+    """
+    Thread-safe LRU of parsed documents and their validation errors.
+    Entries are keyed by query hash and validation rules, since the schema
+    is fixed for the lifetime of the process.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+document_cache = DocumentCache(get_config()["DOCUMENT_CACHE_SIZE"])
+
+
+def get_validated_document(schema, query, validation_rules=None, max_errors=None):
+    """
+    Parse and validate `query` against `schema`, reusing cached results.
+    Returns (document, errors); parse failures are returned as errors too.
+    """
+    key = (query_hash(query), tuple(validation_rules or ()))
+    entry = document_cache.get(key)
+    if entry is not None:
+        return entry
+
+    try:
+        document = parse(query)
+    except Exception as e:
+        # Syntax errors are cheap to reproduce and not worth caching.
+        return None, [e]
+
+    errors = validate(schema, document, validation_rules, max_errors)
+    entry = (document, errors)
+    document_cache.set(key, entry)
+    return entry
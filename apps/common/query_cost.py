@@ -0,0 +1,215 @@
+"""
+Query cost estimation and depth limiting for /graphql/.
+
+Every operation is scored before execution:
+ - each field costs its weight (GRAPHQL_QUERY_COST["FIELD_WEIGHTS"], keyed by
+   "TypeName.fieldName"; object fields default to 1 and scalars to 0),
+ - a list field costs its expected size times its selection's cost (at
+   least 1 per item): its `limit`/`first` argument, else that of the page
+   object it is nested in (e.g. `commentThread(first: 5) { comments }`),
+   else DEFAULT_LIST_SIZE, capped at MAX_LIST_SIZE. List resolvers cap what
+   they return with page_size(), so the estimate matches what runs,
+ - selections nested deeper than MAX_DEPTH are rejected outright.
+
+Operations over MAX_COST are rejected with a QUERY_TOO_COMPLEX error. The
+computed cost is reported in the response `extensions` so weights can be tuned.
+"""
+
+from django.conf import settings
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    IntValueNode,
+    ListValueNode,
+    ValidationRule,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    is_composite_type,
+    is_list_type,
+)
+
+
+DEFAULTS = {
+    "MAX_COST": 5000,
+    "MAX_DEPTH": 8,
+    "DEFAULT_LIST_SIZE": 100,
+    "MAX_LIST_SIZE": 100,
+    # Arguments that bound a list field's size: an int, or a list of ids
+    "LIST_SIZE_ARGUMENTS": ("limit", "first", "ids"),
+    "FIELD_WEIGHTS": {},
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "GRAPHQL_QUERY_COST", {})}
+
+
+def page_size(limit=None, default=None):
+    """
+    How many items a list resolver returns: `limit`, else `default`, else
+    DEFAULT_LIST_SIZE, and never more than MAX_LIST_SIZE.
+    """
+    config = get_config()
+    if limit is None:
+        limit = config["DEFAULT_LIST_SIZE"] if default is None else default
+    return max(0, min(limit, config["MAX_LIST_SIZE"]))
+
+
+class QueryCostRule(ValidationRule):
+    """
+    Validation rule that scores the operation being executed.
+    Use query_cost_rule() to bind request variables to it.
+    """
+
+    variables = None
+    operation_name = None
+    on_cost = None
+
+    def __init__(self, context):
+        super().__init__(context)
+        self.config = get_config()
+        self.weights = self.config["FIELD_WEIGHTS"]
+
+    def enter_operation_definition(self, node, *_args):
+        name = node.name.value if node.name else None
+        if self.operation_name and name != self.operation_name:
+            return self.SKIP
+
+        root_type = self.context.schema.get_root_type(node.operation)
+        cost, depth = self.selection_cost(root_type, node.selection_set, 1, set(), None)
+
+        if self.on_cost is not None:
+            self.on_cost({
+                "requestedQueryCost": cost,
+                "maximumAvailable": self.config["MAX_COST"],
+                "depth": depth,
+            })
+
+        if depth > self.config["MAX_DEPTH"]:
+            self.report_error(GraphQLError(
+                f"Query depth {depth} exceeds maximum depth of {self.config['MAX_DEPTH']}.",
+                node,
+                extensions={"code": "QUERY_TOO_DEEP", "depth": depth},
+            ))
+        elif cost > self.config["MAX_COST"]:
+            self.report_error(GraphQLError(
+                f"Query cost {cost} exceeds maximum cost of {self.config['MAX_COST']}.",
+                node,
+                extensions={"code": "QUERY_TOO_COMPLEX", "cost": cost},
+            ))
+        return self.SKIP
+
+    def selection_cost(self, parent_type, selection_set, depth, visited_fragments, page_size):
+        """
+        Return (cost, max depth) of a selection set on parent_type.
+        `page_size` is the size argument of the enclosing non-list field.
+        """
+        cost = 0
+        max_depth = depth
+
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field_cost, field_depth = self.field_cost(parent_type, selection, depth, visited_fragments, page_size)
+                cost += field_cost
+                max_depth = max(max_depth, field_depth)
+                continue
+
+            if isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.context.get_fragment(name)
+                if fragment is None or name in visited_fragments:
+                    continue
+                visited_fragments = visited_fragments | {name}
+                type_condition = fragment.type_condition
+            elif isinstance(selection, InlineFragmentNode):
+                fragment = selection
+                type_condition = fragment.type_condition
+            else:
+                continue
+
+            fragment_type = (
+                self.context.schema.get_type(type_condition.name.value)
+                if type_condition else parent_type
+            )
+            fragment_cost, fragment_depth = self.selection_cost(
+                fragment_type or parent_type, fragment.selection_set, depth, visited_fragments, page_size
+            )
+            cost += fragment_cost
+            max_depth = max(max_depth, fragment_depth)
+
+        return cost, max_depth
+
+    def field_cost(self, parent_type, node, depth, visited_fragments, page_size):
+        name = node.name.value
+        if name.startswith("__"):
+            return 0, depth
+
+        fields = getattr(parent_type, "fields", {})
+        field_def = fields.get(name)
+        if field_def is None:
+            return 0, depth
+
+        named_type = get_named_type(field_def.type)
+        weight = self.weights.get(
+            f"{parent_type.name}.{name}", 1 if is_composite_type(named_type) else 0
+        )
+        if node.selection_set is None:
+            return weight, depth
+
+        size = self.argument_size(node, field_def)
+        if is_list_type(get_nullable_type(field_def.type)):
+            child_cost, child_depth = self.selection_cost(
+                named_type, node.selection_set, depth + 1, visited_fragments, None
+            )
+            if size is None:
+                size = page_size if page_size is not None else self.config["DEFAULT_LIST_SIZE"]
+            # Fetching items costs something even when they are all scalars
+            child_cost = min(size, self.config["MAX_LIST_SIZE"]) * max(1, child_cost)
+        else:
+            child_cost, child_depth = self.selection_cost(
+                named_type, node.selection_set, depth + 1, visited_fragments, size
+            )
+        return weight + child_cost, child_depth
+
+    def argument_size(self, node, field_def):
+        """The size a field's `limit`/`first`/`ids` argument asks for, or None."""
+        for argument in node.arguments or ():
+            if argument.name.value not in self.config["LIST_SIZE_ARGUMENTS"]:
+                continue
+            value = argument.value
+            if isinstance(value, IntValueNode):
+                return max(int(value.value), 0)
+            if isinstance(value, ListValueNode):
+                return len(value.values)
+            if isinstance(value, VariableNode):
+                size = (self.variables or {}).get(value.name.value)
+                if isinstance(size, list):
+                    return len(size)
+                if isinstance(size, int):
+                    return max(size, 0)
+
+        for arg_name in self.config["LIST_SIZE_ARGUMENTS"]:
+            arg_def = field_def.args.get(arg_name)
+            if arg_def is not None and isinstance(arg_def.default_value, int):
+                return arg_def.default_value
+
+        return None
+
+
+def query_cost_rule(variables=None, operation_name=None, on_cost=None):
+    """
+    Build a QueryCostRule bound to one request's variables.
+    `on_cost` receives the computed cost dict for reporting.
+    """
+    return type(
+        "BoundQueryCostRule",
+        (QueryCostRule,),
+        {
+            "variables": variables or {},
+            "operation_name": operation_name,
+            "on_cost": staticmethod(on_cost) if on_cost else None,
+        },
+    )
@@ -0,0 +1,220 @@
+"""
+Token-bucket rate limiting for GraphQL root fields.
+
+GRAPHQL_RATE_LIMITS maps a root field name (e.g. "likePost") to
+(capacity, refill per minute): a client may burst up to `capacity` calls,
+then gets `refill per minute` more. Each call is charged to two buckets:
+ - the user's bucket (authenticated requests),
+ - the client IP's bucket, RATE_LIMIT_IP_MULTIPLIER times larger for
+   authenticated requests since users behind one NAT share an IP.
+A call is allowed only if every bucket has a token; then all are charged.
+
+Backends (settings.RATE_LIMIT_BACKEND):
+ - "redis": an atomic Lua script, shared by all workers.
+ - "memory": per-process buckets, for tests and single-process development.
+
+RateLimitMiddleware rejects over-budget calls with a RATE_LIMITED error;
+the view then adds X-RateLimit-* (and Retry-After) headers to the response.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from graphql import GraphQLError
+
+
+class BucketState:
+    __slots__ = ("allowed", "limit", "remaining", "reset_after", "retry_after")
+
+    def __init__(self, allowed, limit, remaining, reset_after, retry_after):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        # Seconds until the most depleted bucket is full / has a token again
+        self.reset_after = reset_after
+        self.retry_after = retry_after
+
+
+def _combine(allowed, buckets):
+    """BucketState for the most restrictive of [(capacity, rate, tokens)]."""
+    capacity, rate, tokens = min(buckets, key=lambda bucket: bucket[2] / bucket[0])
+    return BucketState(
+        allowed,
+        capacity,
+        max(0, int(tokens)),
+        reset_after=(capacity - tokens) / rate,
+        retry_after=max(0.0, 1 - tokens) / rate,
+    )
+
+
+class MemoryRateLimiter:
+    """In-process buckets. Only visible to the current process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def hit(self, buckets, now=None):
+        """Charge one token to each (key, capacity, rate per second) bucket."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            levels = []
+            for key, capacity, rate in buckets:
+                tokens, updated = self._buckets.get(key, (capacity, now))
+                levels.append(min(capacity, tokens + max(0.0, now - updated) * rate))
+            allowed = all(tokens >= 1 for tokens in levels)
+            if allowed:
+                levels = [tokens - 1 for tokens in levels]
+            for (key, _, _), tokens in zip(buckets, levels):
+                self._buckets[key] = (tokens, now)
+        return _combine(allowed, [(capacity, rate, tokens) for (_, capacity, rate), tokens in zip(buckets, levels)])
+
+
+class RedisRateLimiter:
+    """Buckets as `ratelimit:<key>` hashes, checked and charged by one Lua script."""
+
+    # ARGV: capacity and rate for each key, in KEYS order. Uses the Redis
+    # clock so every worker sees the same time. Returns allowed, then the
+    # tokens left in each bucket (as strings: Lua floats become integers).
+    HIT = """
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local levels = {}
+    local allowed = 1
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2 - 1])
+        local rate = tonumber(ARGV[i * 2])
+        local state = redis.call('HMGET', key, 'tokens', 'ts')
+        local tokens = tonumber(state[1]) or capacity
+        local updated = tonumber(state[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+        if tokens < 1 then allowed = 0 end
+        levels[i] = tokens
+    end
+    local result = {allowed}
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2 - 1])
+        local rate = tonumber(ARGV[i * 2])
+        if allowed == 1 then levels[i] = levels[i] - 1 end
+        redis.call('HSET', key, 'tokens', levels[i], 'ts', now)
+        redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+        result[i + 1] = tostring(levels[i])
+    end
+    return result
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._hit = self.client.register_script(self.HIT)
+
+    def hit(self, buckets):
+        keys, args = [], []
+        for key, capacity, rate in buckets:
+            keys.append(f"ratelimit:{key}")
+            args.extend([capacity, rate])
+        allowed, *levels = self._hit(keys=keys, args=args)
+        return _combine(
+            bool(int(allowed)),
+            [(capacity, rate, float(tokens)) for (_, capacity, rate), tokens in zip(buckets, levels)],
+        )
+
+
+_limiter = None
+
+
+def get_rate_limiter():
+    global _limiter
+    if _limiter is None:
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            _limiter = RedisRateLimiter(settings.REDIS_URL)
+        else:
+            _limiter = MemoryRateLimiter()
+    return _limiter
+
+
+def reset_rate_limiter():
+    global _limiter
+    _limiter = None
+
+
+def client_ip(request):
+    """
+    The client's address, TRUSTED_PROXY_COUNT hops from the right of
+    X-Forwarded-For. Each trusted proxy appends the address it got the
+    request from, so entries further left are set by the client and can
+    be forged. With no trusted proxies REMOTE_ADDR is the client.
+    """
+    hops = getattr(settings, "TRUSTED_PROXY_COUNT", 0)
+    if hops > 0:
+        forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")]
+        forwarded = [part for part in forwarded if part]
+        if forwarded:
+            # Fewer entries than proxies: the request skipped one, take the furthest hop
+            return forwarded[-min(hops, len(forwarded))]
+    return request.META.get("REMOTE_ADDR", "unknown")
+
+
+def request_buckets(request, operation, capacity, per_minute):
+    """(key, capacity, rate per second) for each bucket a call is charged to."""
+    rate = per_minute / 60.0
+    user = getattr(request, "user", None)
+    buckets = []
+    ip_capacity, ip_rate = capacity, rate
+    if user is not None and user.is_authenticated:
+        buckets.append((f"{operation}:user:{user.pk}", capacity, rate))
+        multiplier = getattr(settings, "RATE_LIMIT_IP_MULTIPLIER", 1)
+        ip_capacity, ip_rate = capacity * multiplier, rate * multiplier
+    buckets.append((f"{operation}:ip:{client_ip(request)}", ip_capacity, ip_rate))
+    return buckets
+
+
+def check_rate_limit(request, operation):
+    """
+    Charge one call of `operation` for this request. Returns its
+    BucketState, or None if the operation is not rate limited.
+    The tightest state seen during the request is kept for the headers.
+    """
+    limit = getattr(settings, "GRAPHQL_RATE_LIMITS", {}).get(operation)
+    if limit is None or not getattr(settings, "RATE_LIMIT_ENABLED", True):
+        return None
+    state = get_rate_limiter().hit(request_buckets(request, operation, *limit))
+
+    previous = getattr(request, "_rate_limit", None)
+    if previous is None or not state.allowed or (previous.allowed and state.remaining < previous.remaining):
+        request._rate_limit = state
+    return state
+
+
+class RateLimitMiddleware:
+    """Graphene middleware enforcing GRAPHQL_RATE_LIMITS on root fields."""
+
+    def resolve(self, next, root, info, **args):
+        if info.path.prev is None:
+            self.enforce(info)
+        return next(root, info, **args)
+
+    @staticmethod
+    def enforce(info):
+        """Take a token for the root field; raise RATE_LIMITED if there is none."""
+        state = check_rate_limit(info.context, info.field_name)
+        if state is not None and not state.allowed:
+            retry_after = math.ceil(state.retry_after)
+            raise GraphQLError(
+                f"Rate limit exceeded for {info.field_name}; retry in {retry_after}s",
+                extensions={"code": "RATE_LIMITED", "retryAfter": retry_after},
+            )
+
+
+def add_rate_limit_headers(request, response):
+    state = getattr(request, "_rate_limit", None)
+    if state is None:
+        return response
+    response["X-RateLimit-Limit"] = str(state.limit)
+    response["X-RateLimit-Remaining"] = str(state.remaining)
+    response["X-RateLimit-Reset"] = str(math.ceil(state.reset_after))
+    if not state.allowed:
+        response["Retry-After"] = str(math.ceil(state.retry_after))
+    return response
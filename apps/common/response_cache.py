@@ -0,0 +1,117 @@
+"""
+Response cache for anonymous, public GraphQL queries.
+
+A query operation is cacheable when the viewer is anonymous and every root
+field is listed in GRAPHQL_RESPONSE_CACHE["FIELDS"]. Each listed field gives a
+TTL hint and the tags its answer depends on; tags may reference the field's
+arguments, e.g. "post:{id}". The entry TTL is the smallest hint in the
+operation.
+
+Entries are keyed on the normalized query hash, the variables, the operation
+name, the viewer's auth state and the current version of every tag.
+invalidate_tags() bumps tag versions, so stale entries are never read again
+and simply expire. Tag versions live in the default cache, so this only
+holds across workers when that cache is shared (Redis, see
+settings.CACHES). Like/comment counters embedded in list results are only
+refreshed by TTL; single-object fields are invalidated per row.
+"""
+
+import hashlib
+import json
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import FieldNode, OperationType, parse, print_ast
+from graphql.utilities import value_from_ast_untyped
+
+
+DEFAULTS = {
+    "ENABLED": True,
+    "FIELDS": {},
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "GRAPHQL_RESPONSE_CACHE", {})}
+
+
+def tag_key(tag):
+    return f"gqltag:{tag}"
+
+
+def invalidate_tags(*tags):
+    """Invalidate every cached response that depends on any of `tags`."""
+    if tags:
+        version = time.time_ns()
+        cache.set_many({tag_key(tag): version for tag in tags}, timeout=None)
+
+
+@lru_cache(maxsize=512)
+def normalized_query_hash(query):
+    """Hash of the printed AST, so whitespace and formatting do not matter."""
+    return hashlib.sha256(print_ast(parse(query)).encode("utf-8")).hexdigest()
+
+
+class CachePlan:
+    """How (and whether) one request's response may be cached."""
+
+    def __init__(self, key, ttl):
+        self.key = key
+        self.ttl = ttl
+
+    def get(self):
+        return cache.get(self.key)
+
+    def set(self, data):
+        cache.set(self.key, data, timeout=self.ttl)
+
+
+def get_cache_plan(request, query, operation_ast, variables, operation_name):
+    """
+    Return a CachePlan for this request, or None if it must not be cached.
+    """
+    config = get_config()
+    if not config["ENABLED"] or operation_ast is None:
+        return None
+    if operation_ast.operation != OperationType.QUERY:
+        return None
+    if request.user.is_authenticated:
+        return None
+
+    ttls = []
+    tags = set()
+    for selection in operation_ast.selection_set.selections:
+        # Fragments at the root are rare enough not to bother with
+        if not isinstance(selection, FieldNode):
+            return None
+        rule = config["FIELDS"].get(selection.name.value)
+        if rule is None:
+            return None
+
+        arguments = {
+            argument.name.value: value_from_ast_untyped(argument.value, variables)
+            for argument in selection.arguments or ()
+        }
+        ttls.append(rule["ttl"])
+        for tag in rule.get("tags", ()):
+            try:
+                tags.add(tag.format(**arguments))
+            except KeyError:
+                return None
+
+    if not ttls:
+        return None
+
+    tags = sorted(tags)
+    versions = cache.get_many([tag_key(tag) for tag in tags])
+    key_parts = [
+        normalized_query_hash(query),
+        json.dumps(variables or {}, sort_keys=True, default=str),
+        operation_name or "",
+        "anon",
+        *(f"{tag}={versions.get(tag_key(tag), 0)}" for tag in tags),
+    ]
+    key = "gqlresp:" + hashlib.sha256("|".join(key_parts).encode("utf-8")).hexdigest()
+    return CachePlan(key, min(ttls))
@@ -0,0 +1,158 @@
+"""
+Batching Celery tasks: many small calls, one execution.
+
+A task declared with `@shared_task(base=BatchTask)` takes a list of items:
+
+    @shared_task(bind=True, base=BatchTask, batch_size=200, flush_after=2)
+    def send_notification_emails(self, items): ...
+
+    send_notification_emails.add(subject, body, email)
+
+add() appends one item (its arguments, JSON-serializable) to a buffer and,
+if no flush is scheduled yet, schedules one `flush_after` seconds later.
+The flush drains the buffer `batch_size` items at a time and publishes each
+batch as its own task message carrying the items. The buffer is only a
+staging area: once a batch is in a message, a worker that dies while
+running it (acks_late) leaves the message to be redelivered with the same
+items. Calling the task with an explicit list (e.g. on retry) runs just
+those items. In eager mode add() flushes immediately and batches run
+inline.
+
+Buffer backends (settings.TASK_BATCH_BACKEND):
+ - "redis": one list per task, shared by web workers and Celery workers.
+ - "memory": per-process lists, for tests and single-process development.
+"""
+import json
+import threading
+import time
+from collections import defaultdict, deque
+
+from celery import Task
+from django.conf import settings
+
+
+class MemoryBatchBuffer:
+    """In-process buffer. Only visible to the current process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items = defaultdict(deque)
+        self._scheduled = {}
+
+    def push(self, name, item):
+        with self._lock:
+            self._items[name].append(item)
+
+    def pop(self, name, count):
+        with self._lock:
+            items = self._items[name]
+            return [items.popleft() for _ in range(min(count, len(items)))]
+
+    def claim_flush(self, name, timeout):
+        """True if no flush was scheduled for `name` (one is now)."""
+        now = time.monotonic()
+        with self._lock:
+            if self._scheduled.get(name, 0) > now:
+                return False
+            self._scheduled[name] = now + timeout
+            return True
+
+    def release_flush(self, name):
+        with self._lock:
+            self._scheduled.pop(name, None)
+
+    def size(self, name):
+        with self._lock:
+            return len(self._items[name])
+
+
+class RedisBatchBuffer:
+    """`taskbatch:<name>` lists of JSON items, `taskbatch:<name>:flush` markers."""
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    @staticmethod
+    def key(name):
+        return f"taskbatch:{name}"
+
+    def push(self, name, item):
+        self.client.rpush(self.key(name), json.dumps(item))
+
+    def pop(self, name, count):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lrange(self.key(name), 0, count - 1)
+        pipe.ltrim(self.key(name), count, -1)
+        items, _ = pipe.execute()
+        return [json.loads(item) for item in items]
+
+    def claim_flush(self, name, timeout):
+        # Expires in case the scheduled flush is lost
+        return bool(self.client.set(f"{self.key(name)}:flush", 1, nx=True, ex=max(1, int(timeout))))
+
+    def release_flush(self, name):
+        self.client.delete(f"{self.key(name)}:flush")
+
+    def size(self, name):
+        return self.client.llen(self.key(name))
+
+
+_buffer = None
+
+
+def get_batch_buffer():
+    global _buffer
+    if _buffer is None:
+        if settings.TASK_BATCH_BACKEND == "redis":
+            _buffer = RedisBatchBuffer(settings.REDIS_URL)
+        else:
+            _buffer = MemoryBatchBuffer()
+    return _buffer
+
+
+def reset_batch_buffer():
+    global _buffer
+    _buffer = None
+
+
+class BatchTask(Task):
+    """Base class for tasks that run over batches of items; see module docs."""
+
+    batch_size = 100
+    flush_after = 2.0
+
+    def add(self, *args):
+        """Queue one item for the next batch."""
+        buffer = get_batch_buffer()
+        buffer.push(self.name, list(args))
+        if self.app.conf.task_always_eager:
+            self.apply()
+        elif buffer.claim_flush(self.name, timeout=self.flush_after * 10):
+            self.apply_async(countdown=self.flush_after)
+
+    def __call__(self, *args, **kwargs):
+        if args or kwargs:
+            return super().__call__(*args, **kwargs)
+        return self.flush()
+
+    def flush(self):
+        """
+        Drain the buffer `batch_size` items at a time, publishing one task
+        per batch (run inline in eager mode); returns the item count.
+        """
+        buffer = get_batch_buffer()
+        # Items added from here on schedule a new flush
+        buffer.release_flush(self.name)
+        done = 0
+        while True:
+            items = buffer.pop(self.name, self.batch_size)
+            if items:
+                if self.app.conf.task_always_eager:
+                    super().__call__(items)
+                else:
+                    self.apply_async(args=[items])
+                done += len(items)
+            if len(items) < self.batch_size:
+                return done
@@ -0,0 +1,164 @@
+"""
+Per-task latency and queue-depth metrics for Celery, served on /health/celery/.
+
+Celery signals record, per task name: runs, failures, total and max run
+time, and total queue wait (publish to start, from the `enqueued_at`
+header added when the task is sent). Queue depths are read from the broker.
+
+Backends (settings.TASK_METRICS_BACKEND):
+ - "redis": `taskmetrics:<name>` hashes, shared by every worker.
+ - "memory": per-process counters, for tests and eager mode.
+"""
+import threading
+import time
+
+from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun
+from django.conf import settings
+
+FIELDS = ("runs", "failures", "runtime_ms", "max_runtime_ms", "waited", "wait_ms")
+
+
+class MemoryTaskMetrics:
+    """In-process counters. Only visible to the current process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks = {}
+
+    def record(self, name, runtime_ms=None, wait_ms=None, failed=False):
+        with self._lock:
+            stats = self._tasks.setdefault(name, dict.fromkeys(FIELDS, 0))
+            if runtime_ms is not None:
+                stats["runs"] += 1
+                stats["runtime_ms"] += runtime_ms
+                stats["max_runtime_ms"] = max(stats["max_runtime_ms"], runtime_ms)
+            if wait_ms is not None:
+                stats["waited"] += 1
+                stats["wait_ms"] += wait_ms
+            if failed:
+                stats["failures"] += 1
+
+    def raw(self):
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._tasks.items()}
+
+
+class RedisTaskMetrics:
+    """`taskmetrics:<name>` hashes plus the `taskmetrics:tasks` set of names."""
+
+    # KEYS: hash, names set. ARGV: name, runtime (or ""), wait (or ""), failed
+    RECORD = """
+    redis.call('SADD', KEYS[2], ARGV[1])
+    if ARGV[2] ~= '' then
+        local runtime = tonumber(ARGV[2])
+        redis.call('HINCRBY', KEYS[1], 'runs', 1)
+        redis.call('HINCRBYFLOAT', KEYS[1], 'runtime_ms', runtime)
+        local current = tonumber(redis.call('HGET', KEYS[1], 'max_runtime_ms') or '0')
+        if runtime > current then redis.call('HSET', KEYS[1], 'max_runtime_ms', ARGV[2]) end
+    end
+    if ARGV[3] ~= '' then
+        redis.call('HINCRBY', KEYS[1], 'waited', 1)
+        redis.call('HINCRBYFLOAT', KEYS[1], 'wait_ms', ARGV[3])
+    end
+    if ARGV[4] == '1' then redis.call('HINCRBY', KEYS[1], 'failures', 1) end
+    return 1
+    """
+    NAMES = "taskmetrics:tasks"
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._record = self.client.register_script(self.RECORD)
+
+    def record(self, name, runtime_ms=None, wait_ms=None, failed=False):
+        self._record(
+            keys=[f"taskmetrics:{name}", self.NAMES],
+            args=[name, "" if runtime_ms is None else runtime_ms, "" if wait_ms is None else wait_ms, int(failed)],
+        )
+
+    def raw(self):
+        names = sorted(self.client.smembers(self.NAMES))
+        pipe = self.client.pipeline()
+        for name in names:
+            pipe.hgetall(f"taskmetrics:{name}")
+        return {
+            name: {field: float(values.get(field, 0)) for field in FIELDS}
+            for name, values in zip(names, pipe.execute())
+        }
+
+
+_metrics = None
+
+
+def get_task_metrics():
+    global _metrics
+    if _metrics is None:
+        if settings.TASK_METRICS_BACKEND == "redis":
+            _metrics = RedisTaskMetrics(settings.REDIS_URL)
+        else:
+            _metrics = MemoryTaskMetrics()
+    return _metrics
+
+
+def reset_task_metrics():
+    global _metrics
+    _metrics = None
+
+
+def task_stats():
+    """{task name: runs, failures, avg/max run time and avg queue wait in ms}."""
+    stats = {}
+    for name, raw in get_task_metrics().raw().items():
+        runs, waited = int(raw["runs"]), int(raw["waited"])
+        stats[name] = {
+            "runs": runs,
+            "failures": int(raw["failures"]),
+            "avg_runtime_ms": round(raw["runtime_ms"] / runs, 2) if runs else None,
+            "max_runtime_ms": round(raw["max_runtime_ms"], 2),
+            "avg_wait_ms": round(raw["wait_ms"] / waited, 2) if waited else None,
+        }
+    return stats
+
+
+def queue_depths(app, queues):
+    """{queue: messages waiting} as reported by the broker (None if unknown)."""
+    depths = {}
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in queues:
+            try:
+                depths[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+            except Exception:
+                depths[queue] = None
+    return depths
+
+
+# task id -> perf_counter() at task_prerun
+_timers = {}
+
+
+@before_task_publish.connect
+def stamp_enqueued_at(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
+
+
+@task_prerun.connect
+def start_timer(task_id=None, task=None, **kwargs):
+    _timers[task_id] = time.perf_counter()
+    enqueued_at = getattr(task.request, "enqueued_at", None) or (task.request.headers or {}).get("enqueued_at")
+    if enqueued_at and not task.request.is_eager:
+        get_task_metrics().record(task.name, wait_ms=max(0.0, (time.time() - float(enqueued_at)) * 1000))
+
+
+@task_postrun.connect
+def record_runtime(task_id=None, task=None, **kwargs):
+    started = _timers.pop(task_id, None)
+    if started is not None:
+        get_task_metrics().record(task.name, runtime_ms=(time.perf_counter() - started) * 1000)
+
+
+@task_failure.connect
+def record_failure(sender=None, **kwargs):
+    get_task_metrics().record(sender.name, failed=True)
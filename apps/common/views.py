@@ -1,5 +1,12 @@
 
+from django.db import connection, transaction
+from django.http import HttpResponseBadRequest, HttpResponseNotAllowed
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, set_response_etag
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import HttpError
 from graphene_file_upload.django import FileUploadGraphQLView
+from graphql import ExecutionResult, GraphQLError, OperationType, execute, get_operation_ast, validate, validate_schema
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth.models import AnonymousUser
@@ -7,12 +14,42 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 import logging
 
+from social_media_feed.db_router import pin_to_primary, read_from_replica
+from .persisted_queries import PersistedQueryError, get_validated_document, resolve_query
+from .query_cost import query_cost_rule
+from .rate_limit import add_rate_limit_headers
+from .response_cache import get_cache_plan
+
 logger = logging.getLogger(__name__)
 
 
+class PreparedOperation:
+    """A resolved, parsed and validated operation, ready to execute."""
+
+    def __init__(self, query, document, operation_ast, variables, operation_name):
+        self.query = query
+        self.document = document
+        self.operation_ast = operation_ast
+        self.variables = variables
+        self.operation_name = operation_name
+
+    @property
+    def is_query(self):
+        return self.operation_ast is not None and self.operation_ast.operation == OperationType.QUERY
+
+    @property
+    def is_mutation(self):
+        return self.operation_ast is not None and self.operation_ast.operation == OperationType.MUTATION
+
+
 class AuthenticatedGraphQLView(FileUploadGraphQLView):
     # @method_decorator(csrf_exempt)
     def dispatch(self, request, *args, **kwargs):
+        self.authenticate_request(request)
+        return self.graphql_dispatch(request, *args, **kwargs)
+
+    def authenticate_request(self, request):
+        """Set request.user from the JWT bearer token (AnonymousUser otherwise)."""
 
         # logger.info("=" * 50)
         # logger.info("🔍 DEBUGGING AUTHENTICATION")
@@ -47,5 +84,170 @@ class AuthenticatedGraphQLView(FileUploadGraphQLView):
         logger.info(f"Final user: {request.user}")
         logger.info(f"Is authenticated: {request.user.is_authenticated}")
         logger.info("=" * 50)
-        
-        return super().dispatch(request, *args, **kwargs)
\ No newline at end of file
+
+    def graphql_dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        add_rate_limit_headers(request, response)
+        return self.add_cache_headers(request, response)
+
+    def add_cache_headers(self, request, response):
+        """
+        Let browsers and CDNs cache public GET responses: add Cache-Control
+        and an ETag, and answer If-None-Match with 304 Not Modified.
+        """
+        ttl = getattr(request, "_graphql_cache_ttl", None)
+        if request.method != "GET" or not ttl or response.status_code != 200:
+            return response
+
+        patch_cache_control(response, public=True, max_age=ttl)
+        patch_vary_headers(response, ["Authorization"])
+        set_response_etag(response)
+        return get_conditional_response(request, etag=response["ETag"], response=response)
+
+    def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        """
+        Same flow as GraphQLView.execute_graphql_request, but resolves
+        persisted queries first, reuses cached parsed/validated documents,
+        rejects operations over the query cost budget and serves public
+        anonymous queries from the response cache.
+        """
+        prepared = self.prepare_operation(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+        if not isinstance(prepared, PreparedOperation):
+            return prepared
+
+        try:
+            return self.execute_operation(request, prepared)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+    def prepare_operation(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        """
+        Resolve, parse and validate the requested operation.
+        Returns a PreparedOperation, or an ExecutionResult / None to respond with.
+        """
+        try:
+            extensions = request.GET.get("extensions") or data.get("extensions")
+            query = resolve_query(extensions, query)
+        except PersistedQueryError as e:
+            return ExecutionResult(
+                data=None, errors=[GraphQLError(str(e), extensions={"code": e.code})]
+            )
+
+        if not query:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+
+        schema = self.schema.graphql_schema
+
+        schema_validation_errors = validate_schema(schema)
+        if schema_validation_errors:
+            return ExecutionResult(data=None, errors=schema_validation_errors)
+
+        document, validation_errors = get_validated_document(
+            schema,
+            query,
+            self.validation_rules,
+            graphene_settings.MAX_VALIDATION_ERRORS,
+        )
+        if document is None:
+            return ExecutionResult(errors=validation_errors)
+
+        operation_ast = get_operation_ast(document, operation_name)
+
+        if (
+            request.method.lower() == "get"
+            and operation_ast is not None
+            and operation_ast.operation != OperationType.QUERY
+        ):
+            if show_graphiql:
+                return None
+
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ["POST"],
+                    "Can only perform a {} operation from a POST request.".format(
+                        operation_ast.operation.value
+                    ),
+                )
+            )
+
+        if validation_errors:
+            return ExecutionResult(data=None, errors=validation_errors)
+
+        # Cost depends on the variables, so it is checked on every request
+        cost_errors = validate(
+            schema,
+            document,
+            [query_cost_rule(variables, operation_name, lambda cost: setattr(request, "_graphql_cost", cost))],
+        )
+        if cost_errors:
+            return ExecutionResult(data=None, errors=cost_errors)
+
+        return PreparedOperation(query, document, operation_ast, variables, operation_name)
+
+    def get_execute_options(self, request, prepared, middleware=None):
+        execute_options = {
+            "root_value": self.get_root_value(request),
+            "context_value": self.get_context(request),
+            "variable_values": prepared.variables,
+            "operation_name": prepared.operation_name,
+            "middleware": middleware if middleware is not None else self.get_middleware(request),
+        }
+        if self.execution_context_class:
+            execute_options["execution_context_class"] = self.execution_context_class
+        return execute_options
+
+    def get_cache_plan(self, request, prepared):
+        """Response cache plan for the operation; sets the TTL used for headers."""
+        plan = get_cache_plan(
+            request, prepared.query, prepared.operation_ast, prepared.variables, prepared.operation_name
+        )
+        if plan is not None:
+            request._graphql_cache_ttl = plan.ttl
+        return plan
+
+    def execute_operation(self, request, prepared):
+        schema = self.schema.graphql_schema
+        execute_options = self.get_execute_options(request, prepared)
+
+        if prepared.is_mutation and (
+            graphene_settings.ATOMIC_MUTATIONS is True
+            or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
+        ):
+            with transaction.atomic():
+                result = execute(schema, prepared.document, **execute_options)
+                if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                    transaction.set_rollback(True)
+            pin_to_primary(request.user.pk)
+            return result
+
+        if prepared.is_mutation:
+            result = execute(schema, prepared.document, **execute_options)
+            pin_to_primary(request.user.pk)
+            return result
+
+        plan = self.get_cache_plan(request, prepared)
+        if plan is not None:
+            cached = plan.get()
+            if cached is not None:
+                return ExecutionResult(data=cached)
+
+        with read_from_replica(request.user):
+            result = execute(schema, prepared.document, **execute_options)
+        if plan is not None and not result.errors:
+            plan.set(result.data)
+        return result
+
+    def json_encode(self, request, d, pretty=False):
+        """Report the computed query cost in the response extensions."""
+        cost = getattr(request, "_graphql_cost", None)
+        if cost is not None and isinstance(d, dict):
+            d = {**d, "extensions": {**d.get("extensions", {}), "cost": cost}}
+        return super().json_encode(request, d, pretty)
@@ -0,0 +1,77 @@
+"""
+Watermarks for incremental maintenance jobs.
+
+A job records how far it has got in a named Watermark row, so each run
+only looks at rows added (by primary key) or changed (by timestamp) since
+the previous run:
+ - process_new_rows() walks rows above `last_id` in pk-ordered chunks and
+   advances the watermark in the same transaction as each chunk;
+ - changed_since() yields the previous run's start time and records this
+   run's once the block succeeds.
+The row is locked while a chunk is processed, so overlapping runs of the
+same job cannot process a chunk twice.
+"""
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Watermark
+
+# Re-read this much before the previous run's start: rows committed just
+# after a run started may carry an earlier timestamp
+TIMESTAMP_OVERLAP = timedelta(seconds=5)
+
+
+def _locked(name):
+    Watermark.objects.get_or_create(name=name)
+    return Watermark.objects.select_for_update().get(name=name)
+
+
+def _row_pk(row):
+    if isinstance(row, dict):
+        return row.get("pk", row.get("id"))
+    return row.pk
+
+
+def process_new_rows(name, queryset, handler, chunk_size=1000):
+    """
+    Call handler(rows) on the rows of `queryset` whose pk is above the
+    `name` watermark, chunk by chunk. Rows may be instances or .values()
+    dicts including "id" or "pk". Returns the number of rows processed.
+    """
+    total = 0
+    while True:
+        with transaction.atomic():
+            mark = _locked(name)
+            rows = list(queryset.filter(pk__gt=mark.last_id).order_by("pk")[:chunk_size])
+            if rows:
+                handler(rows)
+                mark.last_id = _row_pk(rows[-1])
+            mark.last_run_at = timezone.now()
+            mark.save(update_fields=["last_id", "last_run_at", "updated_at"])
+        total += len(rows)
+        if len(rows) < chunk_size:
+            return total
+
+
+def advance_watermark(name, last_id):
+    """Move `name` to `last_id` (e.g. after a full rebuild)."""
+    Watermark.objects.update_or_create(name=name, defaults={"last_id": last_id, "last_run_at": timezone.now()})
+
+
+def watermark_id(name):
+    return Watermark.objects.filter(name=name).values_list("last_id", flat=True).first() or 0
+
+
+@contextmanager
+def changed_since(name):
+    """
+    Yield when the previous run of `name` started (None on the first run);
+    this run's start is recorded if the block completes.
+    """
+    started = timezone.now()
+    mark, _ = Watermark.objects.get_or_create(name=name)
+    yield mark.last_run_at - TIMESTAMP_OVERLAP if mark.last_run_at else None
+    Watermark.objects.filter(name=name).update(last_run_at=started, updated_at=timezone.now())
@@ -7,6 +7,7 @@ import graphene
 from django.contrib.auth import get_user_model
 from .types import FollowType, FollowStatsType
 from .models import Follow
+from apps.common.query_cost import page_size
 
 User = get_user_model()
 
@@ -39,12 +40,16 @@ class FollowQuery(graphene.ObjectType):
     )
     
     def resolve_followers(self, info, user_id):
-        """Get all followers of a specific user."""
-        return Follow.objects.filter(followed_id=int(user_id)).select_related('follower', 'followed')
+        """Get the followers of a specific user (newest first, at most MAX_LIST_SIZE)."""
+        return Follow.objects.filter(followed_id=int(user_id)).select_related(
+            'follower', 'followed'
+        ).order_by('-created_at')[:page_size()]
     
     def resolve_following(self, info, user_id):
-        """Get all users that a specific user is following."""
-        return Follow.objects.filter(follower_id=int(user_id)).select_related('follower', 'followed')
+        """Get the users a specific user is following (newest first, at most MAX_LIST_SIZE)."""
+        return Follow.objects.filter(follower_id=int(user_id)).select_related(
+            'follower', 'followed'
+        ).order_by('-created_at')[:page_size()]
     
     def resolve_follow_stats(self, info, user_id):
         """Get follow statistics for a user."""
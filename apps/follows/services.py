@@ -5,6 +5,7 @@ Mutations should NEVER directly manipulate the database.
 """
 
 from django.core.exceptions import ValidationError
+from apps.posts.services import bump_user_stats
 from .models import Follow
 
 
@@ -23,6 +24,10 @@ def follow_user(follower, followed):
         followed=followed
     )
 
+    if created:
+        bump_user_stats(follower.id, following_count=1)
+        bump_user_stats(followed.id, followers_count=1)
+
     return follow_obj, created
 
 
@@ -38,6 +43,8 @@ def unfollow_user(follower, followed):
             followed=followed
         )
         follow_obj.delete()
+        bump_user_stats(follower.id, following_count=-1)
+        bump_user_stats(followed.id, followers_count=-1)
         return True
 
     except Follow.DoesNotExist:
@@ -0,0 +1,48 @@
+"""
+Content hashes used to deduplicate uploads.
+
+sha256 identifies byte-identical files (Asset.sha256 is unique). The dHash
+perceptual hash is a 64-bit fingerprint that stays close, in Hamming
+distance, for re-encoded or resized copies of the same picture.
+"""
+import hashlib
+import tempfile
+
+from PIL import Image
+
+CHUNK_SIZE = 64 * 1024
+# Uploads larger than this are spooled to disk rather than kept in memory
+SPOOL_MAX_MEMORY = 2 * 1024 * 1024
+
+
+def spool_upload(upload):
+    """
+    Copy an upload into a temporary file, hashing it on the way.
+    Returns (temporary file positioned at 0, sha256 hex digest).
+    """
+    digest = hashlib.sha256()
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    chunks = upload.chunks(CHUNK_SIZE) if hasattr(upload, "chunks") else iter(lambda: upload.read(CHUNK_SIZE), b"")
+    for chunk in chunks:
+        digest.update(chunk)
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled, digest.hexdigest()
+
+
+def dhash(image, size=8):
+    """Difference hash of a PIL image as a 16-character hex string."""
+    pixels = list(
+        image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS).getdata()
+    )
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return f"{value:0{size * size // 4}x}"
+
+
+def hamming_distance(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
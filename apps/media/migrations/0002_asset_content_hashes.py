@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='phash',
+            field=models.CharField(blank=True, db_index=True, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db import models
+
+
+class Asset(models.Model):
+    """
+    An uploaded image and its resized variants.
+
+    `variants` is a compact map of size name -> {"w", "h", <format>: url},
+    e.g. {"thumb": {"w": 160, "h": 120, "webp": "...", "avif": "..."}}.
+
+    Assets are content-addressed: `sha256` of the uploaded bytes is unique,
+    so re-uploading a known file reuses its asset instead of storing it
+    again. `phash` (dHash) finds near-duplicates.
+    """
+
+    KIND_POST = "post"
+    KIND_PROFILE = "profile"
+    KIND_COVER = "cover"
+    KIND_CHOICES = [
+        (KIND_POST, "Post image"),
+        (KIND_PROFILE, "Profile image"),
+        (KIND_COVER, "Cover image"),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name="assets", on_delete=models.SET_NULL,
+        null=True, blank=True,
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default=KIND_POST)
+    original_url = models.URLField(max_length=1000)
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    variants = models.JSONField(default=dict, blank=True)
+    sha256 = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    phash = models.CharField(max_length=16, blank=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.kind} asset {self.pk}"
+
+    def url(self, size=None, fmt="webp"):
+        """
+        URL of the `size` variant in `fmt` (falling back to any stored
+        format), or of the original when no such variant exists.
+        """
+        variant = self.variants.get(size) if size else None
+        if not variant:
+            return self.original_url
+        return variant.get(fmt) or next(
+            (value for key, value in variant.items() if key not in ("w", "h")),
+            self.original_url,
+        )
+
+    def srcset(self, fmt="webp"):
+        """An HTML srcset string over all variants, smallest first."""
+        variants = sorted(self.variants.values(), key=lambda variant: variant["w"])
+        return ", ".join(
+            f"{variant[fmt]} {variant['w']}w" for variant in variants if fmt in variant
+        )
@@ -0,0 +1,60 @@
+"""
+Image decoding and variant generation with Pillow.
+
+Each size in settings.IMAGE_VARIANT_SIZES is a bounding box for the longest
+side; images are never upscaled. Every variant is encoded in each of
+settings.IMAGE_VARIANT_FORMATS that this Pillow build supports.
+"""
+import io
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+# Pillow format name, encoder options
+ENCODERS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "avif": ("AVIF", {"quality": 60}),
+}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def supported_formats():
+    return [fmt for fmt in settings.IMAGE_VARIANT_FORMATS if fmt in ENCODERS and features.check(fmt)]
+
+
+def open_image(fileobj):
+    """Decode an upload, applying its EXIF orientation; returns (image, source format)."""
+    try:
+        image = Image.open(fileobj)
+        image.load()
+    except (UnidentifiedImageError, OSError) as e:
+        raise InvalidImage("Uploaded file is not a valid image") from e
+    source_format = (image.format or "").lower()
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+    return image, source_format
+
+
+def encode(image, fmt):
+    pil_format, options = ENCODERS[fmt]
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    buffer.seek(0)
+    return buffer
+
+
+def generate_variants(image):
+    """
+    Yield (size name, width, height, format, encoded file) for every
+    configured variant of `image`, smallest size first.
+    """
+    formats = supported_formats()
+    for name, box in sorted(settings.IMAGE_VARIANT_SIZES.items(), key=lambda item: item[1]):
+        variant = image.copy()
+        variant.thumbnail((box, box), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            yield name, variant.width, variant.height, fmt, encode(variant, fmt)
@@ -0,0 +1,79 @@
+"""
+Upload pipeline: hash the upload, decode the image, store the original and
+its resized variants through the configured storage backend, and record an
+Asset. Files that were uploaded before reuse their existing Asset.
+"""
+import logging
+import uuid
+
+from django.db import IntegrityError, transaction
+
+from .hashing import spool_upload, dhash, hamming_distance
+from .models import Asset
+from .processing import open_image, generate_variants
+from .storage import get_media_storage
+
+logger = logging.getLogger(__name__)
+
+
+def create_image_asset(upload, owner=None, kind=Asset.KIND_POST):
+    """
+    Store an uploaded image with its variants; returns its Asset.
+
+    The upload is spooled to a temporary file and hashed first; if an asset
+    with the same sha256 exists it is returned and nothing is stored.
+    Raises processing.InvalidImage if `upload` is not a decodable image.
+    """
+    spooled, sha256 = spool_upload(upload)
+    with spooled:
+        existing = Asset.objects.filter(sha256=sha256).first()
+        if existing is not None:
+            logger.info("Reusing asset %s for a duplicate upload", existing.pk)
+            return existing
+
+        image, source_format = open_image(spooled)
+        spooled.seek(0)
+
+        storage = get_media_storage()
+        prefix = f"assets/{kind}/{uuid.uuid4().hex}"
+        original_url = storage.save(f"{prefix}/original.{source_format or 'img'}", spooled)
+
+        variants = {}
+        for name, width, height, fmt, content in generate_variants(image):
+            url = storage.save(f"{prefix}/{name}.{fmt}", content)
+            variants.setdefault(name, {"w": width, "h": height})[fmt] = url
+
+    try:
+        with transaction.atomic():
+            return Asset.objects.create(
+                owner=owner,
+                kind=kind,
+                original_url=original_url,
+                width=image.width,
+                height=image.height,
+                variants=variants,
+                sha256=sha256,
+                phash=dhash(image),
+            )
+    except IntegrityError:
+        # The same file was uploaded concurrently; keep the first asset
+        return Asset.objects.get(sha256=sha256)
+
+
+def similar_assets(asset, max_distance=6):
+    """
+    Assets that look like `asset` (dHash within `max_distance` bits),
+    closest first. Scans hashed assets; meant for moderation and tooling.
+    """
+    if not asset.phash:
+        return []
+    candidates = (
+        Asset.objects.exclude(pk=asset.pk).exclude(phash="").values_list("pk", "phash").iterator()
+    )
+    matches = sorted(
+        (distance, pk)
+        for pk, phash in candidates
+        if (distance := hamming_distance(asset.phash, phash)) <= max_distance
+    )
+    assets = Asset.objects.in_bulk([pk for _, pk in matches])
+    return [assets[pk] for _, pk in matches]
@@ -0,0 +1,52 @@
+"""
+Pluggable storage for media assets (settings.MEDIA_STORAGE_BACKEND).
+
+A backend has one method, save(name, content) -> public URL, where
+`content` is a file-like object. LocalMediaStorage writes under MEDIA_ROOT
+and serves from MEDIA_URL (used in development and tests);
+CloudinaryMediaStorage uploads to Cloudinary.
+"""
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.module_loading import import_string
+
+
+class LocalMediaStorage:
+    """Files under MEDIA_ROOT, served from MEDIA_URL."""
+
+    def __init__(self, location=None, base_url=None):
+        self.storage = FileSystemStorage(
+            location=location or settings.MEDIA_ROOT,
+            base_url=base_url or settings.MEDIA_URL,
+        )
+
+    def save(self, name, content):
+        return self.storage.url(self.storage.save(name, content))
+
+
+class CloudinaryMediaStorage:
+    """Uploads to Cloudinary (configured from CLOUDINARY_URL)."""
+
+    def save(self, name, content):
+        import cloudinary.uploader
+
+        public_id = name.rsplit(".", 1)[0]
+        uploaded = cloudinary.uploader.upload(
+            content, public_id=public_id, resource_type="image", overwrite=False,
+        )
+        return uploaded.get("secure_url")
+
+
+_storage = None
+
+
+def get_media_storage():
+    global _storage
+    if _storage is None:
+        _storage = import_string(settings.MEDIA_STORAGE_BACKEND)()
+    return _storage
+
+
+def reset_media_storage():
+    global _storage
+    _storage = None
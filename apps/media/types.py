@@ -0,0 +1,34 @@
+import graphene
+
+
+class ImageSize(graphene.Enum):
+    """Image variant to return; ORIGINAL is the uploaded file."""
+    THUMB = "thumb"
+    MEDIUM = "medium"
+    LARGE = "large"
+    ORIGINAL = "original"
+
+
+class ImageFormat(graphene.Enum):
+    WEBP = "webp"
+    AVIF = "avif"
+
+
+def asset_url(asset, fallback_url, size=None, fmt=None):
+    """
+    URL for a size/format of `asset`. Images uploaded before the media
+    pipeline have no asset, so every size falls back to `fallback_url`.
+    """
+    size, fmt = getattr(size, "value", size), getattr(fmt, "value", fmt)
+    if asset is None:
+        return fallback_url or None
+    if size in (None, ImageSize.ORIGINAL.value):
+        return asset.original_url
+    return asset.url(size, fmt or ImageFormat.WEBP.value)
+
+
+def asset_srcset(asset, fmt=None):
+    fmt = getattr(fmt, "value", fmt)
+    if asset is None:
+        return None
+    return asset.srcset(fmt or ImageFormat.WEBP.value) or None
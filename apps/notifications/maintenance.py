@@ -0,0 +1,90 @@
+"""
+Notification clean-up: legacy type values and duplicate like/follow rows.
+
+The management commands fix the whole table; the periodic tasks only look
+at notifications created since their last run (apps/common/watermarks.py).
+"""
+from django.db.models import Count, Max
+
+from apps.common.watermarks import process_new_rows
+from .models import Notification
+from .services import DEDUPED_TYPES
+
+# Legacy notification_type values -> the values the GraphQL enum accepts
+TYPE_FIXES = {
+    "liked": "like",
+    "commented": "comment",
+    "followed": "follow",
+    "FOLLOW": "follow",
+    "LIKE": "like",
+    "COMMENT": "comment",
+}
+EVENT_FIELDS = ("recipient_id", "sender_id", "notification_type", "post_id")
+
+
+def fix_types(queryset=None):
+    """Rewrite legacy type values; returns the number of rows fixed."""
+    queryset = Notification.objects.all() if queryset is None else queryset
+    total = 0
+    for old, new in TYPE_FIXES.items():
+        total += queryset.filter(notification_type=old).update(notification_type=new)
+    return total
+
+
+def dedupe(events=None):
+    """
+    Delete all but the newest notification of each duplicated like/follow
+    event, optionally only for the given (recipient, sender, type, post)
+    tuples. Returns the number of rows deleted.
+    """
+    duplicated = (
+        Notification.objects.filter(notification_type__in=DEDUPED_TYPES)
+        .values(*EVENT_FIELDS)
+        .annotate(count=Count("id"), newest=Max("id"))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    if events is not None:
+        if not events:
+            return 0
+        duplicated = duplicated.filter(
+            recipient_id__in={event[0] for event in events},
+            sender_id__in={event[1] for event in events},
+        )
+    deleted = 0
+    for row in duplicated:
+        event = tuple(row[field] for field in EVENT_FIELDS)
+        if events is not None and event not in events:
+            continue
+        count, _ = Notification.objects.filter(**dict(zip(EVENT_FIELDS, event))).exclude(pk=row["newest"]).delete()
+        deleted += count
+    return deleted
+
+
+def fix_new_types(chunk_size=1000):
+    """Fix types of notifications created since the last run; returns rows fixed."""
+    fixed = 0
+
+    def handle(rows):
+        nonlocal fixed
+        fixed += fix_types(Notification.objects.filter(pk__in=[row["id"] for row in rows]))
+
+    process_new_rows("notifications.fix_types", Notification.objects.values("id"), handle, chunk_size)
+    return fixed
+
+
+def dedupe_new(chunk_size=1000):
+    """Dedupe the events of notifications created since the last run; returns rows deleted."""
+    deleted = 0
+
+    def handle(rows):
+        nonlocal deleted
+        deleted += dedupe({tuple(row[field] for field in EVENT_FIELDS) for row in rows})
+
+    process_new_rows(
+        "notifications.dedupe",
+        Notification.objects.filter(notification_type__in=DEDUPED_TYPES).values("id", *EVENT_FIELDS),
+        handle,
+        chunk_size,
+    )
+    return deleted
@@ -7,6 +7,7 @@ Notifications are generated elsewhere (e.g., in services or signals when likes/c
 import graphene
 from graphene_django import DjangoObjectType
 from .models import Notification
+from apps.common.query_cost import page_size
 
 
 
@@ -39,22 +40,29 @@ class NotificationQuery(graphene.ObjectType):
     unread_notifications = graphene.List(NotificationType)
 
     def resolve_notifications(self, info, limit=None, unread_only=False):
-        user = info.context.user
-        if user.is_anonymous:
-            return []
-
-        qs = Notification.objects.filter(recipient=user)
-        if unread_only:
-            qs = qs.filter(is_read=False)
-        if limit:
-            qs = qs[:limit]
-        return qs
+        return viewer_notifications(info, limit, unread_only)
 
     def resolve_unread_notifications(self, info):
-        user = info.context.user
-        if user.is_anonymous:
-            return []
-        return Notification.objects.filter(recipient=user, is_read=False)
+        return viewer_notifications(info, unread_only=True)
+
+    # Async resolvers used by the ASGI view
+    async def aresolve_notifications(self, info, limit=None, unread_only=False):
+        return [n async for n in viewer_notifications(info, limit, unread_only)]
+
+    async def aresolve_unread_notifications(self, info):
+        return [n async for n in viewer_notifications(info, unread_only=True)]
+
+
+def viewer_notifications(info, limit=None, unread_only=False):
+    """The viewer's notifications (none when anonymous), shared by the sync and async resolvers."""
+    user = info.context.user
+    if user.is_anonymous:
+        return Notification.objects.none()
+    qs = Notification.objects.filter(recipient=user)
+    if unread_only:
+        qs = qs.filter(is_read=False)
+    # Newest first, at most MAX_LIST_SIZE (apps/common/query_cost.py)
+    return qs[:page_size(limit)]
 
 
 class NotificationMutation(graphene.ObjectType):
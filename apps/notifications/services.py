@@ -1,7 +1,7 @@
 # apps/notifications/services.py
 
 from .models import Notification
-from .tasks import send_notification_email
+from .tasks import send_notification_emails
 
 DEDUPED_TYPES = {"like", "follow"}
 
@@ -35,15 +35,21 @@ def create_notification(recipient, actor, verb, post=None, message=""):
         created = True  # ✅ important
 
     # Only email when it was actually created
-    if created and getattr(recipient, "email", None):
-        send_notification_email.delay(
+    if created:
+        queue_notification_email(notif, recipient, actor, verb, post)
+
+    return notif
+
+
+def queue_notification_email(notif, recipient, actor, verb, post=None):
+    """Queue the email for a new notification; they are sent in batches."""
+    if getattr(recipient, "email", None):
+        send_notification_emails.add(
             email_subject_for(verb),
             email_body_for(notif, actor=actor, verb=verb, post=post),
             recipient.email,
         )
 
-    return notif
-
 
 def default_message(verb: str) -> str:
     return {
@@ -1,7 +1,9 @@
 # apps/notifications/tasks.py
 
 from celery import shared_task
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
+
+from apps.common.task_batching import BatchTask
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=10)
@@ -21,4 +23,36 @@ def send_notification_email(self, subject, message, recipient_email):
         return "Email Sent"
     except Exception as exc:
         # retry transient failures
-        raise self.retry(exc=exc)
\ No newline at end of file
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, base=BatchTask, batch_size=200, flush_after=5, max_retries=3, default_retry_delay=10)
+def send_notification_emails(self, items):
+    """
+    Send a batch of [subject, message, recipient_email] notification emails
+    over one mail connection. Queued with send_notification_emails.add(...).
+    """
+    messages = [
+        EmailMessage(subject=subject, body=message, to=[recipient_email])
+        for subject, message, recipient_email in items
+    ]
+    try:
+        with get_connection(fail_silently=False) as connection:
+            return connection.send_messages(messages)
+    except Exception as exc:
+        # Retries just this batch
+        raise self.retry(args=[items], exc=exc)
+
+
+@shared_task
+def fix_notification_types():
+    """Fix legacy type values on notifications created since the last run."""
+    from .maintenance import fix_new_types  # maintenance -> services -> this module
+    return fix_new_types()
+
+
+@shared_task
+def dedupe_notifications():
+    """Remove duplicate like/follow notifications among those created since the last run."""
+    from .maintenance import dedupe_new
+    return dedupe_new()
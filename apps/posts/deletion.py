@@ -0,0 +1,124 @@
+"""
+Chunked, resumable deletion of posts and everything hanging off them.
+
+Django's Model.delete() collects every related Like, Comment and
+Notification in Python before deleting. Here posts are deleted
+`chunk_size` at a time, walking primary keys in order; each chunk locks its
+posts and deletes their notifications, likes and comments (replies
+included) and then the posts themselves with set-based DELETEs, all in one
+transaction together with the job's keyset cursor. A crashed job resumes
+after the last committed chunk, and rows added to a post while the job
+runs are deleted with it, so no chunk can be left with dangling children.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.db import raw_delete
+from apps.common.response_cache import invalidate_tags
+from apps.notifications.models import Notification
+from .models import Post, Comment, Like, DeletionJob
+from .services import refresh_user_stats
+
+logger = logging.getLogger(__name__)
+
+# Posts per transaction; their children are deleted in the same transaction
+DEFAULT_CHUNK_SIZE = 100
+
+STAGE = "posts"
+
+# (key in job.deleted, model) for the rows that reference a post, deleted
+# before the posts. Foreign keys are checked at commit, so a comment and its
+# replies can go in one statement.
+CHILDREN = (
+    ("notifications", Notification),
+    ("likes", Like),
+    ("comments", Comment),
+)
+
+
+def create_deletion_job(kind, author_id, post_id=None, requested_by=None):
+    job = DeletionJob(kind=kind, author_id=author_id, post_id=post_id, requested_by=requested_by)
+    job.total_posts = job_posts(job).count()
+    job.save()
+    return job
+
+
+def job_posts(job):
+    """The posts a job deletes."""
+    if job.kind == DeletionJob.KIND_POST:
+        return Post.objects.filter(pk=job.post_id)
+    return Post.objects.filter(author_id=job.author_id)
+
+
+def run_deletion_job(job, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Run (or resume) a deletion job to completion.
+    Returns the job; on error it is marked failed and the error re-raised.
+    """
+    if job.status == DeletionJob.STATUS_DONE:
+        return job
+
+    job.status = DeletionJob.STATUS_RUNNING
+    job.error = ""
+    job.save(update_fields=["status", "error", "updated_at"])
+
+    if job.stage != STAGE:
+        job.stage, job.last_id = STAGE, 0
+
+    try:
+        _delete_posts(job, chunk_size)
+    except Exception as e:
+        logger.exception("Deletion job %s failed in stage %s", job.pk, job.stage)
+        job.status = DeletionJob.STATUS_FAILED
+        job.error = str(e)
+        job.save(update_fields=["status", "error", "updated_at"])
+        raise
+
+    refresh_user_stats(job.author_id)
+    invalidate_tags("posts", f"user:{job.author_id}")
+
+    job.status = DeletionJob.STATUS_DONE
+    job.stage = "done"
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "stage", "finished_at", "updated_at"])
+    return job
+
+
+def _delete_posts(job, chunk_size):
+    queryset = job_posts(job).order_by("pk")
+    while True:
+        ids = list(queryset.filter(pk__gt=job.last_id).values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            # Likes/comments on these posts now wait for this transaction
+            ids = list(
+                Post.objects.select_for_update().filter(pk__in=ids).order_by("pk").values_list("pk", flat=True)
+            )
+            deleted = {
+                name: raw_delete(model.objects.filter(post_id__in=ids))
+                for name, model in CHILDREN
+            }
+            deleted["posts"] = raw_delete(Post.objects.filter(pk__in=ids))
+            if ids:
+                job.last_id = ids[-1]
+            for name, count in deleted.items():
+                job.deleted[name] = job.deleted.get(name, 0) + count
+            job.save(update_fields=["stage", "last_id", "deleted", "updated_at"])
+        invalidate_tags(*[f"post:{post_id}" for post_id in ids])
+
+
+def resumable_jobs(stale_after=timedelta(minutes=5)):
+    """
+    Pending or running jobs that have made no progress for `stale_after`
+    (the worker crashed or never picked them up). Failed jobs hit an error
+    that a retry would most likely hit again; they are left for
+    `resume_deletion_jobs --job`.
+    """
+    return DeletionJob.objects.filter(
+        status__in=(DeletionJob.STATUS_PENDING, DeletionJob.STATUS_RUNNING),
+        updated_at__lt=timezone.now() - stale_after,
+    )
@@ -0,0 +1,183 @@
+"""
+Write-behind buffer for like/unlike intents (settings.LIKE_WRITE_BEHIND).
+
+LikePostMutation appends an intent instead of writing to `Like`; the
+flush_likes Celery task later applies the buffered intents in bulk
+(see services.flush_like_buffer). Until then the viewer's own state is read
+back from the buffer.
+
+Backends (settings.LIKE_BUFFER_BACKEND):
+ - "redis": a Redis stream plus a per-user hash of pending states, shared by
+   web workers and the Celery worker.
+ - "memory": an in-process queue, for tests and single-process development.
+"""
+import itertools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+class LikeIntent:
+    __slots__ = ("entry_id", "user_id", "post_id", "liked")
+
+    def __init__(self, entry_id, user_id, post_id, liked):
+        self.entry_id = entry_id
+        self.user_id = int(user_id)
+        self.post_id = int(post_id)
+        self.liked = bool(liked)
+
+
+class MemoryLikeBuffer:
+    """In-process buffer. Only visible to the current process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._flush_lock = threading.Lock()
+
+    @contextmanager
+    def flush_lock(self):
+        """Non-blocking; yields False if another flush is running."""
+        acquired = self._flush_lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._flush_lock.release()
+
+    def append(self, user_id, post_id, liked):
+        with self._lock:
+            entry_id = str(next(self._ids))
+            self._entries[entry_id] = LikeIntent(entry_id, user_id, post_id, liked)
+            self._pending[(int(user_id), int(post_id))] = (bool(liked), entry_id)
+            return entry_id
+
+    def pending_state(self, user_id, post_ids):
+        with self._lock:
+            states = {}
+            for post_id in post_ids:
+                pending = self._pending.get((int(user_id), int(post_id)))
+                if pending is not None:
+                    states[int(post_id)] = pending[0]
+            return states
+
+    def read_batch(self, count):
+        with self._lock:
+            return list(itertools.islice(self._entries.values(), count))
+
+    def ack(self, intents):
+        with self._lock:
+            for intent in intents:
+                self._entries.pop(intent.entry_id, None)
+                key = (intent.user_id, intent.post_id)
+                # A newer intent for the same pair stays pending
+                if self._pending.get(key, (None, None))[1] == intent.entry_id:
+                    del self._pending[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisLikeBuffer:
+    """Redis stream of intents + `likes:pending:<user_id>` hashes of pending states."""
+
+    STREAM = "likes:intents"
+    PENDING_TTL = 60 * 60 * 24
+
+    APPEND = """
+    local id = redis.call('XADD', KEYS[1], '*', 'user', ARGV[1], 'post', ARGV[2], 'liked', ARGV[3])
+    redis.call('HSET', KEYS[2], ARGV[2], ARGV[3] .. ':' .. id)
+    redis.call('EXPIRE', KEYS[2], ARGV[4])
+    return id
+    """
+
+    # Clear pending states that still point at the applied entry
+    ACK = """
+    for i = 1, #KEYS do
+        local field = ARGV[i * 2 - 1]
+        if redis.call('HGET', KEYS[i], field) == ARGV[i * 2] then
+            redis.call('HDEL', KEYS[i], field)
+        end
+    end
+    return #KEYS
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._append = self.client.register_script(self.APPEND)
+        self._ack = self.client.register_script(self.ACK)
+
+    @contextmanager
+    def flush_lock(self):
+        """Non-blocking; yields False if another flush is running."""
+        lock = self.client.lock("likes:flush_lock", timeout=60, blocking=False)
+        acquired = lock.acquire()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+
+    @staticmethod
+    def pending_key(user_id):
+        return f"likes:pending:{user_id}"
+
+    def append(self, user_id, post_id, liked):
+        return self._append(
+            keys=[self.STREAM, self.pending_key(user_id)],
+            args=[user_id, post_id, int(bool(liked)), self.PENDING_TTL],
+        )
+
+    def pending_state(self, user_id, post_ids):
+        post_ids = [int(p) for p in post_ids]
+        if not post_ids:
+            return {}
+        values = self.client.hmget(self.pending_key(user_id), post_ids)
+        return {
+            post_id: value.split(":", 1)[0] == "1"
+            for post_id, value in zip(post_ids, values)
+            if value is not None
+        }
+
+    def read_batch(self, count):
+        return [
+            LikeIntent(entry_id, fields["user"], fields["post"], fields["liked"] == "1")
+            for entry_id, fields in self.client.xrange(self.STREAM, count=count)
+        ]
+
+    def ack(self, intents):
+        if not intents:
+            return
+        keys, args = [], []
+        for intent in intents:
+            keys.append(self.pending_key(intent.user_id))
+            args.extend([intent.post_id, f"{int(intent.liked)}:{intent.entry_id}"])
+        self._ack(keys=keys, args=args)
+        self.client.xdel(self.STREAM, *[intent.entry_id for intent in intents])
+
+    def __len__(self):
+        return self.client.xlen(self.STREAM)
+
+
+_buffer = None
+
+
+def get_like_buffer():
+    global _buffer
+    if _buffer is None:
+        if settings.LIKE_BUFFER_BACKEND == "redis":
+            _buffer = RedisLikeBuffer(settings.REDIS_URL)
+        else:
+            _buffer = MemoryLikeBuffer()
+    return _buffer
+
+
+def reset_like_buffer():
+    global _buffer
+    _buffer = None
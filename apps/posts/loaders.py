@@ -0,0 +1,117 @@
+"""
+Per-request batch loading for posts.
+
+Posts are stored in an identity map on the request (`info.context`), so a
+post id requested several times in one GraphQL request - in one
+postsByIds call or across several root fields - is fetched at most once.
+
+List resolvers also remember the posts they return, so per-post previews
+(recent likes/comments) are loaded for the whole page in one query.
+"""
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Post, Like, Comment
+from .planner import DEFAULT_PLAN
+
+# Preview kind -> (model, related object to join)
+PREVIEW_SOURCES = {
+    "likes": (Like, "user"),
+    "comments": (Comment, "author"),
+}
+MAX_PREVIEW = 10
+
+
+def post_identity_map(context):
+    """id -> Post (or None for ids known not to exist) for this request."""
+    identity_map = getattr(context, "_post_identity_map", None)
+    if identity_map is None:
+        identity_map = {}
+        setattr(context, "_post_identity_map", identity_map)
+    return identity_map
+
+
+def remember_posts(context, posts):
+    """Add a page of posts to the identity map; returns them as a list."""
+    posts = list(posts)
+    identity_map = post_identity_map(context)
+    for post in posts:
+        identity_map.setdefault(post.pk, post)
+    return posts
+
+
+def posts_with_counts(user=None):
+    """
+    Posts with author joined and likes/comments counts annotated, plus the
+    viewer's like flag when `user` is authenticated. PostType prefers these
+    annotations over per-post queries.
+    """
+    return DEFAULT_PLAN.apply(Post.objects.all(), user)
+
+
+def load_posts(context, ids, queryset=None):
+    """
+    Return posts for `ids` in input order, with None for missing ids.
+    Ids not already in the request's identity map are fetched in one query,
+    from `queryset` (posts_with_counts by default).
+    """
+    ids = [_parse_id(post_id) for post_id in ids]
+    identity_map = post_identity_map(context)
+
+    missing = {post_id for post_id in ids if post_id is not None and post_id not in identity_map}
+    if missing:
+        if queryset is None:
+            queryset = posts_with_counts(getattr(context, "user", None))
+        found = queryset.in_bulk(missing)
+        for post_id in missing:
+            identity_map[post_id] = found.get(post_id)
+
+    return [identity_map.get(post_id) for post_id in ids]
+
+
+def recent_rows(kind, post_ids, limit):
+    """
+    The `limit` newest likes or comments of each post, in one query:
+    ROW_NUMBER() OVER (PARTITION BY post_id ORDER BY created_at DESC).
+    """
+    model, related = PREVIEW_SOURCES[kind]
+    return model.objects.filter(post_id__in=post_ids).annotate(
+        preview_rank=Window(
+            RowNumber(),
+            partition_by=[F("post_id")],
+            order_by=[F("created_at").desc(), F("pk").desc()],
+        )
+    ).filter(preview_rank__lte=limit).select_related(related).order_by("post_id", "preview_rank")
+
+
+def load_recent(context, kind, post, limit=3):
+    """
+    The newest `limit` likes or comments of `post`. The first call loads
+    previews for every post in the request's identity map at once.
+    """
+    limit = max(0, min(limit, MAX_PREVIEW))
+    previews = getattr(context, "_recent_previews", None)
+    if previews is None:
+        previews = {}
+        setattr(context, "_recent_previews", previews)
+    loaded = previews.setdefault((kind, limit), {})
+
+    if post.pk not in loaded:
+        post_ids = {post.pk} | {
+            post_id for post_id, known in post_identity_map(context).items()
+            if known is not None and post_id not in loaded
+        }
+        for post_id in post_ids:
+            loaded[post_id] = []
+        if limit:
+            for row in recent_rows(kind, post_ids, limit):
+                loaded[row.post_id].append(row)
+
+    return loaded[post.pk]
+
+
+def _parse_id(post_id):
+    try:
+        return int(post_id)
+    except (TypeError, ValueError):
+        return None
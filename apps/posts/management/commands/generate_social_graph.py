@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from apps.posts.synthetic import SocialGraphGenerator
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic social graph (power-law follows, posts, likes, comments) for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--posts-per-user", type=int, default=10)
+        parser.add_argument("--likes-per-post", type=int, default=5)
+        parser.add_argument("--comments-per-post", type=int, default=2)
+        parser.add_argument("--follows-per-user", type=int, default=30,
+                            help="Average number of accounts each user follows")
+        parser.add_argument("--notification-ratio", type=float, default=0.2,
+                            help="Fraction of follow/like/comment events that create a notification")
+        parser.add_argument("--alpha", type=float, default=1.1,
+                            help="Power-law exponent for follower and post popularity")
+        parser.add_argument("--days", type=int, default=30, help="Spread timestamps over this many days")
+        parser.add_argument("--prefix", default="synth", help="Username prefix for generated users")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        generator = SocialGraphGenerator(
+            users=options["users"],
+            posts_per_user=options["posts_per_user"],
+            likes_per_post=options["likes_per_post"],
+            comments_per_post=options["comments_per_post"],
+            follows_per_user=options["follows_per_user"],
+            notification_ratio=options["notification_ratio"],
+            alpha=options["alpha"],
+            days=options["days"],
+            prefix=options["prefix"],
+            chunk_size=options["chunk_size"],
+            seed=options["seed"],
+            log=self.stdout.write,
+        )
+        generator.generate()
+        self.stdout.write(self.style.SUCCESS(f"✅ Generated social graph '{options['prefix']}'"))
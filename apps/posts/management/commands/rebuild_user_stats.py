@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from apps.posts.services import rebuild_all_user_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized user stats table from posts, likes, comments and follows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_all_user_stats(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt stats for {total} users"))
@@ -0,0 +1,26 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from apps.posts.deletion import DEFAULT_CHUNK_SIZE, resumable_jobs, run_deletion_job
+from apps.posts.models import DeletionJob
+
+
+class Command(BaseCommand):
+    help = "Resume deletion jobs that crashed or were never picked up (runs them inline)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job", type=int, help="Resume this job regardless of its age, even if it failed")
+        parser.add_argument("--stale-minutes", type=int, default=5)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Posts per transaction")
+
+    def handle(self, *args, **options):
+        if options["job"]:
+            jobs = DeletionJob.objects.filter(pk=options["job"]).exclude(status=DeletionJob.STATUS_DONE)
+        else:
+            jobs = resumable_jobs(timedelta(minutes=options["stale_minutes"]))
+
+        for job in jobs:
+            self.stdout.write(f"🔄 Resuming job {job.pk} ({job.kind}) after post {job.last_id}...")
+            run_deletion_job(job, chunk_size=options["chunk_size"])
+            self.stdout.write(f"   deleted: {job.deleted}")
+
+        self.stdout.write(self.style.SUCCESS("✅ No unfinished deletion jobs left"))
@@ -13,6 +13,9 @@ class Post(models.Model):
     )
     content = models.TextField()
     image = models.URLField(blank=True, null=True, max_length=1000)
+    image_asset = models.ForeignKey(
+        "media.Asset", related_name="+", on_delete=models.SET_NULL, null=True, blank=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -32,9 +35,21 @@ class Post(models.Model):
 
 
 
+COMMENT_PATH_SEGMENT = 10
+
+
+def comment_path_segment(pk):
+    return f"{pk:0{COMMENT_PATH_SEGMENT}d}"
+
+
 class Comment(models.Model):
     """
-    user comment on a post.
+    user comment on a post, or a reply to another comment.
+
+    `path` is a materialized path: the zero-padded ids of the root comment
+    down to this one, concatenated. Ordering a post's comments by path gives
+    the thread in depth-first order, and a comment's subtree is the path
+    range just above its own path (see services.comment_page).
     """
 
     post = models.ForeignKey(
@@ -43,15 +58,37 @@ class Comment(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL, related_name="comments", on_delete=models.CASCADE
     )
+    parent = models.ForeignKey(
+        "self", related_name="replies", on_delete=models.CASCADE, null=True, blank=True
+    )
+    path = models.CharField(max_length=250, blank=True, default="")
+    depth = models.PositiveSmallIntegerField(default=0)
+    replies_count = models.PositiveIntegerField(default=0)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    MAX_DEPTH = 250 // COMMENT_PATH_SEGMENT - 1
+
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["post", "path"], name="comment_thread_idx"),
+            models.Index(fields=["post", "depth", "path"], name="comment_toplevel_idx"),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username}"
+
+    def save(self, *args, **kwargs):
+        if self.parent_id and not self.depth:
+            self.depth = self.parent.depth + 1
+        super().save(*args, **kwargs)
+        # The path ends with our own id, so it is only known after the insert
+        if not self.path:
+            prefix = self.parent.path if self.parent_id else ""
+            self.path = prefix + comment_path_segment(self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
     
     @property
     def user(self):
@@ -74,4 +111,80 @@ class Like(models.Model):
         unique_together = ("user", "post")  # prevents double-liking
 
     def __str__(self):
-        return f"{self.user.username} liked {self.post.id}"
\ No newline at end of file
+        return f"{self.user.username} liked {self.post.id}"
+
+class UserStats(models.Model):
+    """
+    Materialized engagement counters for a user.
+    Kept up to date incrementally by the post/like/comment/follow services
+    and fully rebuilt by the nightly `rebuild_user_stats` job.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        primary_key=True,
+        related_name="stats",
+        on_delete=models.CASCADE,
+    )
+    posts_count = models.PositiveIntegerField(default=0)
+    total_likes_received = models.PositiveIntegerField(default=0)
+    total_comments_received = models.PositiveIntegerField(default=0)
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for user {self.user_id}"
+
+
+class DeletionJob(models.Model):
+    """
+    Resumable background deletion of a post, or of all of a user's posts,
+    with their likes, comments and notifications.
+    Progress (stage + keyset cursor) is saved after every chunk.
+    """
+
+    KIND_POST = "post"
+    KIND_USER_POSTS = "user_posts"
+    KINDS = (
+        (KIND_POST, "Single post"),
+        (KIND_USER_POSTS, "All posts of a user"),
+    )
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUSES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KINDS)
+    # Plain ids rather than foreign keys: the job outlives the rows it deletes
+    author_id = models.BigIntegerField()
+    post_id = models.BigIntegerField(null=True, blank=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+        related_name="deletion_jobs",
+    )
+
+    status = models.CharField(max_length=20, choices=STATUSES, default=STATUS_PENDING)
+    stage = models.CharField(max_length=20, blank=True)
+    last_id = models.BigIntegerField(default=0)
+    deleted = models.JSONField(default=dict)
+    total_posts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "updated_at"])]
+
+    def __str__(self):
+        return f"DeletionJob {self.pk} ({self.kind}, {self.status})"
@@ -4,14 +4,15 @@ Each mutation returns the changed object for convenience.
 """
 
 import graphene
+from django.conf import settings
 from graphene_file_upload.scalars import Upload
 from django.shortcuts import get_object_or_404
-from .services import create_comment
-from .models import Post, Comment, Like
+from .services import create_comment, delete_comment, bump_user_stats
+from .models import Post, Comment, Like, DeletionJob
+from .deletion import create_deletion_job, run_deletion_job
 from .types import PostType, CommentType
 from django.contrib.auth import get_user_model
-import cloudinary.uploader
-from .services import toggle_like
+from .services import toggle_like, like_post, unlike_post, buffer_like, is_post_liked
 
 User = get_user_model()
 
@@ -31,13 +32,19 @@ class CreatePostMutation(graphene.Mutation):
         if user.is_anonymous:
             raise Exception("Authentication required")
 
-        post = Post.objects.create(author=user, content=content)
+        # Process the upload first so an invalid image creates no post
+        asset = None
         if image:
-            # Upload to Cloudinary
-            uploaded = cloudinary.uploader.upload(image)
-            post.image = uploaded.get("secure_url")  # ✅ store URL in DB
-
-            post.save()
+            # Imported on use: it pulls in Pillow, which most requests never need
+            from apps.media.services import create_image_asset
+            asset = create_image_asset(image, owner=user)
+        post = Post.objects.create(
+            author=user,
+            content=content,
+            image=asset.original_url if asset else None,
+            image_asset=asset,
+        )
+        bump_user_stats(user.id, posts_count=1)
         return CreatePostMutation(post=post)
 
 
@@ -64,36 +71,13 @@ class UpdatePostMutation(graphene.Mutation):
         if content is not None:
             post.content = content
         if image is not None:
-            uploaded = cloudinary.uploader.upload(image)
-            post.image = uploaded.get("secure_url")
+            from apps.media.services import create_image_asset
+            post.image_asset = create_image_asset(image, owner=user)
+            post.image = post.image_asset.original_url
         post.save()
         return UpdatePostMutation(post=post)
 
 
-class DeleteAllUserPosts(graphene.Mutation):
-    success = graphene.Boolean()
-    deleted_count = graphene.Int()
-
-    class Arguments:
-        user_id = graphene.ID(required=True)
-
-    def mutate(self, info, user_id):
-        current_user = info.context.user
-
-        if current_user.is_anonymous:
-            raise Exception("Authentication required")
-
-        # Only allow self or admin
-        if str(current_user.id) != str(user_id) and not current_user.is_staff:
-            raise Exception("You are not allowed to delete these posts")
-
-        deleted_count, _ = Post.objects.filter(author_id=user_id).delete()
-
-        return DeleteAllUserPosts(
-            success=True,
-            deleted_count=deleted_count
-        )
-
 class DeletePostMutation(graphene.Mutation):
     """
     Delete a post owned by the current user.
@@ -110,32 +94,52 @@ class DeletePostMutation(graphene.Mutation):
             raise Exception("Authentication required")
 
         post = get_object_or_404(Post, pk=int(post_id))
-        if post.author != user:
+        if post.author_id != user.id:
             raise Exception("You don't have permission to delete this post")
 
-        post.delete()
+        job = create_deletion_job(DeletionJob.KIND_POST, user.id, post_id=post.pk, requested_by=user)
+        run_deletion_job(job)
         return DeletePostMutation(success=True)
 
 
 class LikePostMutation(graphene.Mutation):
+    """
+    Like or unlike a post. With `like` set the call is idempotent
+    (like: true always leaves the post liked); without it, it toggles
+    (not atomic, see services.toggle_like). The returned post carries the
+    new likes count and like flag, so selecting them costs no queries.
+    """
     success = graphene.Boolean()
+    liked = graphene.Boolean()
     post = graphene.Field(PostType)
     message = graphene.String()
 
     class Arguments:
         post_id = graphene.ID(required=True)
+        like = graphene.Boolean(required=False)
 
-    def mutate(self, info, post_id):
+    def mutate(self, info, post_id, like=None):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("Authentication required")
 
-        post = get_object_or_404(Post, pk=int(post_id))
-
-        liked = toggle_like(post, user)
+        post = get_object_or_404(Post.objects.select_related("author"), pk=int(post_id))
+
+        if settings.LIKE_WRITE_BEHIND:
+            liked = (not is_post_liked(post, user)) if like is None else like
+            buffer_like(post, user, liked)
+        elif like is None:
+            liked = toggle_like(post, user)
+        elif like:
+            like_post(post, user)
+            liked = True
+        else:
+            unlike_post(post, user)
+            liked = False
+        post.viewer_has_liked = liked
         message = "Post liked" if liked else "Post unliked"
 
-        return LikePostMutation(success=True, post=post, message=message)
+        return LikePostMutation(success=True, liked=liked, post=post, message=message)
 
 
 class CreateCommentMutation(graphene.Mutation):
@@ -145,16 +149,18 @@ class CreateCommentMutation(graphene.Mutation):
     class Arguments:
         post_id = graphene.ID(required=True)
         content = graphene.String(required=True)
+        parent_id = graphene.ID(required=False)
 
-    def mutate(self, info, post_id, content):
+    def mutate(self, info, post_id, content, parent_id=None):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("Authentication required")
 
         post = get_object_or_404(Post, pk=int(post_id))
+        parent = get_object_or_404(Comment, pk=int(parent_id)) if parent_id else None
         
         # ✅ Use service function
-        comment = create_comment(post, user, content)
+        comment = create_comment(post, user, content, parent=parent)
         
         return CreateCommentMutation(comment=comment, success=True)
 
@@ -202,5 +208,5 @@ class DeleteCommentMutation(graphene.Mutation):
         if comment.author != user:
             raise Exception("You don't have permission to delete this comment")
 
-        comment.delete()
+        delete_comment(comment)
         return DeleteCommentMutation(success=True)
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Field-selection-aware query planning for PostType results.
+
+A resolver returning posts passes its `info` to planned_posts(); the
+selection under the field (fragments included) decides what the queryset
+fetches, so a query for `{ post(id: 1) { content } }` is one plain SELECT
+while one asking for counts, the author and the viewer's like flag is still
+one SELECT with joins and subqueries:
+ - author               -> select_related("author") (+ its image assets
+                           when the author's imageUrl/srcset is selected)
+ - imageUrl, srcset     -> select_related("image_asset")
+ - likesCount,
+   commentsCount        -> correlated COUNT subqueries (no JOIN fan-out)
+ - isLikedByUser        -> EXISTS subquery for the authenticated viewer
+recentLikes/recentComments are batched by loaders.load_recent, and nothing
+is ever prefetched: PostType has no unbounded likes/comments lists, and a
+page of posts with 10k likes each still loads one row per post.
+Callers outside GraphQL get DEFAULT_PLAN.
+"""
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode
+
+from .models import Post, Like, Comment
+
+IMAGE_FIELDS = {"imageUrl", "srcset"}
+AUTHOR_IMAGE_RELATIONS = ("author__profile_image_asset", "author__cover_image_asset")
+# Count annotation -> (GraphQL field, counted model)
+COUNT_FIELDS = {
+    "likes_count": ("likesCount", Like),
+    "comments_count": ("commentsCount", Comment),
+}
+
+
+def selection_tree(info):
+    """
+    {field name: sub-tree} of what is selected under the resolving field,
+    merged across its field nodes and fragments.
+    """
+    tree = {}
+    for node in info.field_nodes:
+        if node.selection_set is not None:
+            _merge_selections(tree, node.selection_set, info.fragments, set())
+    return tree
+
+
+def _merge_selections(tree, selection_set, fragments, visited):
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            subtree = tree.setdefault(selection.name.value, {})
+            if selection.selection_set is not None:
+                _merge_selections(subtree, selection.selection_set, fragments, visited)
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            fragment = fragments.get(name)
+            if fragment is not None and name not in visited:
+                _merge_selections(tree, fragment.selection_set, fragments, visited | {name})
+        elif isinstance(selection, InlineFragmentNode):
+            _merge_selections(tree, selection.selection_set, fragments, visited)
+
+
+def related_count(model):
+    """COUNT(*) of `model` rows pointing at the outer post, as a subquery."""
+    counts = (
+        model.objects.filter(post=OuterRef("pk"))
+        .order_by().values("post").annotate(count=Count("*")).values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def viewer_has_liked(user):
+    return Exists(Like.objects.filter(post=OuterRef("pk"), user=user))
+
+
+class PostPlan:
+    """The joins and annotations a selection of PostType fields needs."""
+
+    def __init__(self, tree):
+        self.select_related = []
+        if "author" in tree:
+            self.select_related.append("author")
+            if IMAGE_FIELDS & tree["author"].keys():
+                self.select_related.extend(AUTHOR_IMAGE_RELATIONS)
+        if IMAGE_FIELDS & tree.keys():
+            self.select_related.append("image_asset")
+        self.counts = [name for name, (field, _) in COUNT_FIELDS.items() if field in tree]
+        self.viewer_flag = "isLikedByUser" in tree
+
+    def apply(self, queryset, user=None):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        # Counts the queryset already has (e.g. for ranking) are reused
+        annotations = {
+            name: related_count(COUNT_FIELDS[name][1])
+            for name in self.counts if name not in queryset.query.annotations
+        }
+        if self.viewer_flag and user is not None and user.is_authenticated:
+            annotations["viewer_has_liked"] = viewer_has_liked(user)
+        return queryset.annotate(**annotations) if annotations else queryset
+
+
+# Everything PostType can show
+DEFAULT_PLAN = PostPlan({
+    "author": {"imageUrl": {}},
+    "imageUrl": {},
+    "likesCount": {},
+    "commentsCount": {},
+    "isLikedByUser": {},
+})
+
+
+def plan_posts(info):
+    return PostPlan(selection_tree(info))
+
+
+def planned_posts(info, queryset=None):
+    """`queryset` (all posts by default) fetching exactly what `info` selects."""
+    if queryset is None:
+        queryset = Post.objects.all()
+    return plan_posts(info).apply(queryset, getattr(info.context, "user", None))
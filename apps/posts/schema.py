@@ -6,15 +6,33 @@ Post-related GraphQL types and read queries.
 """
 
 import graphene
+from graphql import GraphQLError
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
-from .types import PostType, CommentType, LikeType, UserStatsType
-from .models import Post, Comment, Like
-from .services import get_user_feed,  get_trending_posts, get_user_stats
+from .types import (
+    PostType, CommentType, CommentPageType, LikeType, UserStatsType, DeletionJobType,
+    MAX_COMMENTS_PAGE, comment_page_type,
+)
+from .models import Post, Comment, Like, DeletionJob
+from .services import get_user_feed, get_trending_posts, get_user_stats
+from .loaders import load_posts, remember_posts
+from .planner import plan_posts, planned_posts
+from apps.common.query_cost import page_size
+
+
+MAX_POSTS_BY_IDS = 100
 
 
 User = get_user_model()
 
+
+def viewer_feed(info, limit, offset):
+    """The viewer's feed page (lazy queryset), shared by resolve_feed and aresolve_feed."""
+    user = info.context.user
+    if user.is_anonymous:
+        raise Exception("Authentication required")
+    return get_user_feed(user, limit=page_size(limit), offset=offset, plan=plan_posts(info))
+
 class PostQuery(graphene.ObjectType):
     # Get all posts (with pagination and search)
     posts = graphene.List(
@@ -26,6 +44,12 @@ class PostQuery(graphene.ObjectType):
     
     # Get single post by ID
     post = graphene.Field(PostType, id=graphene.ID(required=True))  # ✅ Changed to ID
+
+    # Get many posts by ID, in the given order (null for missing ids)
+    posts_by_ids = graphene.List(
+        PostType,
+        ids=graphene.List(graphene.NonNull(graphene.ID), required=True),
+    )
     
     # Get personalized feed
     feed = graphene.List(
@@ -42,16 +66,29 @@ class PostQuery(graphene.ObjectType):
         offset=graphene.Int(default_value=0),
     )
     
-    # Get comments on a post
+    # Get comments on a post (oldest first)
     comments = graphene.List(
         CommentType, 
-        post_id=graphene.ID(required=True)
+        post_id=graphene.ID(required=True),
+        limit=graphene.Int(default_value=20),
+        offset=graphene.Int(default_value=0),
+    )
+
+    # Page through a post's comment thread, replies nested depth-first
+    comment_thread = graphene.Field(
+        CommentPageType,
+        post_id=graphene.ID(required=True),
+        first=graphene.Int(default_value=20),
+        after=graphene.String(),
+        max_depth=graphene.Int(description="Deepest reply level to include (0 = top-level only)"),
     )
     
     # Get likes on a post
     likes = graphene.List(
         LikeType, 
-        post_id=graphene.ID(required=True)
+        post_id=graphene.ID(required=True),
+        limit=graphene.Int(),
+        offset=graphene.Int(default_value=0),
     )
 
     # Get trending posts
@@ -61,59 +98,84 @@ class PostQuery(graphene.ObjectType):
         user_id=graphene.ID(required=True)
     )
 
+    # Progress of a background post deletion started by the current user
+    deletion_job = graphene.Field(DeletionJobType, id=graphene.ID(required=True))
+
     def resolve_posts(self, info, limit, offset, query=None):
         """
         Returns paginated posts.
         If `query` is provided, it filters posts by content containing the query string.
         """
-        qs = Post.objects.select_related('author').prefetch_related('likes', 'comments').all()
+        qs = planned_posts(info)
 
         if query:
             qs = qs.filter(content__icontains=query)
 
-        return qs[offset: offset + limit]
+        return remember_posts(info.context, qs[offset: offset + page_size(limit)])
 
     def resolve_post(self, info, id):
-        """Get single post by ID."""
-        return get_object_or_404(Post, pk=int(id))  # ✅ Convert ID to int
+        """Get single post by ID, fetching only what the query selects."""
+        return get_object_or_404(planned_posts(info), pk=int(id))
+
+    def resolve_posts_by_ids(self, info, ids):
+        """Batch fetch posts in one query, keeping the input order."""
+        if len(ids) > MAX_POSTS_BY_IDS:
+            raise GraphQLError(f"postsByIds accepts at most {MAX_POSTS_BY_IDS} ids")
+        return load_posts(info.context, ids, planned_posts(info))
 
     def resolve_feed(self, info, limit, offset):
         """
         Returns paginated feed for the current user.
         Shows posts from users they follow.
         """
-        user = info.context.user
-        if user.is_anonymous:
-            raise Exception("Authentication required")
-        return get_user_feed(user, limit=limit, offset=offset)
+        return remember_posts(info.context, viewer_feed(info, limit, offset))
+
+    async def aresolve_feed(self, info, limit, offset):
+        """Async feed resolver used by the ASGI view."""
+        return remember_posts(info.context, [post async for post in viewer_feed(info, limit, offset)])
     
     def resolve_user_posts(self, info, user_id, limit, offset):
         """Get posts by a specific user."""
-        return Post.objects.filter(
+        return remember_posts(info.context, planned_posts(info, Post.objects.filter(
             author_id=int(user_id)
-        ).select_related('author').prefetch_related('likes', 'comments')[offset:offset + limit]
+        ))[offset:offset + page_size(limit)])
     
-    def resolve_comments(self, info, post_id):
-        """Get all comments on a post."""
+    def resolve_comments(self, info, post_id, limit, offset=0):
+        """Get comments on a post, at most MAX_COMMENTS_PAGE per call."""
+        limit = min(limit, MAX_COMMENTS_PAGE)
         return Comment.objects.filter(
             post_id=int(post_id)
-        ).select_related('author').order_by('created_at')
+        ).select_related('author').order_by('created_at')[offset:offset + limit]
+
+    def resolve_comment_thread(self, info, post_id, first, after=None, max_depth=None):
+        return comment_page_type(int(post_id), first, after, max_depth=max_depth)
     
-    def resolve_likes(self, info, post_id):
-        """Get all likes on a post."""
-        return Like.objects.filter(
+    def resolve_likes(self, info, post_id, limit=None, offset=0):
+        """Get likes on a post, newest first (a page of at most MAX_LIST_SIZE)."""
+        qs = Like.objects.filter(
             post_id=int(post_id)
         ).select_related('user').order_by('-created_at')
+        return qs[offset:offset + page_size(limit)]
 
     
     def resolve_trending_posts(self, info, limit):
         """Get trending posts from last 24 hours."""
-        return get_trending_posts(limit=limit)
+        return remember_posts(info.context, get_trending_posts(
+            limit=page_size(limit), plan=plan_posts(info), user=info.context.user,
+        ))
     
+    def resolve_deletion_job(self, info, id):
+        user = info.context.user
+        if user.is_anonymous:
+            raise Exception("Authentication required")
+        jobs = DeletionJob.objects.all()
+        if not user.is_staff:
+            jobs = jobs.filter(requested_by=user)
+        return jobs.filter(pk=int(id)).first()
+
     def resolve_user_stats(self, info, user_id):
         """Get user statistics."""
-        user = User.objects.get(pk=int(user_id))
-        return get_user_stats(user)
+        return get_user_stats(int(user_id))
 
 class PostMutation(graphene.ObjectType):
     from .mutations import (
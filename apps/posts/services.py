@@ -2,53 +2,60 @@
 Business logic for Posts, Likes, Comments.
 This layer ensures that GraphQL remains thin and clean.
 """
-from unittest import result
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.db.models import Q, Count, F
+from django.db import connection, transaction
+from django.db.models import Q, Count, F, Max, Value, CharField
+from django.db.models.functions import Cast, Greatest, LPad
 from django.utils import timezone
 from datetime import timedelta
-from .models import Post, Like, Comment
+import base64
+import uuid
+from collections import Counter, defaultdict
+from .models import Post, Like, Comment, UserStats, COMMENT_PATH_SEGMENT
+from apps.common.db import iterate_in_chunks, raw_delete
+from apps.common.response_cache import invalidate_tags
+from apps.common.watermarks import advance_watermark, changed_since, process_new_rows
 from apps.follows.models import Follow
-from apps.notifications.services import create_notification
+from apps.notifications.models import Notification
+from apps.notifications.services import create_notification, queue_notification_email
+from .like_buffer import get_like_buffer
+from .planner import DEFAULT_PLAN, related_count
 
+User = get_user_model()
 
-def get_user_feed(user, limit=20, offset=0):
-    """
-    Advanced feed algorithm with pagination.
+USER_STATS_FIELDS = (
+    'posts_count',
+    'total_likes_received',
+    'total_comments_received',
+    'followers_count',
+    'following_count',
+)
+USER_STATS_CACHE_TIMEOUT = 60 * 5
 
-    Feed rankings:
-    - Posts from followed users + own posts
-    - Sorted by engagement score and recency
-    - Recent posts (last 7 days) get bonus points
 
-    Parameters:
-        user: Current user requesting feed
-        limit: Number of posts to return
-        offset: Number of posts to skip (for pagination)
+def feed_queryset(user):
+    """
+    Ranked feed queryset for a user (see get_user_feed).
+    Only the counts needed for ranking are annotated; callers add joins
+    and viewer flags with a planner.PostPlan.
     """
-    cache_key = f"feed:{user.id}:{offset}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    cache.set(cache_key, result, timeout=60)
-    
     # Get IDs of users the current user follows
     following_ids = Follow.objects.filter(
         follower=user
     ).values_list('followed_id', flat=True)
 
-    # Get recent cutoff (posts from last 7 days get recency bonus)
-    recent_cutoff = timezone.now() - timedelta(days=7)
-
     # Base feed query: posts from followed users + own posts
     queryset = Post.objects.filter(
         Q(author_id__in=following_ids) | Q(author=user)
-    ).select_related('author').prefetch_related('likes', 'comments')
+    )
 
-    # Annotate with engagement score
-    queryset = queryset.annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comments', distinct=True),
+    # Annotate with engagement score (counted per post, not joined:
+    # joining likes and comments together multiplies the rows)
+    return queryset.annotate(
+        likes_count=related_count(Like),
+        comments_count=related_count(Comment),
     ).annotate(
         # Calculate engagement score
         engagement_score=(
@@ -57,24 +64,93 @@ def get_user_feed(user, limit=20, offset=0):
         )
     ).order_by('-engagement_score', '-created_at', '-updated_at', '-likes_count', '-comments_count')
 
+
+def get_user_feed(user, limit=20, offset=0, plan=DEFAULT_PLAN):
+    """
+    Advanced feed algorithm with pagination.
+
+    Feed rankings:
+    - Posts from followed users + own posts
+    - Sorted by engagement score and recency
+
+    Parameters:
+        user: Current user requesting feed
+        limit: Number of posts to return
+        offset: Number of posts to skip (for pagination)
+        plan: PostPlan for the fields the caller shows
+    """
     # Apply pagination
-    return queryset[offset:offset + limit]
+    return plan.apply(feed_queryset(user), user)[offset:offset + limit]
 
 
-def toggle_like(post, user):
+# Like writes are single statements: ON CONFLICT DO NOTHING / DELETE make them
+# idempotent under concurrent double-taps. On PostgreSQL the author's
+# total_likes_received counter is updated, and the post's likes counted, by
+# the same statement (the count sees the table as it was before the write).
+LIKE_INSERT = (
+    "INSERT INTO {like} (user_id, post_id, created_at) VALUES (%s, %s, %s) "
+    "ON CONFLICT (user_id, post_id) DO NOTHING RETURNING post_id"
+)
+LIKE_DELETE = "DELETE FROM {like} WHERE user_id = %s AND post_id = %s RETURNING post_id"
+LIKE_BULK_INSERT = (
+    "INSERT INTO {like} (user_id, post_id, created_at) VALUES {rows} "
+    "ON CONFLICT (user_id, post_id) DO NOTHING RETURNING user_id, post_id"
+)
+LIKE_COUNTER_CTE = (
+    "WITH changed AS ({write}), counted AS ("
+    "UPDATE {stats} SET total_likes_received = GREATEST(total_likes_received + %s, 0), updated_at = %s "
+    "WHERE user_id = %s AND EXISTS (SELECT 1 FROM changed) RETURNING user_id) "
+    "SELECT (SELECT COUNT(*) FROM changed), (SELECT COUNT(*) FROM counted), "
+    "(SELECT COUNT(*) FROM {like} WHERE post_id = %s)"
+)
+LIKE_COUNT = "SELECT COUNT(*) FROM {like} WHERE post_id = %s"
+
+
+def _write_like(sql, params, post, delta):
     """
-    Like or unlike a post.
-    Returns True if liked, False if unliked.
+    Run a like INSERT/DELETE and apply `delta` to the author's counter.
+    Returns True if a row was inserted/deleted, and sets the post's new
+    likes count as its `likes_count` annotation.
     """
-    like_obj = Like.objects.filter(post=post, user=user).first()
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    tables = {"like": Like._meta.db_table, "stats": UserStats._meta.db_table}
 
-    if like_obj:
-        like_obj.delete()
-        return False
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                LIKE_COUNTER_CTE.format(write=sql.format(**tables), **tables),
+                [*params(now), delta, now, post.author_id, post.pk],
+            )
+            changed, counted, likes_before = cursor.fetchone()
+            likes_count = likes_before + (delta if changed else 0)
+        else:
+            cursor.execute(sql.format(**tables), params(now))
+            changed, counted = cursor.fetchone() is not None, False
+            cursor.execute(LIKE_COUNT.format(**tables), [post.pk])
+            likes_count = cursor.fetchone()[0]
 
-    Like.objects.create(post=post, user=user)
+    post.likes_count = likes_count
+    if changed:
+        if counted:
+            user_stats_changed(post.author_id)
+        else:
+            bump_user_stats(post.author_id, total_likes_received=delta)
+    return bool(changed)
 
-    if post.author != user:
+
+def like_post(post, user):
+    """
+    Like a post. Idempotent: returns True if a new like was recorded,
+    False if the user already liked it.
+    """
+    liked = _write_like(
+        LIKE_INSERT, lambda now: [user.pk, post.pk, now], post, 1,
+    )
+    if not liked:
+        return False
+
+    invalidate_tags(f"post:{post.pk}")
+    if post.author_id != user.pk:
         create_notification(
             recipient=post.author,
             actor=user,
@@ -82,18 +158,198 @@ def toggle_like(post, user):
             post=post,
             message="liked your post",
         )
+    return True
+
+
+def unlike_post(post, user):
+    """
+    Remove a like. Idempotent: returns True if a like was removed,
+    False if there was none.
+    """
+    unliked = _write_like(
+        LIKE_DELETE, lambda now: [user.pk, post.pk], post, -1,
+    )
+    if unliked:
+        invalidate_tags(f"post:{post.pk}")
+    return unliked
+
 
+def toggle_like(post, user):
+    """
+    Like or unlike a post.
+    Returns True if liked, False if unliked.
+
+    Unlike-then-like is two statements, so two concurrent toggles by the
+    same user can both see no like and both report "liked". Clients that
+    know the state they want should pass it (likePost(like: ...)), which
+    is a single idempotent statement.
+    """
+    if unlike_post(post, user):
+        return False
+    like_post(post, user)
     return True
 
-def create_comment(post, user, content):
+
+def buffer_like(post, user, liked):
+    """
+    Write-behind mode: record a like/unlike intent in the like buffer.
+    flush_like_buffer applies it later.
+    """
+    get_like_buffer().append(user.pk, post.pk, liked)
+
+
+def pending_like_state(user, post_id):
+    """The viewer's buffered like state for a post, or None if nothing is pending."""
+    if not settings.LIKE_WRITE_BEHIND or user.is_anonymous:
+        return None
+    return get_like_buffer().pending_state(user.pk, [post_id]).get(int(post_id))
+
+
+def is_post_liked(post, user):
+    pending = pending_like_state(user, post.pk)
+    if pending is not None:
+        return pending
+    # Annotated by planner.PostPlan / loaders.posts_with_counts
+    if "viewer_has_liked" in post.__dict__:
+        return post.viewer_has_liked
+    return Like.objects.filter(post=post, user=user).exists()
+
+
+def flush_like_buffer(batch_size=1000):
     """
-    Create a new comment on a post.
+    Apply one batch of buffered like intents.
+
+    Intents are collapsed to the last one per (user, post) and compared with
+    the current rows, so one multi-row INSERT and one DELETE per post cover
+    the batch. Counter deltas are counted from the rows those statements
+    changed and merged per author, so replaying a batch is harmless. Returns the number of intents consumed.
     """
-    comment = Comment.objects.create(
-        post=post,
-        author=user,
-        content=content
+    buffer = get_like_buffer()
+    with buffer.flush_lock() as acquired:
+        if not acquired:
+            return 0
+        return _apply_like_intents(buffer, buffer.read_batch(batch_size))
+
+
+def _apply_like_intents(buffer, intents):
+    if not intents:
+        return 0
+
+    latest = {}
+    for intent in intents:
+        latest[(intent.user_id, intent.post_id)] = intent.liked
+    post_ids = {post_id for _, post_id in latest}
+    user_ids = {user_id for user_id, _ in latest}
+
+    authors = dict(Post.objects.filter(id__in=post_ids).values_list("id", "author_id"))
+    deltas = Counter()
+    with transaction.atomic():
+        existing = set(
+            Like.objects.filter(post_id__in=post_ids, user_id__in=user_ids)
+            .values_list("user_id", "post_id")
+        )
+        to_create = [
+            pair for pair, liked in latest.items()
+            if liked and pair not in existing and pair[1] in authors
+        ]
+        to_delete = defaultdict(list)
+        for (user_id, post_id), liked in latest.items():
+            if not liked and (user_id, post_id) in existing:
+                to_delete[post_id].append(user_id)
+
+        # Count what the statements actually changed: a concurrent like,
+        # unlike or deletion job may have got there first
+        created = _insert_likes(to_create)
+        for post_id, unlikers in to_delete.items():
+            deltas[authors[post_id]] -= raw_delete(Like.objects.filter(post_id=post_id, user_id__in=unlikers))
+        for user_id, post_id in created:
+            deltas[authors[post_id]] += 1
+
+        for author_id, delta in deltas.items():
+            if delta:
+                bump_user_stats(author_id, total_likes_received=delta)
+        _bulk_like_notifications(created, authors)
+
+    buffer.ack(intents)
+    changed_posts = {post_id for _, post_id in created} | set(to_delete)
+    if changed_posts:
+        invalidate_tags(*[f"post:{post_id}" for post_id in changed_posts])
+    return len(intents)
+
+
+def _insert_likes(pairs, chunk_size=500):
+    """INSERT the (user id, post id) likes; returns the pairs actually inserted."""
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    inserted = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start:start + chunk_size]
+            cursor.execute(
+                LIKE_BULK_INSERT.format(like=Like._meta.db_table, rows=", ".join(["(%s, %s, %s)"] * len(chunk))),
+                [value for user_id, post_id in chunk for value in (user_id, post_id, now)],
+            )
+            inserted.extend((user_id, post_id) for user_id, post_id in cursor.fetchall())
+    return inserted
+
+
+def _bulk_like_notifications(likes, authors):
+    """Create the (deduplicated) like notifications for newly flushed likes."""
+    likes = [(user_id, post_id) for user_id, post_id in likes if user_id != authors[post_id]]
+    if not likes:
+        return
+    already_notified = set(
+        Notification.objects.filter(
+            notification_type="like",
+            post_id__in={post_id for _, post_id in likes},
+            sender_id__in={user_id for user_id, _ in likes},
+        ).values_list("sender_id", "post_id")
     )
+    created = Notification.objects.bulk_create([
+        Notification(
+            recipient_id=authors[post_id],
+            sender_id=user_id,
+            notification_type="like",
+            post_id=post_id,
+            message="liked your post",
+        )
+        for user_id, post_id in likes
+        if (user_id, post_id) not in already_notified
+    ])
+    if not created:
+        return
+    # The same emails create_notification() sends for synchronous likes
+    users = User.objects.in_bulk({n.recipient_id for n in created} | {n.sender_id for n in created})
+    posts = Post.objects.only("content").in_bulk({n.post_id for n in created})
+
+    def queue_emails():
+        for notif in created:
+            queue_notification_email(
+                notif, users[notif.recipient_id], users[notif.sender_id], "like", posts.get(notif.post_id),
+            )
+    transaction.on_commit(queue_emails)
+
+
+def create_comment(post, user, content, parent=None):
+    """
+    Create a new comment on a post, or a reply to `parent`.
+    """
+    if parent is not None:
+        if parent.post_id != post.pk:
+            raise ValueError("Parent comment belongs to another post")
+        if parent.depth >= Comment.MAX_DEPTH:
+            raise ValueError(f"Replies can be nested at most {Comment.MAX_DEPTH} levels deep")
+
+    with transaction.atomic():
+        comment = Comment.objects.create(
+            post=post,
+            author=user,
+            content=content,
+            parent=parent,
+        )
+        if parent is not None:
+            Comment.objects.filter(pk=parent.pk).update(replies_count=F('replies_count') + 1)
+    bump_user_stats(post.author_id, total_comments_received=1)
+    invalidate_tags(f"post:{post.pk}")
 
     if post.author != user:
         create_notification(
@@ -103,52 +359,352 @@ def create_comment(post, user, content):
             post=post,
             message="commented on your post",
         )
+    if parent is not None and parent.author_id not in (user.pk, post.author_id):
+        create_notification(
+            recipient=parent.author,
+            actor=user,
+            verb="comment",
+            post=post,
+            message="replied to your comment",
+        )
 
     return comment
 
 
+def comment_subtree(comment, include_self=False):
+    """Replies to `comment` at any depth (a range on the post's path index)."""
+    upper = str(int(comment.path) + 1).zfill(len(comment.path))
+    lower = {"path__gte" if include_self else "path__gt": comment.path}
+    return Comment.objects.filter(post_id=comment.post_id, path__lt=upper, **lower)
+
+
+def delete_comment(comment):
+    """
+    Delete a comment with its replies and update the post author's stats.
+    The subtree goes in one DELETE on the path range rather than through
+    the `parent` cascade, which would collect every reply in Python.
+    """
+    post_author_id = comment.post.author_id
+    with transaction.atomic():
+        deleted = raw_delete(comment_subtree(comment, include_self=True))
+        if deleted and comment.parent_id:
+            Comment.objects.filter(pk=comment.parent_id, replies_count__gt=0).update(
+                replies_count=F('replies_count') - 1
+            )
+        if deleted:
+            bump_user_stats(post_author_id, total_comments_received=-deleted)
+    invalidate_tags(f"post:{comment.post_id}")
+
+
+def encode_cursor(path):
+    return base64.urlsafe_b64encode(path.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        path = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if not path.isdigit():
+        raise ValueError("Invalid cursor")
+    return path
+
+
+def comment_page(post_id, first=20, after=None, root=None, max_depth=None):
+    """
+    A page of a comment thread in depth-first (path) order.
+
+    Without `root` the page walks the whole post; with it, only the replies
+    under `root`. `max_depth` (absolute) leaves out deeper replies, which
+    clients load later via `root`. Either way the page is a single range
+    scan on (post, path), however deep or busy the thread is.
+    Returns (comments, end cursor, has next page).
+    """
+    queryset = comment_subtree(root) if root is not None else Comment.objects.filter(post_id=post_id)
+    if max_depth is not None:
+        queryset = queryset.filter(depth__lte=max_depth)
+    if after:
+        queryset = queryset.filter(path__gt=decode_cursor(after))
+
+    comments = list(queryset.select_related('author').order_by('path')[:first + 1])
+    has_next = len(comments) > first
+    comments = comments[:first]
+    end_cursor = encode_cursor(comments[-1].path) if comments else None
+    return comments, end_cursor, has_next
+
+
+def fill_root_comment_paths(queryset=None):
+    """Set `path` for comments inserted without save() (e.g. bulk_create)."""
+    queryset = Comment.objects.all() if queryset is None else queryset
+    return queryset.filter(path="", parent__isnull=True).update(
+        path=LPad(Cast('id', CharField()), COMMENT_PATH_SEGMENT, Value('0')),
+    )
+
+
 def get_post_with_engagement(post_id):
     """
     Get a single post with engagement metrics pre-calculated.
-    Useful for detail views.
+    Useful for detail views (GraphQL resolvers use planner.planned_posts).
     """
-    return Post.objects.annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comments', distinct=True),
+    return Post.objects.select_related('author', 'image_asset').annotate(
+        likes_count=related_count(Like),
+        comments_count=related_count(Comment),
     ).get(pk=post_id)
 
 
-def get_trending_posts(limit=10):
-    """
-    Get trending posts based on recent engagement.
-    Posts from the last 24 hours with high engagement.
-    """
-    cutoff = timezone.now() - timedelta(hours=24)
-    
+TRENDING_WINDOW = timedelta(hours=24)
+TRENDING_SCORES_CACHE_KEY = "trending:scores"
+TRENDING_SCORES_TIMEOUT = 60 * 60 * 2
+# Serializes update_trending_scores runs; expires if a worker dies holding it
+TRENDING_LOCK_KEY = "trending:lock"
+TRENDING_LOCK_TIMEOUT = 60 * 10
+# Engagement score weights
+LIKE_WEIGHT = 3
+COMMENT_WEIGHT = 2
+
+
+def trending_queryset():
+    """Posts from the trending window with a positive engagement score."""
+    cutoff = timezone.now() - TRENDING_WINDOW
+
     return Post.objects.filter(
         created_at__gte=cutoff
     ).annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comments', distinct=True),
+        likes_count=related_count(Like),
+        comments_count=related_count(Comment),
         engagement_score=(
-            F('likes_count') * 3 + F('comments_count') * 2
+            F('likes_count') * LIKE_WEIGHT + F('comments_count') * COMMENT_WEIGHT
         )
     ).filter(
         engagement_score__gt=0
-    ).order_by('-engagement_score')[:limit]
+    )
 
 
-def get_user_stats(user):
+def get_trending_posts(limit=10, plan=DEFAULT_PLAN, user=None):
+    """
+    Get trending posts based on recent engagement.
+    Posts from the last 24 hours with high engagement, ranked from the
+    scores kept by update_trending_scores (or live if none are cached).
+    """
+    scores = cache.get(TRENDING_SCORES_CACHE_KEY)
+    if scores is None:
+        return plan.apply(trending_queryset(), user).order_by('-engagement_score')[:limit]
+
+    cutoff = (timezone.now() - TRENDING_WINDOW).timestamp()
+    ranked = sorted(
+        ((score, post_id) for post_id, (score, created) in scores.items() if score > 0 and created >= cutoff),
+        reverse=True,
+    )[:limit]
+    post_ids = [post_id for _, post_id in ranked]
+    posts = plan.apply(Post.objects.filter(pk__in=post_ids), user).in_bulk()
+    return [posts[post_id] for post_id in post_ids if post_id in posts]
+
+
+def update_trending_scores(full=False, chunk_size=5000):
+    """
+    Keep the cached trending scores ({post id: [score, created timestamp]})
+    current. Normally only likes and comments added since the last run are
+    counted (watermarks "trending.likes" / "trending.comments") and posts
+    that left the window are dropped; a full run, or a missing cache, ranks
+    the whole window again. Unlikes and deleted comments are only reflected
+    by full runs. Returns the number of scored posts.
+
+    Runs read-modify-write the cached scores, so they are serialized with
+    a cache lock: while another run holds it this returns None at once
+    (the update_trending task retries full runs later).
+    """
+    token = uuid.uuid4().hex
+    if not cache.add(TRENDING_LOCK_KEY, token, timeout=TRENDING_LOCK_TIMEOUT):
+        return None
+    try:
+        return _update_trending_scores(full, chunk_size)
+    finally:
+        if cache.get(TRENDING_LOCK_KEY) == token:
+            cache.delete(TRENDING_LOCK_KEY)
+
+
+def _update_trending_scores(full, chunk_size):
+    scores = None if full else cache.get(TRENDING_SCORES_CACHE_KEY)
+    if scores is None:
+        last_like = Like.objects.aggregate(last=Max('pk'))['last'] or 0
+        last_comment = Comment.objects.aggregate(last=Max('pk'))['last'] or 0
+        scores = {
+            row['pk']: [row['engagement_score'], row['created_at'].timestamp()]
+            for row in trending_queryset().values('pk', 'created_at', 'engagement_score')
+        }
+        advance_watermark("trending.likes", last_like)
+        advance_watermark("trending.comments", last_comment)
+    else:
+        cutoff = timezone.now() - TRENDING_WINDOW
+        for name, model, weight in (
+            ("trending.likes", Like, LIKE_WEIGHT),
+            ("trending.comments", Comment, COMMENT_WEIGHT),
+        ):
+            def add(rows, weight=weight):
+                for row in rows:
+                    entry = scores.setdefault(row['post_id'], [0, row['post__created_at'].timestamp()])
+                    entry[0] += weight
+
+            process_new_rows(
+                name,
+                model.objects.filter(post__created_at__gte=cutoff).values('id', 'post_id', 'post__created_at'),
+                add,
+                chunk_size,
+            )
+        scores = {
+            post_id: entry for post_id, entry in scores.items()
+            if entry[1] >= cutoff.timestamp()
+        }
+
+    cache.set(TRENDING_SCORES_CACHE_KEY, scores, timeout=TRENDING_SCORES_TIMEOUT)
+    return len(scores)
+
+
+def user_stats_cache_key(user_id):
+    return f"user_stats:{user_id}"
+
+
+def compute_user_stats(user_id):
+    """
+    Count a user's statistics straight from the source tables.
+    This is the slow path used to (re)build the materialized row.
+    """
+    return {
+        'posts_count': Post.objects.filter(author_id=user_id).count(),
+        'total_likes_received': Like.objects.filter(post__author_id=user_id).count(),
+        'total_comments_received': Comment.objects.filter(post__author_id=user_id).count(),
+        'followers_count': Follow.objects.filter(followed_id=user_id).count(),
+        'following_count': Follow.objects.filter(follower_id=user_id).count(),
+    }
+
+
+def refresh_user_stats(user_id):
+    """
+    Recompute and store the materialized stats row for one user.
+    """
+    stats = compute_user_stats(user_id)
+    UserStats.objects.update_or_create(user_id=user_id, defaults=stats)
+    cache.delete(user_stats_cache_key(user_id))
+    invalidate_tags(f"user:{user_id}")
+    return stats
+
+
+def bump_user_stats(user_id, **deltas):
+    """
+    Apply counter deltas to a user's stats row, e.g.
+    bump_user_stats(author_id, total_likes_received=1).
+
+    The update is a single UPDATE with F() expressions so concurrent events
+    do not overwrite each other. If the row has not been materialized yet
+    it is built from the source tables instead.
+    """
+    updated = UserStats.objects.filter(user_id=user_id).update(
+        updated_at=timezone.now(),
+        **{
+            field: Greatest(F(field) + delta, Value(0))
+            for field, delta in deltas.items()
+        },
+    )
+    if not updated:
+        refresh_user_stats(user_id)
+    user_stats_changed(user_id)
+
+
+def warm_user_stats_cache(chunk_size=1000):
+    """
+    Re-cache the stats of users whose UserStats row changed since the last
+    run (changing a row drops its cached copy). The first run warms rows
+    changed within the cache timeout. Returns the number of users warmed.
+    """
+    warmed = 0
+    with changed_since("user_stats.warm") as since:
+        since = since or timezone.now() - timedelta(seconds=USER_STATS_CACHE_TIMEOUT)
+        rows = UserStats.objects.filter(updated_at__gte=since).values('user_id', *USER_STATS_FIELDS)
+        batch = {}
+        for row in iterate_in_chunks(rows, chunk_size=chunk_size):
+            batch[user_stats_cache_key(row.pop('user_id'))] = row
+            if len(batch) >= chunk_size:
+                cache.set_many(batch, timeout=USER_STATS_CACHE_TIMEOUT)
+                warmed += len(batch)
+                batch = {}
+        cache.set_many(batch, timeout=USER_STATS_CACHE_TIMEOUT)
+        warmed += len(batch)
+    return warmed
+
+
+def user_stats_changed(user_id):
+    """Drop cached copies of a user's stats after their row changed."""
+    cache.delete(user_stats_cache_key(user_id))
+    invalidate_tags(f"user:{user_id}")
+
+
+def rebuild_all_user_stats(chunk_size=1000):
+    """
+    Rebuild every user's stats row from the source tables.
+
+    Users are processed in primary-key order, one chunk at a time, with one
+    grouped COUNT query per counter and a single upsert per chunk.
+    Returns the number of users processed.
+    """
+    total = 0
+    last_id = 0
+
+    while True:
+        user_ids = list(
+            User.objects.filter(pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not user_ids:
+            break
+
+        counts = {user_id: dict.fromkeys(USER_STATS_FIELDS, 0) for user_id in user_ids}
+        sources = (
+            ('posts_count', Post.objects.filter(author_id__in=user_ids), 'author_id'),
+            ('total_likes_received', Like.objects.filter(post__author_id__in=user_ids), 'post__author_id'),
+            ('total_comments_received', Comment.objects.filter(post__author_id__in=user_ids), 'post__author_id'),
+            ('followers_count', Follow.objects.filter(followed_id__in=user_ids), 'followed_id'),
+            ('following_count', Follow.objects.filter(follower_id__in=user_ids), 'follower_id'),
+        )
+        for field, queryset, key in sources:
+            for row in queryset.values(key).annotate(n=Count('pk')).order_by():
+                counts[row[key]][field] = row['n']
+
+        UserStats.objects.bulk_create(
+            [UserStats(user_id=user_id, **fields) for user_id, fields in counts.items()],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[*USER_STATS_FIELDS, 'updated_at'],
+        )
+        cache.delete_many([user_stats_cache_key(user_id) for user_id in user_ids])
+        invalidate_tags(*(f"user:{user_id}" for user_id in user_ids))
+
+        total += len(user_ids)
+        last_id = user_ids[-1]
+
+    return total
+
+
+def get_user_stats(user_id):
     """
     Get aggregated statistics for a user.
-    
+
+    Reads the materialized UserStats row (cached per user); the row is built
+    on first access if it does not exist yet.
+
     Returns:
         dict: User statistics including posts, likes, comments counts
     """
-    return {
-        'posts_count': Post.objects.filter(author=user).count(),
-        'total_likes_received': Like.objects.filter(post__author=user).count(),
-        'total_comments_received': Comment.objects.filter(post__author=user).count(),
-        'followers_count': Follow.objects.filter(followed=user).count(),
-        'following_count': Follow.objects.filter(follower=user).count(),
-    }
\ No newline at end of file
+    cache_key = user_stats_cache_key(user_id)
+    stats = cache.get(cache_key)
+    if stats is not None:
+        return stats
+
+    stats = UserStats.objects.filter(user_id=user_id).values(*USER_STATS_FIELDS).first()
+    if stats is None:
+        if not User.objects.filter(pk=user_id).exists():
+            raise User.DoesNotExist("User matching query does not exist.")
+        stats = refresh_user_stats(user_id)
+
+    cache.set(cache_key, stats, timeout=USER_STATS_CACHE_TIMEOUT)
+    return stats
@@ -0,0 +1,15 @@
+"""
+Signals that keep cached GraphQL responses in sync with Post rows.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.response_cache import invalidate_tags
+from .models import Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_responses(sender, instance, **kwargs):
+    invalidate_tags("posts", f"post:{instance.pk}", f"user:{instance.author_id}")
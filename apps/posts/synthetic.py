@@ -0,0 +1,233 @@
+"""
+Synthetic social graph generator used for load testing and benchmarks.
+
+Follower counts, post activity and post popularity follow power-law
+(Zipf-like) distributions, so a few users are followed by most of the graph
+while the long tail has a handful of followers, as in a real network.
+Everything is written with bulk_create in chunks.
+"""
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from apps.follows.models import Follow
+from apps.notifications.models import Notification
+from .models import Post, Comment, Like
+from .services import rebuild_all_user_stats, fill_root_comment_paths
+
+
+User = get_user_model()
+
+WORDS = (
+    "coffee morning travel code python django music weekend launch photo "
+    "sunset team coding release friends city book movie food design"
+).split()
+
+
+@contextmanager
+def manual_timestamps(*models):
+    """Let bulk_create keep explicit created_at values instead of auto_now_add."""
+    fields = [model._meta.get_field("created_at") for model in models]
+    previous = [field.auto_now_add for field in fields]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in zip(fields, previous):
+            field.auto_now_add = value
+
+
+def zipf_weights(n, alpha):
+    """Cumulative weights for picking rank r with probability ~ 1 / r**alpha."""
+    return list(accumulate(1.0 / (rank ** alpha) for rank in range(1, n + 1)))
+
+
+def chunked_create(model, rows, chunk_size, ignore_conflicts=False):
+    """bulk_create an iterable of unsaved instances chunk by chunk."""
+    batch = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+            total += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+        total += len(batch)
+    return total
+
+
+class SocialGraphGenerator:
+    """
+    Generate users, follows, posts, likes, comments and notifications.
+
+    Volumes are given per user / per post; `alpha` controls how skewed the
+    follower and popularity distributions are (higher = more skewed).
+    """
+
+    def __init__(self, users=1000, posts_per_user=10, likes_per_post=5,
+                 comments_per_post=2, follows_per_user=30, notification_ratio=0.2,
+                 alpha=1.1, days=30, prefix="synth", chunk_size=5000, seed=None,
+                 log=None):
+        self.users = users
+        self.posts_per_user = posts_per_user
+        self.likes_per_post = likes_per_post
+        self.comments_per_post = comments_per_post
+        self.follows_per_user = follows_per_user
+        self.notification_ratio = notification_ratio
+        self.alpha = alpha
+        self.days = days
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.pending_notifications = []
+
+    def random_time(self, after=None):
+        start = after or self.now - timedelta(days=self.days)
+        span = (self.now - start).total_seconds()
+        return start + timedelta(seconds=self.random.random() * span)
+
+    def random_text(self, words=12):
+        return " ".join(self.random.choices(WORDS, k=self.random.randint(3, words)))
+
+    def maybe_notify(self, recipient_id, sender_id, notification_type, created_at, post_id=None):
+        """Emit a notification for a sampled fraction of events."""
+        if recipient_id == sender_id or self.random.random() >= self.notification_ratio:
+            return
+        self.pending_notifications.append(Notification(
+            recipient_id=recipient_id,
+            sender_id=sender_id,
+            notification_type=notification_type,
+            post_id=post_id,
+            created_at=created_at,
+        ))
+        if len(self.pending_notifications) >= self.chunk_size:
+            self.flush_notifications()
+
+    def flush_notifications(self):
+        if self.pending_notifications:
+            Notification.objects.bulk_create(self.pending_notifications)
+            self.pending_notifications = []
+
+    def generate(self):
+        with manual_timestamps(Post, Comment, Like, Follow, Notification):
+            user_ids = self.create_users()
+            self.create_follows(user_ids)
+            posts = self.create_posts(user_ids)
+            self.create_likes(user_ids, posts)
+            self.create_comments(user_ids, posts)
+
+        self.log("Rebuilding user stats...")
+        rebuild_all_user_stats()
+        return user_ids
+
+    def create_users(self):
+        password = make_password(None)
+        rows = (
+            User(
+                username=f"{self.prefix}_{n}",
+                email=f"{self.prefix}_{n}@example.com",
+                password=password,
+                bio=self.random_text(),
+            )
+            for n in range(self.users)
+        )
+        chunked_create(User, rows, self.chunk_size)
+        # Order by id so that index 0 is rank 1 (the most followed user)
+        user_ids = list(
+            User.objects.filter(username__startswith=f"{self.prefix}_")
+            .order_by("id").values_list("id", flat=True)
+        )
+        self.log(f"Created {len(user_ids)} users")
+        return user_ids
+
+    def create_follows(self, user_ids):
+        weights = zipf_weights(len(user_ids), self.alpha)
+
+        def rows():
+            for follower_id in user_ids:
+                # How many accounts a user follows is itself heavy tailed
+                count = min(
+                    len(user_ids) - 1,
+                    int(self.random.paretovariate(1.5) * self.follows_per_user / 3),
+                )
+                targets = set(self.random.choices(user_ids, cum_weights=weights, k=count))
+                targets.discard(follower_id)
+                for followed_id in targets:
+                    created_at = self.random_time()
+                    self.maybe_notify(followed_id, follower_id, "follow", created_at)
+                    yield Follow(follower_id=follower_id, followed_id=followed_id, created_at=created_at)
+
+        total = chunked_create(Follow, rows(), self.chunk_size, ignore_conflicts=True)
+        self.flush_notifications()
+        self.log(f"Created {total} follows")
+
+    def create_posts(self, user_ids):
+        weights = zipf_weights(len(user_ids), self.alpha)
+        # Shuffle so posting activity is independent of follower rank
+        authors = user_ids[:]
+        self.random.shuffle(authors)
+        total_posts = self.users * self.posts_per_user
+
+        rows = (
+            Post(
+                author_id=author_id,
+                content=self.random_text(30),
+                created_at=self.random_time(),
+            )
+            for author_id in self.random.choices(authors, cum_weights=weights, k=total_posts)
+        )
+        chunked_create(Post, rows, self.chunk_size)
+
+        posts = list(
+            Post.objects.filter(author__username__startswith=f"{self.prefix}_")
+            .values_list("id", "author_id", "created_at")
+        )
+        self.log(f"Created {len(posts)} posts")
+        return posts
+
+    def create_engagement(self, model, user_ids, posts, per_post, notification_type, extra):
+        post_weights = zipf_weights(len(posts), self.alpha)
+        # Popular posts get most of the engagement
+        ranked = posts[:]
+        self.random.shuffle(ranked)
+
+        def rows():
+            remaining = len(posts) * per_post
+            while remaining > 0:
+                k = min(remaining, self.chunk_size)
+                remaining -= k
+                for post_id, author_id, posted_at in self.random.choices(ranked, cum_weights=post_weights, k=k):
+                    user_id = self.random.choice(user_ids)
+                    created_at = self.random_time(after=posted_at)
+                    self.maybe_notify(author_id, user_id, notification_type, created_at, post_id)
+                    yield model(post_id=post_id, created_at=created_at, **extra(user_id))
+
+        total = chunked_create(model, rows(), self.chunk_size, ignore_conflicts=model is Like)
+        self.flush_notifications()
+        return total
+
+    def create_likes(self, user_ids, posts):
+        total = self.create_engagement(
+            Like, user_ids, posts, self.likes_per_post, "like",
+            lambda user_id: {"user_id": user_id},
+        )
+        self.log(f"Created {total} likes (before de-duplication)")
+
+    def create_comments(self, user_ids, posts):
+        total = self.create_engagement(
+            Comment, user_ids, posts, self.comments_per_post, "comment",
+            lambda user_id: {"author_id": user_id, "content": self.random_text()},
+        )
+        # bulk_create bypasses Comment.save(), which sets the thread path
+        fill_root_comment_paths()
+        self.log(f"Created {total} comments")
@@ -0,0 +1,89 @@
+# apps/posts/tasks.py
+
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from apps.common.caching import cache_is_shared
+from .deletion import resumable_jobs, run_deletion_job
+from .models import DeletionJob
+from .services import rebuild_all_user_stats, flush_like_buffer, update_trending_scores, warm_user_stats_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _warms_shared_cache(task_name):
+    """
+    The trending and user-stats warmers only help when the web processes
+    read the cache they write (Redis, see CACHES); a per-process cache in a
+    worker would just be warmed for nobody.
+    """
+    if cache_is_shared() or settings.CELERY_TASK_ALWAYS_EAGER:
+        return True
+    logger.warning("Skipping %s: the default cache is not shared with the web processes", task_name)
+    return False
+
+
+@shared_task
+def rebuild_user_stats():
+    """
+    Nightly full rebuild of the materialized UserStats table.
+    Corrects any drift left by the incremental counter updates.
+    """
+    return rebuild_all_user_stats()
+
+
+@shared_task
+def flush_likes():
+    """
+    Apply buffered like intents (write-behind mode), draining the buffer
+    in batches of LIKE_BUFFER_BATCH_SIZE.
+    """
+    if not settings.LIKE_WRITE_BEHIND:
+        return 0
+    total = 0
+    while True:
+        applied = flush_like_buffer(settings.LIKE_BUFFER_BATCH_SIZE)
+        total += applied
+        if applied < settings.LIKE_BUFFER_BATCH_SIZE:
+            return total
+
+
+@shared_task
+def run_deletion(job_id):
+    """Run or resume a DeletionJob."""
+    job = DeletionJob.objects.get(pk=job_id)
+    run_deletion_job(job)
+    return job.deleted
+
+
+@shared_task
+def resume_deletion_jobs():
+    """Re-enqueue deletion jobs that crashed or were never picked up."""
+    job_ids = list(resumable_jobs().values_list("pk", flat=True))
+    for job_id in job_ids:
+        run_deletion.delay(job_id)
+    return len(job_ids)
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=60)
+def update_trending(self, full=False):
+    """
+    Fold new likes/comments into the cached trending scores (or rebuild
+    them). While a concurrent run holds the trending lock an incremental
+    run is skipped (the next one is a minute away) and a full run retries.
+    """
+    if not _warms_shared_cache("update_trending"):
+        return 0
+    scored = update_trending_scores(full=full)
+    if scored is None and full:
+        raise self.retry()
+    return scored
+
+
+@shared_task
+def warm_user_stats():
+    """Re-cache user stats that changed since the last run."""
+    if not _warms_shared_cache("warm_user_stats"):
+        return 0
+    return warm_user_stats_cache()
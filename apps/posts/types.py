@@ -1,13 +1,22 @@
 import graphene
+from graphql import GraphQLError
 from graphene_django import DjangoObjectType
 from django.contrib.auth import get_user_model
 
+from apps.media.types import ImageSize, ImageFormat, asset_url, asset_srcset
 from apps.users.types import UserType
-from .models import Post, Comment, Like
+from .models import Post, Comment, Like, DeletionJob
+from .services import is_post_liked, comment_page
+from .loaders import load_recent
 
 User = get_user_model()
 
 
+def annotated(post, name):
+    """A queryset annotation on `post`, or None (Post has same-named methods)."""
+    return post.__dict__.get(name)
+
+
 class PostType(DjangoObjectType):
     """GraphQL type for Post model."""
     author = graphene.Field(UserType)
@@ -15,7 +24,11 @@ class PostType(DjangoObjectType):
     likes_count = graphene.Int()
     comments_count = graphene.Int()
     is_liked_by_user = graphene.Boolean()
-    image_url = graphene.String()
+    image_url = graphene.String(size=ImageSize(), format=ImageFormat())
+    srcset = graphene.String(format=ImageFormat())
+    # Previews for "liked by X, Y and N others", batched per request
+    recent_likes = graphene.List(lambda: LikeType, limit=graphene.Int(default_value=3))
+    recent_comments = graphene.List(lambda: CommentType, limit=graphene.Int(default_value=3))
     
     class Meta:
         model = Post
@@ -23,29 +36,80 @@ class PostType(DjangoObjectType):
 
     def resolve_likes_count(self, info):
         """Count of likes on this post."""
-        return self.likes.count()
+        count = annotated(self, "likes_count")
+        return self.likes.count() if count is None else count
     
-    def resolve_image_url(self, info):
-        return self.image or None
+    def resolve_image_url(self, info, size=None, format=None):
+        """The image at `size` (original when omitted)."""
+        return asset_url(self.image_asset, self.image, size, format)
+
+    def resolve_srcset(self, info, format=None):
+        return asset_srcset(self.image_asset, format)
 
     def resolve_comments_count(self, info):
         """Count of comments on this post."""
-        return self.comments.count()
+        count = annotated(self, "comments_count")
+        return self.comments.count() if count is None else count
 
     def resolve_is_liked_by_user(self, info):
         """Check if current user has liked this post."""
         user = info.context.user
         if user.is_anonymous:
             return False
-        return self.likes.filter(user=user).exists()
+        return is_post_liked(self, user)
+
+    def resolve_recent_likes(self, info, limit):
+        """Newest likes, loaded for the whole page of posts at once."""
+        return load_recent(info.context, "likes", self, limit)
+
+    def resolve_recent_comments(self, info, limit):
+        """Newest comments, loaded for the whole page of posts at once."""
+        return load_recent(info.context, "comments", self, limit)
+
+
+MAX_COMMENTS_PAGE = 100
 
 
 class CommentType(DjangoObjectType):
     """GraphQL type for Comment model."""
+    parent_id = graphene.ID()
+    replies = graphene.Field(
+        lambda: CommentPageType,
+        first=graphene.Int(default_value=10),
+        after=graphene.String(),
+        max_depth=graphene.Int(description="Reply levels below this comment to include"),
+    )
     
     class Meta:
         model = Comment
-        fields = ("id", "post", "author", "content", "created_at", "updated_at")
+        fields = ("id", "post", "author", "content", "depth", "replies_count", "created_at", "updated_at")
+
+    def resolve_parent_id(self, info):
+        return self.parent_id
+
+    def resolve_replies(self, info, first, after=None, max_depth=None):
+        """Load (more) replies under this comment, depth-first."""
+        return comment_page_type(
+            self.post_id, first, after, root=self,
+            max_depth=None if max_depth is None else self.depth + max_depth,
+        )
+
+
+class CommentPageType(graphene.ObjectType):
+    """A cursor-paginated slice of a comment thread, in thread order."""
+    comments = graphene.List(CommentType)
+    end_cursor = graphene.String()
+    has_next_page = graphene.Boolean()
+
+
+def comment_page_type(post_id, first, after=None, root=None, max_depth=None):
+    try:
+        comments, end_cursor, has_next = comment_page(
+            post_id, min(first, MAX_COMMENTS_PAGE), after, root=root, max_depth=max_depth,
+        )
+    except ValueError as e:
+        raise GraphQLError(str(e))
+    return CommentPageType(comments=comments, end_cursor=end_cursor, has_next_page=has_next)
 
 
 class LikeType(DjangoObjectType):
@@ -56,6 +120,21 @@ class LikeType(DjangoObjectType):
         fields = ("id", "user", "post", "created_at")
 
 
+class DeletionJobType(DjangoObjectType):
+    """Progress of a background post deletion."""
+    deleted = graphene.JSONString()
+
+    class Meta:
+        model = DeletionJob
+        fields = (
+            "id", "kind", "status", "stage", "total_posts", "error",
+            "created_at", "updated_at", "finished_at",
+        )
+
+    def resolve_deleted(self, info):
+        return self.deleted
+
+
 class PostWithEngagementType(graphene.ObjectType):
     """
     Post with additional engagement metrics.
@@ -97,11 +176,11 @@ class PostWithEngagementType(graphene.ObjectType):
     
     def resolve_recent_likes(self, info):
         """Get last 5 likes."""
-        return self.likes.select_related('user').order_by('-created_at')[:5]
+        return load_recent(info.context, "likes", self, 5)
     
     def resolve_recent_comments(self, info):
         """Get last 3 comments."""
-        return self.comments.select_related('author').order_by('-created_at')[:3]
+        return load_recent(info.context, "comments", self, 3)
 
 
 class PostStatsType(graphene.ObjectType):
@@ -138,8 +217,7 @@ class CommentWithRepliesType(graphene.ObjectType):
         return self.author.username
     
     def resolve_replies_count(self, info):
-        # If you add reply functionality later
-        return 0
+        return self.replies_count
     
 class UserStatsType(graphene.ObjectType):
     """
@@ -2,6 +2,7 @@ import graphene
 from django.apps import AppConfig
 from django.contrib.auth import get_user_model
 from graphene_django import DjangoObjectType
+from apps.common.query_cost import page_size
 from apps.posts.models import Post
 from apps.search.models import Hashtag
 User = get_user_model()
@@ -20,6 +21,7 @@ class SearchQuery(graphene.ObjectType):
         q = (q or "").strip()
         if not q:
             return SearchResultsType(users=[], posts=[], hashtags=[])
+        limit = page_size(limit)
 
         users = []
         posts = []
@@ -49,4 +51,37 @@ class SearchQuery(graphene.ObjectType):
         if type in ("all", "hashtags"):
             hashtags = list(Hashtag.objects.filter(name__icontains=q)[:limit])
 
-        return SearchResultsType(users=users, posts=posts, hashtags=hashtags)
\ No newline at end of file
+        return SearchResultsType(users=users, posts=posts, hashtags=hashtags)
+
+    async def aresolve_search(self, info, q, type="all", limit=10):
+        """Async variant of resolve_search used by the ASGI view."""
+        q = (q or "").strip()
+        if not q:
+            return SearchResultsType(users=[], posts=[], hashtags=[])
+        limit = page_size(limit)
+
+        users = []
+        posts = []
+        hashtags = []
+
+        if type in ("all", "users"):
+            users = [
+                SearchUserType(
+                    id=u.id,
+                    username=u.username,
+                    profile_image=getattr(u, "profile_image", None),
+                    bio=getattr(u, "bio", None),
+                )
+                async for u in User.objects.filter(username__icontains=q)[:limit]
+            ]
+
+        if type in ("all", "posts"):
+            posts = [
+                p async for p in Post.objects.filter(content__icontains=q)
+                .select_related("author")[:limit]
+            ]
+
+        if type in ("all", "hashtags"):
+            hashtags = [h async for h in Hashtag.objects.filter(name__icontains=q)[:limit]]
+
+        return SearchResultsType(users=users, posts=posts, hashtags=hashtags)
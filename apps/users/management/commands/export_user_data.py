@@ -0,0 +1,34 @@
+import sys
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from apps.users.exports import FORMATS, write_export
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Stream a user's posts, comments, likes and follows to NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist")
+
+        def progress(done, total):
+            self.stderr.write(f"\r{done}/{total} rows", ending="")
+
+        if options["output"]:
+            with open(options["output"], "w", newline="") as out:
+                lines = write_export(user, out, options["format"], options["chunk_size"], progress)
+        else:
+            lines = write_export(user, self.stdout, options["format"], options["chunk_size"], progress)
+
+        self.stderr.write("")
+        self.stderr.write(self.style.SUCCESS(f"✅ Exported {lines} lines for {user.username}"))
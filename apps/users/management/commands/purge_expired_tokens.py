@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from apps.users.token_blacklist import purge_expired_tokens, token_table_sizes
+
+
+class Command(BaseCommand):
+    help = "Delete expired refresh tokens (outstanding and blacklisted) in chunks and report table sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        before = token_table_sizes()
+        self.stdout.write(f"📊 Token tables: {before}")
+        deleted = purge_expired_tokens(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Purged {deleted} expired tokens; now {token_table_sizes()}"))
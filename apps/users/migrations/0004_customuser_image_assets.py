@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media', '0001_initial'),
+        ('users', '0003_userimage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='cover_image_asset',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='media.asset'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_image_asset',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='media.asset'),
+        ),
+    ]
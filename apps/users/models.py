@@ -12,6 +12,12 @@ class CustomUser(AbstractUser):
     location = models.CharField(max_length=255, blank=True, null=True)
     profile_image = models.URLField(max_length=500, blank=True, null=True)
     cover_image = models.URLField(max_length=500, blank=True, null=True)
+    profile_image_asset = models.ForeignKey(
+        "media.Asset", related_name="+", on_delete=models.SET_NULL, null=True, blank=True
+    )
+    cover_image_asset = models.ForeignKey(
+        "media.Asset", related_name="+", on_delete=models.SET_NULL, null=True, blank=True
+    )
 
     def __str__(self):
         return self.username
@@ -7,7 +7,13 @@ from rest_framework_simplejwt.exceptions import TokenError
 from .types import UserType
 from graphql import GraphQLError
 from graphene_file_upload.scalars import Upload
-import cloudinary.uploader
+from apps.common.rate_limit import client_ip
+from apps.media.models import Asset
+from .token_blacklist import CachedBlacklistRefreshToken, rotate_refresh_token
+from .passwords import (
+    LoginThrottled, PasswordHashingBusy, check_login_allowed, hash_password,
+    record_login_failure, record_login_success, verify_password,
+)
 
 User = get_user_model()
 
@@ -31,13 +37,18 @@ class SignUpMutation(graphene.Mutation):
         if User.objects.filter(email=email).exists():
             raise Exception("Email already exists")
         
-        # Create user
-        user = User.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
-            bio=bio or ""
+        # Create user; the password is hashed on the auth pool
+        try:
+            encoded = hash_password(password)
+        except PasswordHashingBusy as e:
+            raise GraphQLError(str(e), extensions={"code": "AUTH_BUSY"})
+        user = User(
+            username=User.normalize_username(username),
+            email=User.objects.normalize_email(email),
+            bio=bio or "",
+            password=encoded,
         )
+        user.save()
         
         # Generate tokens using rest_framework_simplejwt
         refresh = RefreshToken.for_user(user)
@@ -59,13 +70,20 @@ class LoginMutation(graphene.Mutation):
     refresh_token = graphene.String()
 
     def mutate(self, info, username, password):
+        ip = client_ip(info.context)
         try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            raise Exception("Invalid credentials")
-        
-        if not user.check_password(password):
+            check_login_allowed(username, ip)
+            user = User.objects.filter(username=username).first()
+            valid = user is not None and verify_password(user, password)
+        except LoginThrottled as e:
+            raise GraphQLError(str(e), extensions={"code": "LOGIN_THROTTLED", "retryAfter": e.retry_after})
+        except PasswordHashingBusy as e:
+            raise GraphQLError(str(e), extensions={"code": "AUTH_BUSY"})
+
+        if not valid:
+            record_login_failure(username, ip)
             raise Exception("Invalid credentials")
+        record_login_success(username)
         
         # Generate tokens using rest_framework_simplejwt
         refresh = RefreshToken.for_user(user)
@@ -85,19 +103,10 @@ class RefreshTokenMutation(graphene.Mutation):
 
     def mutate(self, info, refresh_token):
         try:
-            # Create refresh token object
-            refresh = RefreshToken(refresh_token)
-            
-            # Generate new access token
-            new_access_token = str(refresh.access_token)
-            
-            # If ROTATE_REFRESH_TOKENS is True, this generates a new refresh token
-            if hasattr(refresh, 'set_jti'):
-                refresh.set_jti()
-                refresh.set_exp()
-                new_refresh_token = str(refresh)
-            else:
-                new_refresh_token = refresh_token
+            # Verifies the signature and checks the blacklist (cached)
+            refresh = CachedBlacklistRefreshToken(refresh_token)
+            # Rotates, blacklisting the old token (ROTATE_REFRESH_TOKENS / BLACKLIST_AFTER_ROTATION)
+            new_access_token, new_refresh_token = rotate_refresh_token(refresh)
             
             return RefreshTokenMutation(
                 token=new_access_token,
@@ -156,14 +165,19 @@ class UpdateUserImages(graphene.Mutation):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("Authentication required")
-        
+
+        # Imported on use: it pulls in Pillow, which most requests never need
+        from apps.media.services import create_image_asset
+
         if profile:
-            uploaded = cloudinary.uploader.upload(profile, folder="users/profile")
-            user.profile_image = uploaded.get("secure_url")
+            asset = create_image_asset(profile, owner=user, kind=Asset.KIND_PROFILE)
+            user.profile_image_asset = asset
+            user.profile_image = asset.original_url
 
         if cover:
-            uploaded = cloudinary.uploader.upload(cover, folder="users/cover")
-            user.cover_image = uploaded.get("secure_url")
+            asset = create_image_asset(cover, owner=user, kind=Asset.KIND_COVER)
+            user.cover_image_asset = asset
+            user.cover_image = asset.original_url
 
         user.save()
         
@@ -184,7 +198,7 @@ class LogoutMutation(graphene.Mutation):
     def mutate(self, info, refresh_token):
         try:
             # Blacklist the refresh token
-            token = RefreshToken(refresh_token)
+            token = CachedBlacklistRefreshToken(refresh_token)
             token.blacklist()
             return LogoutMutation(success=True)
         except TokenError:
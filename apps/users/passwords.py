@@ -0,0 +1,262 @@
+"""
+Password hashing off the request path, and failed-login backoff.
+
+Hashing (PBKDF2 by default) is CPU bound. Logins and sign-ups therefore run
+it on a small dedicated thread pool. hashlib releases the GIL while
+hashing, so the pool bounds how many cores auth can take: at most
+PASSWORD_HASH_WORKERS hashes run at once per process.
+PASSWORD_HASH_WORKERS = 0 hashes inline (tests, scripts).
+
+Every hash, pooled or inline, first takes one of PASSWORD_HASH_CONCURRENCY
+slots shared by all processes; when none is free the request fails fast
+with PasswordHashingBusy (AUTH_BUSY), so a credential-stuffing burst cannot
+tie up every gunicorn worker. A hash that does not finish within
+PASSWORD_HASH_TIMEOUT also fails with PasswordHashingBusy.
+
+Slot backends (settings.PASSWORD_HASH_SLOTS_BACKEND):
+ - "redis": a sorted set of slot holders, shared by all workers; a slot
+   whose holder died expires after twice PASSWORD_HASH_TIMEOUT.
+ - "memory": a per-process counter, for tests and single-process development.
+
+Repeated failed logins lock out the username and the client IP, each on
+its own counter, for exponentially growing periods. No hash is computed
+while locked. Hash upgrades after a successful login (new hasher or
+iteration count) run on the pool after the response is sent.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.core.cache import cache
+from django.db import connections
+
+
+class PasswordHashingBusy(Exception):
+    def __init__(self):
+        super().__init__("Too many sign-in requests in progress, please retry shortly")
+
+
+class LoginThrottled(Exception):
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Too many failed login attempts, try again in {retry_after}s")
+
+
+class MemoryHashSlots:
+    """In-process slots. Only counts hashes in the current process."""
+
+    def __init__(self, limit):
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def acquire(self):
+        """A token for a free slot, or None if all are taken."""
+        return object() if self._slots.acquire(blocking=False) else None
+
+    def release(self, token):
+        self._slots.release()
+
+
+class RedisHashSlots:
+    """`password_hash:slots` sorted set of holder tokens scored by expiry."""
+
+    # KEYS: slots. ARGV: now, limit, expires at, token, key ttl
+    ACQUIRE = """
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then return 0 end
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    return 1
+    """
+    KEY = "password_hash:slots"
+
+    def __init__(self, url, limit, ttl):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._acquire = self.client.register_script(self.ACQUIRE)
+        self.limit = limit
+        self.ttl = ttl
+
+    def acquire(self):
+        token = uuid.uuid4().hex
+        now = time.time()
+        acquired = self._acquire(
+            keys=[self.KEY], args=[now, self.limit, now + self.ttl, token, max(1, int(self.ttl))],
+        )
+        return token if acquired else None
+
+    def release(self, token):
+        self.client.zrem(self.KEY, token)
+
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, settings.PASSWORD_HASH_WORKERS), thread_name_prefix="password-hash"
+            )
+            if settings.PASSWORD_HASH_SLOTS_BACKEND == "redis":
+                _slots = RedisHashSlots(
+                    settings.REDIS_URL, settings.PASSWORD_HASH_CONCURRENCY, settings.PASSWORD_HASH_TIMEOUT * 2,
+                )
+            else:
+                _slots = MemoryHashSlots(settings.PASSWORD_HASH_CONCURRENCY)
+        return _pool, _slots
+
+
+def reset_password_pool():
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool, _slots = None, None
+
+
+def _run_in_worker(fn, args):
+    try:
+        return fn(*args)
+    finally:
+        # Pool threads outlive requests; don't leave their connections open
+        connections.close_all()
+
+
+def _acquire_slot(slots):
+    token = slots.acquire()
+    if token is None:
+        raise PasswordHashingBusy()
+    return token
+
+
+def submit(fn, *args):
+    """
+    Run fn(*args) on the hashing pool; returns a Future.
+    Raises PasswordHashingBusy when every slot is taken.
+    """
+    pool, slots = _get_pool()
+    token = _acquire_slot(slots)
+    try:
+        future = pool.submit(_run_in_worker, fn, args)
+    except BaseException:
+        slots.release(token)
+        raise
+    future.add_done_callback(lambda _: slots.release(token))
+    return future
+
+
+def run_hashing(fn, *args):
+    """
+    Run a hashing function (on the pool unless PASSWORD_HASH_WORKERS is 0)
+    and return its result. Raises PasswordHashingBusy when no slot is free
+    or the hash takes longer than PASSWORD_HASH_TIMEOUT.
+    """
+    if not settings.PASSWORD_HASH_WORKERS:
+        _, slots = _get_pool()
+        token = _acquire_slot(slots)
+        try:
+            return fn(*args)
+        finally:
+            slots.release(token)
+    future = submit(fn, *args)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT)
+    except FutureTimeoutError:
+        # Still holds its slot until it finishes, so the cap stays honest
+        future.cancel()
+        raise PasswordHashingBusy()
+
+
+def hash_password(password):
+    return run_hashing(make_password, password)
+
+
+def needs_upgrade(encoded):
+    """True if `encoded` is not in the preferred hasher's current format."""
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = get_hasher("default")
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def _upgrade_hash(user_id, old_encoded, password):
+    # Only if the password was not changed in the meantime
+    get_user_model().objects.filter(pk=user_id, password=old_encoded).update(
+        password=make_password(password)
+    )
+
+
+def verify_password(user, password):
+    """
+    Check `password` against the user's hash on the pool. A stale hash is
+    re-hashed in the background rather than during the request.
+    """
+    encoded = user.password
+    # setter=None: Django would otherwise re-hash and save inline
+    if not run_hashing(check_password, password, encoded, None):
+        return False
+    if needs_upgrade(encoded):
+        if settings.PASSWORD_HASH_WORKERS:
+            try:
+                submit(_upgrade_hash, user.pk, encoded, password)
+            except PasswordHashingBusy:
+                pass  # Upgraded on a later login
+        else:
+            _upgrade_hash(user.pk, encoded, password)
+    return True
+
+
+def _backoff_keys(username, ip):
+    """
+    (counter key, lock key, failure threshold) for the username and the IP.
+    `ip` comes from client_ip(), so behind a proxy it is the real client
+    (settings.TRUSTED_PROXY_COUNT), not the proxy every client shares.
+    """
+    username = (username or "").lower()
+    keys = [
+        (f"login_failures:user:{username}", f"login_lock:user:{username}", settings.LOGIN_FAILURE_THRESHOLD),
+    ]
+    if ip and ip != "unknown":
+        keys.append((f"login_failures:ip:{ip}", f"login_lock:ip:{ip}", settings.LOGIN_IP_FAILURE_THRESHOLD))
+    return keys
+
+
+def check_login_allowed(username, ip):
+    """Raise LoginThrottled while the username or the IP is locked out."""
+    now = time.time()
+    locks = cache.get_many([lock_key for _, lock_key, _ in _backoff_keys(username, ip)])
+    locked_until = max(locks.values(), default=0)
+    if locked_until > now:
+        raise LoginThrottled(int(locked_until - now) + 1)
+
+
+def record_login_failure(username, ip):
+    """Count a failure; at the threshold and beyond, lock out for 2**n seconds."""
+    now = time.time()
+    for counter_key, lock_key, threshold in _backoff_keys(username, ip):
+        cache.add(counter_key, 0, timeout=settings.LOGIN_FAILURE_WINDOW)
+        try:
+            failures = cache.incr(counter_key)
+        except ValueError:  # expired between add() and incr()
+            cache.set(counter_key, 1, timeout=settings.LOGIN_FAILURE_WINDOW)
+            failures = 1
+        if failures >= threshold:
+            delay = min(settings.LOGIN_BACKOFF_MAX_SECONDS, 2 ** (failures - threshold))
+            cache.set(lock_key, now + delay, timeout=delay)
+
+
+def record_login_success(username):
+    """Clear the username's failures (the IP's are kept: one account is not proof)."""
+    counter_key, lock_key, _ = _backoff_keys(username, None)[0]
+    cache.delete_many([counter_key, lock_key])
@@ -11,6 +11,7 @@ from graphene_django import DjangoObjectType
 from django.contrib.auth import get_user_model
 from django.db.models import Q
 
+from apps.common.query_cost import page_size
 from apps.users.mutations import UpdateUserImages
 from .types import UserType
 
@@ -18,14 +19,18 @@ from .types import UserType
 User = get_user_model()
 
 class UserQuery(graphene.ObjectType):
-    users = graphene.List(UserType) 
+    users = graphene.List(
+        UserType,
+        limit=graphene.Int(),
+        offset=graphene.Int(default_value=0),
+    )
     user = graphene.Field(UserType, user_id=graphene.ID(required=True)) 
     search_users = graphene.List(UserType, query=graphene.String(required=True))
     me = graphene.Field(UserType)
 
-    def resolve_users(self, info, **kwargs):
-        # Return all users
-        return User.objects.all()
+    def resolve_users(self, info, limit=None, offset=0, **kwargs):
+        # A page of users (at most MAX_LIST_SIZE, see apps/common/query_cost.py)
+        return User.objects.order_by("id")[offset:offset + page_size(limit)]
     
     def resolve_user(self, info, user_id, **kwargs):
         try:
@@ -37,7 +42,7 @@ class UserQuery(graphene.ObjectType):
         # Search by username or bio
         return User.objects.filter(
             Q(username__icontains=query) | Q(bio__icontains=query)
-        )
+        ).order_by("id")[:page_size()]
 
     def resolve_me(self, info, **kwargs):
         user = info.context.user
@@ -45,13 +50,14 @@ class UserQuery(graphene.ObjectType):
 
 
 class UserMutation(graphene.ObjectType):
-    from .mutations import SignUpMutation, LoginMutation, UpdateProfileMutation, RefreshTokenMutation, DeleteAllUsersMutation
+    from .mutations import SignUpMutation, LoginMutation, UpdateProfileMutation, RefreshTokenMutation, LogoutMutation
     signup = SignUpMutation.Field()
     login = LoginMutation.Field()
     update_profile = UpdateProfileMutation.Field()
     update_user_images = UpdateUserImages.Field()
     refresh_token = RefreshTokenMutation.Field()
-    delete_all_users = DeleteAllUsersMutation.Field()
+    logout = LogoutMutation.Field()
+    # delete_all_users = DeleteAllUsersMutation.Field()
 
 
 
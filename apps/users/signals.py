@@ -0,0 +1,18 @@
+"""
+Signals that keep cached GraphQL responses in sync with user rows.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.response_cache import invalidate_tags
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_responses(sender, instance, **kwargs):
+    # Posts embed their author, so cached post lists go stale as well
+    invalidate_tags("users", "posts", f"user:{instance.pk}")
@@ -0,0 +1,47 @@
+# apps/users/tasks.py
+
+import logging
+import os
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from .exports import write_export
+from . import token_blacklist
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+@shared_task(bind=True)
+def export_user_data(self, user_id, fmt="ndjson", path=None):
+    """
+    Write a user's data export to a file in the background.
+    Reports PROGRESS state with {"done", "total"} rows while running.
+    """
+    user = User.objects.get(pk=user_id)
+    if path is None:
+        export_dir = os.path.join(settings.MEDIA_ROOT, "exports")
+        os.makedirs(export_dir, exist_ok=True)
+        path = os.path.join(export_dir, f"{user_id}-{self.request.id or 'local'}.{fmt}")
+
+    def progress(done, total):
+        if self.request.id and not self.request.is_eager:
+            self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    with open(path, "w", newline="") as out:
+        lines = write_export(user, out, fmt, progress=progress)
+    return {"path": path, "lines": lines}
+
+
+@shared_task
+def purge_expired_tokens():
+    """
+    Nightly purge of expired outstanding/blacklisted refresh tokens.
+    Returns the rows deleted and the table sizes before and after.
+    """
+    before = token_blacklist.token_table_sizes()
+    deleted = token_blacklist.purge_expired_tokens(chunk_size=settings.TOKEN_PURGE_CHUNK_SIZE)
+    after = token_blacklist.token_table_sizes()
+    logger.info("Purged %s expired tokens; token tables %s -> %s", deleted, before, after)
+    return {"deleted": deleted, "before": before, "after": after}
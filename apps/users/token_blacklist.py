@@ -0,0 +1,191 @@
+"""
+Fast refresh-token blacklist checks and expired-token purging.
+
+simplejwt checks the blacklist with a JOIN on token_blacklist tables for
+every refresh, and those tables only grow. Here a token is blacklisted if:
+ - its `token_blacklist:<jti>` cache key exists (set when it is blacklisted,
+   shared by all processes, expires with the token), or
+ - a per-process Bloom filter of blacklisted JTIs says "maybe" and the
+   database confirms.
+The Bloom filter is rebuilt from the database every
+TOKEN_BLACKLIST_BLOOM_REFRESH seconds; tokens blacklisted by other
+processes in between are covered by the cache keys. Most refreshes are
+for tokens that are not blacklisted, and the filter answers those without
+a query.
+
+This fast path needs a cache shared by every process (settings.CACHES
+with Redis). With a per-process cache another worker would never see the
+key, so every check goes to the database instead.
+
+purge_expired_tokens() deletes expired OutstandingToken rows (and their
+BlacklistedToken rows) in chunks; the purge_expired_tokens task runs it
+nightly.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from apps.common.caching import cache_is_shared
+from apps.common.db import raw_delete
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: h1 + i * h2 (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+def cache_key(jti):
+    return f"token_blacklist:{jti}"
+
+
+def blacklisted_jtis():
+    """JTIs of blacklisted tokens that have not expired yet."""
+    return BlacklistedToken.objects.filter(
+        token__expires_at__gt=timezone.now()
+    ).values_list("token__jti", flat=True)
+
+
+class BlacklistIndex:
+    """The process-local Bloom filter, rebuilt when older than the refresh interval."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._built_at = 0.0
+
+    def bloom(self):
+        with self._lock:
+            if self._bloom is None or time.monotonic() - self._built_at > settings.TOKEN_BLACKLIST_BLOOM_REFRESH:
+                self._bloom = self.build()
+                self._built_at = time.monotonic()
+            return self._bloom
+
+    @staticmethod
+    def build():
+        jtis = blacklisted_jtis()
+        # Room for growth until the next rebuild
+        bloom = BloomFilter(capacity=max(1024, jtis.count() * 2))
+        for jti in jtis.iterator(chunk_size=5000):
+            bloom.add(jti)
+        return bloom
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+
+
+_index = BlacklistIndex()
+
+
+def reset_blacklist_index():
+    _index.reset()
+
+
+def is_blacklisted(jti):
+    if not cache_is_shared():
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+    if cache.get(cache_key(jti)) is not None:
+        return True
+    if jti not in _index.bloom():
+        return False
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """RefreshToken whose blacklist check and blacklisting go through the cache."""
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError("Token is blacklisted")
+
+    def blacklist(self):
+        result = super().blacklist()
+        jti = self.payload[api_settings.JTI_CLAIM]
+        timeout = max(1, int(self.payload["exp"] - time.time()))
+        cache.set(cache_key(jti), 1, timeout=timeout)
+        _index.add(jti)
+        return result
+
+
+def rotate_refresh_token(refresh):
+    """
+    Return (access token, refresh token) for a verified refresh token.
+    With ROTATE_REFRESH_TOKENS a new refresh token is issued, and with
+    BLACKLIST_AFTER_ROTATION the old one can no longer be used.
+    """
+    access = str(refresh.access_token)
+    if not api_settings.ROTATE_REFRESH_TOKENS:
+        return access, str(refresh)
+    if api_settings.BLACKLIST_AFTER_ROTATION:
+        refresh.blacklist()
+    # Not recorded as outstanding until (if ever) it is blacklisted
+    refresh.set_jti()
+    refresh.set_exp()
+    refresh.set_iat()
+    return access, str(refresh)
+
+
+def token_table_sizes():
+    return {
+        "outstanding": OutstandingToken.objects.count(),
+        "blacklisted": BlacklistedToken.objects.count(),
+    }
+
+
+def purge_expired_tokens(chunk_size=5000):
+    """
+    Delete expired outstanding tokens and their blacklist rows, chunk by
+    chunk. Returns the number of outstanding tokens deleted.
+    """
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by("pk").values_list("pk", flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            raw_delete(BlacklistedToken.objects.filter(token_id__in=ids))
+            deleted += raw_delete(OutstandingToken.objects.filter(pk__in=ids))
+        if len(ids) < chunk_size:
+            break
+    reset_blacklist_index()
+    return deleted
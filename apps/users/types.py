@@ -3,8 +3,23 @@ import graphene
 from graphene_django import DjangoObjectType
 from django.contrib.auth import get_user_model
 
+from apps.media.types import ImageSize, ImageFormat, asset_url, asset_srcset
+
 User = get_user_model()
 
+
+class UserImageKind(graphene.Enum):
+    PROFILE = "profile"
+    COVER = "cover"
+
+
+def user_image(user, kind=None):
+    """(asset, original URL) of the user's profile image, or cover image."""
+    if getattr(kind, "value", kind) == UserImageKind.COVER.value:
+        return user.cover_image_asset, user.cover_image
+    return user.profile_image_asset, user.profile_image
+
+
 class UserType(DjangoObjectType):
     class Meta:
         model = User
@@ -13,6 +28,17 @@ class UserType(DjangoObjectType):
     followers_count = graphene.Int()
     following_count = graphene.Int()
     posts_count = graphene.Int()
+    image_url = graphene.String(size=ImageSize(), format=ImageFormat(), kind=UserImageKind())
+    srcset = graphene.String(format=ImageFormat(), kind=UserImageKind())
+
+    def resolve_image_url(self, info, size=None, format=None, kind=None):
+        """The profile (or cover) image at `size` (original when omitted)."""
+        asset, original = user_image(self, kind)
+        return asset_url(asset, original, size, format)
+
+    def resolve_srcset(self, info, format=None, kind=None):
+        asset, _ = user_image(self, kind)
+        return asset_srcset(asset, format)
     
     def resolve_followers_count(self, info):
         return self.followers_count()
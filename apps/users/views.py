@@ -0,0 +1,29 @@
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .exports import FORMATS, export_lines
+
+
+@require_GET
+def export_my_data(request):
+    """
+    Stream the authenticated user's posts, comments, likes and follows.
+    GET /users/me/export/?format=ndjson|csv with a JWT bearer token.
+    """
+    try:
+        user_auth_tuple = JWTAuthentication().authenticate(request)
+    except (InvalidToken, TokenError):
+        user_auth_tuple = None
+    if user_auth_tuple is None:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    user = user_auth_tuple[0]
+
+    fmt = request.GET.get("format", "ndjson")
+    if fmt not in FORMATS:
+        return JsonResponse({"error": f"format must be one of {', '.join(FORMATS)}"}, status=400)
+
+    response = StreamingHttpResponse(export_lines(user, fmt), content_type=FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{user.username}-export.{fmt}"'
+    return response
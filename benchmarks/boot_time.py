@@ -0,0 +1,137 @@
+"""
+Cold-start profile: what the app imports at boot and how long a fresh
+gunicorn takes to serve its first request.
+
+    python benchmarks/boot_time.py --imports 25
+    python benchmarks/boot_time.py --runs 5 --workers 4 --preload
+
+The import report runs `python -X importtime` over django.setup() and the
+URLconf and lists the slowest top-level packages by cumulative time. The
+boot benchmark starts gunicorn on a free port, then times process start
+until /ready/ answers 200 and until the first /graphql/ query returns;
+each server is stopped before the next run. Use the same DATABASE_URL the
+server would (migrations are not applied here).
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SETUP = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+QUERY = {"query": "query { __typename }"}
+
+
+def import_times(top):
+    """[(cumulative ms, self ms, package)] for the slowest packages imported at top level."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT), DJANGO_SETTINGS_MODULE="social_media_feed.settings")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SETUP],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[12:]:
+            continue
+        own, cumulative, name = line[12:].split("|")
+        if not own.strip().isdigit():
+            continue
+        # Nested imports are indented under the module that triggered them
+        nested = name[1:].startswith(" ")
+        package = name.strip().split(".")[0]
+        cum, own_total = packages.get(package, (0, 0))
+        packages[package] = (cum + (0 if nested else int(cumulative)), own_total + int(own))
+    ranked = sorted(packages.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return [(cum / 1000, own / 1000, package) for package, (cum, own) in ranked]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url, deadline, data=None):
+    """Poll until `url` answers 200; returns the time it did."""
+    headers = {"Content-Type": "application/json"} if data else {}
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, data=data, headers=headers), timeout=5) as resp:
+                if resp.status == 200:
+                    return time.perf_counter()
+        except urllib.error.HTTPError as e:
+            # 503 until the database answers; anything else will not go away by waiting
+            if e.code != 503:
+                raise
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} did not answer in time")
+
+
+def boot_once(args):
+    port = free_port()
+    command = [
+        sys.executable, "-m", "gunicorn", args.app,
+        "--bind", f"127.0.0.1:{port}", "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    if args.preload:
+        command.append("--preload")
+    base = f"http://localhost:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(command, cwd=ROOT)
+    try:
+        deadline = started + args.timeout
+        ready = wait_for(f"{base}/ready/", deadline)
+        first = wait_for(f"{base}/graphql/", deadline, data=json.dumps(QUERY).encode())
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+    return (ready - started) * 1000, (first - started) * 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--imports", type=int, default=0, help="list the N slowest imports")
+    parser.add_argument("--runs", type=int, default=3, help="gunicorn boots to time (0 to skip)")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--preload", action="store_true", help="start gunicorn with --preload")
+    parser.add_argument("--app", default="social_media_feed.wsgi:application")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait per boot")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.imports:
+        print(f"{'package':<28}{'cumulative':>12}{'self':>10}")
+        for cumulative, own, package in import_times(args.imports):
+            print(f"{package:<28}{cumulative:>10.1f}ms{own:>8.1f}ms")
+        print()
+
+    if args.runs:
+        samples = [boot_once(args) for _ in range(args.runs)]
+        ready = [s[0] for s in samples]
+        first = [s[1] for s in samples]
+        mode = "preload" if args.preload else "no preload"
+        print(f"gunicorn x{args.workers} ({mode}), {args.runs} boots")
+        print(f"{'':<22}{'median':>10}{'min':>10}{'max':>10}")
+        for label, values in (("start -> /ready/", ready), ("start -> 1st query", first)):
+            print(f"{label:<22}{statistics.median(values):>8.0f}ms{min(values):>8.0f}ms{max(values):>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Fixtures for the pytest-benchmark suite.
+
+    pytest benchmarks --benchmark-only --no-cov
+    BENCH_SIZES=small,medium,large pytest benchmarks --benchmark-only --no-cov
+
+Each size is generated once per session with SocialGraphGenerator.
+"""
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+
+SIZES = {
+    "small": dict(users=200, posts_per_user=5, likes_per_post=3, comments_per_post=1, follows_per_user=20),
+    "medium": dict(users=2000, posts_per_user=10, likes_per_post=5, comments_per_post=2, follows_per_user=30),
+    "large": dict(users=20000, posts_per_user=20, likes_per_post=10, comments_per_post=3, follows_per_user=50),
+}
+
+BENCH_SIZES = os.environ.get("BENCH_SIZES", "small,medium").split(",")
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 20))
+
+
+@dataclass
+class SocialGraph:
+    size: str
+    user_ids: list
+    heavy_user: object      # follows the most accounts -> biggest feed
+    popular_user: object    # most followers / notifications
+
+
+def build_graph(size):
+    from django.contrib.auth import get_user_model
+    from apps.posts.synthetic import SocialGraphGenerator
+
+    User = get_user_model()
+    prefix = f"bench_{size}"
+    user_ids = SocialGraphGenerator(prefix=prefix, seed=42, **SIZES[size]).generate()
+    heavy = (
+        User.objects.filter(username__startswith=f"{prefix}_")
+        .annotate(n=Count("following")).order_by("-n").first()
+    )
+    popular = User.objects.get(id=user_ids[0])
+    return SocialGraph(size, user_ids, heavy, popular)
+
+
+@pytest.fixture(scope="session", params=BENCH_SIZES)
+def social_graph(request, django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        graph = build_graph(request.param)
+    cache.clear()
+    return graph
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+_results = []
+
+
+@pytest.fixture
+def measure(benchmark, request):
+    """
+    Benchmark `fn`, recording its SQL query count and p50/p95/p99 latency
+    (ms) in the benchmark's extra_info.
+    """
+    def run(fn, setup=None):
+        if setup:
+            setup()
+        with CaptureQueriesContext(connection) as ctx:
+            fn()
+        benchmark.extra_info["queries"] = len(ctx.captured_queries)
+
+        result = benchmark.pedantic(fn, setup=setup, rounds=ROUNDS, iterations=1, warmup_rounds=1)
+
+        stats = getattr(benchmark, "stats", None)
+        if stats is not None:
+            data = stats.stats.data
+            for pct in (50, 95, 99):
+                benchmark.extra_info[f"p{pct}_ms"] = round(percentile(data, pct) * 1000, 3)
+            _results.append((request.node.name, dict(benchmark.extra_info)))
+        return result
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("query counts and latency percentiles")
+    terminalreporter.write_line(
+        f"{'benchmark':<40}{'queries':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rows':>8}{'peak KiB':>10}"
+    )
+    for name, info in _results:
+        terminalreporter.write_line(
+            f"{name:<40}{info['queries']:>8}{info['p50_ms']:>10.2f}{info['p95_ms']:>10.2f}{info['p99_ms']:>10.2f}"
+            f"{info.get('rows', ''):>8}{info.get('peak_kib', ''):>10}"
+        )
@@ -0,0 +1,121 @@
+"""
+Closed-loop load generator for /graphql/.
+
+Runs the same query mix against one or more targets at equal concurrency and
+reports throughput plus latency percentiles, e.g. to compare the WSGI and
+ASGI deployments:
+
+    python benchmarks/graphql_load.py \
+        --target wsgi=http://localhost:8000/graphql/ \
+        --target asgi=http://localhost:8001/graphql/ \
+        --concurrency 50 --duration 30 --token "$JWT"
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+
+QUERIES = {
+    "feed": "query { feed(limit: 20) { id content author { username } } }",
+    "notifications": "query { notifications(limit: 20) { id notificationType isRead } }",
+    "search": 'query { search(q: "a", limit: 10) { users { username } posts { id } } }',
+    "dashboard": (
+        "query { feed(limit: 10) { id } notifications(limit: 10) { id } "
+        'search(q: "a", limit: 5) { posts { id } } }'
+    ),
+}
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def worker(session, url, headers, queries, deadline, latencies, errors):
+    i = 0
+    while time.perf_counter() < deadline:
+        query = queries[i % len(queries)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            async with session.post(url, json={"query": query}, headers=headers) as resp:
+                body = await resp.json()
+                if resp.status != 200 or body.get("errors"):
+                    errors.append(resp.status)
+                    continue
+        except aiohttp.ClientError as e:
+            errors.append(str(e))
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def run_target(name, url, args):
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    queries = [QUERIES[q] for q in args.queries]
+    latencies, errors = [], []
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Warm up connections and server-side caches
+        await asyncio.gather(*[
+            worker(session, url, headers, queries, time.perf_counter() + args.warmup, [], [])
+            for _ in range(args.concurrency)
+        ])
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*[
+            worker(session, url, headers, queries, deadline, latencies, errors)
+            for _ in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    return {
+        "target": name,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, help="name=url, may be repeated")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per target")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of warm-up per target")
+    parser.add_argument("--token", help="JWT access token sent as a Bearer header")
+    parser.add_argument("--queries", nargs="+", choices=sorted(QUERIES), default=sorted(QUERIES))
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = []
+    for target in args.target:
+        name, sep, url = target.partition("=")
+        if not sep:
+            name = url = target
+        print(f"-> {name}: {args.concurrency} concurrent clients for {args.duration:.0f}s")
+        results.append(asyncio.run(run_target(name, url, args)))
+
+    print(f"\n{'target':<12}{'reqs':>8}{'errors':>8}{'req/s':>10}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for r in results:
+        print(
+            f"{r['target']:<12}{r['requests']:>8}{r['errors']:>8}{r['rps']:>10.1f}"
+            f"{r['mean']:>8.1f}ms{r['p50']:>7.1f}ms{r['p95']:>7.1f}ms{r['p99']:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Latency and query-count benchmarks for the hot read paths.
+Run with `pytest benchmarks --benchmark-only --no-cov`.
+"""
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from apps.posts.services import get_user_feed, get_trending_posts, get_user_stats, user_stats_cache_key
+from apps.search.schema import SearchQuery
+from social_media_feed.schema import schema
+
+
+pytestmark = pytest.mark.django_db
+
+NOTIFICATIONS_QUERY = """
+    query { notifications(limit: 20) { id notificationType isRead sender { username } post { id } } }
+"""
+
+
+def graphql_context(user):
+    request = RequestFactory().post("/graphql/")
+    request.user = user
+    return request
+
+
+def test_user_feed(measure, social_graph):
+    user = social_graph.heavy_user
+    measure(lambda: list(get_user_feed(user, limit=20)))
+
+
+def test_user_feed_deep_page(measure, social_graph):
+    user = social_graph.heavy_user
+    measure(lambda: list(get_user_feed(user, limit=20, offset=200)))
+
+
+def test_trending_posts(measure, social_graph):
+    measure(lambda: list(get_trending_posts(limit=10)))
+
+
+def test_user_stats_uncached(measure, social_graph):
+    user_id = social_graph.popular_user.id
+
+    def clear_cache():
+        cache.delete(user_stats_cache_key(user_id))
+    measure(lambda: get_user_stats(user_id), setup=clear_cache)
+
+
+def test_search(measure, social_graph):
+    def search():
+        results = SearchQuery.resolve_search(None, None, q="coffee", type="all", limit=10)
+        return [p.author.username for p in results.posts]
+    measure(search)
+
+
+def test_notifications(measure, social_graph):
+    context = graphql_context(social_graph.popular_user)
+
+    def notifications():
+        result = schema.execute(NOTIFICATIONS_QUERY, context_value=context)
+        assert not result.errors
+        return result.data
+    measure(notifications)
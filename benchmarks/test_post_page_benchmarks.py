@@ -0,0 +1,108 @@
+"""
+Memory and row-count regression benchmark for a page of heavily liked posts.
+
+Compares the old list-resolver strategy (prefetch every like and comment of
+every post on the page) with the planned one (counts and the viewer flag as
+subqueries), on POSTS posts with BENCH_LIKES_PER_POST likes each (10k by
+default). `rows` is the number of model instances built and `peak_kib` the
+peak traced Python memory for one page:
+
+    pytest benchmarks/test_post_page_benchmarks.py --benchmark-only --no-cov
+"""
+import os
+import tracemalloc
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_init
+from django.test import RequestFactory
+
+from apps.posts.models import Post, Like, Comment
+from apps.posts.services import fill_root_comment_paths
+from social_media_feed.schema import schema
+
+
+pytestmark = pytest.mark.django_db
+
+POSTS = 5
+LIKES_PER_POST = int(os.environ.get("BENCH_LIKES_PER_POST", 10000))
+COMMENTS_PER_POST = 100
+
+PAGE_QUERY = """
+    query Page($userId: ID!) {
+        userPosts(userId: $userId, limit: 20) {
+            id content likesCount commentsCount isLikedByUser author { username }
+        }
+    }
+"""
+
+
+@pytest.fixture(scope="session")
+def liked_posts(django_db_setup, django_db_blocker):
+    """(author, viewer) where the author's POSTS posts have LIKES_PER_POST likes each."""
+    User = get_user_model()
+    with django_db_blocker.unblock():
+        author = User.objects.create(username="bench_liked_author", email="bench_liked_author@example.com")
+        likers = User.objects.bulk_create(
+            [User(username=f"bench_liker_{i}", email=f"bench_liker_{i}@example.com", password="!")
+             for i in range(LIKES_PER_POST)],
+            batch_size=2000,
+        )
+        posts = Post.objects.bulk_create([Post(author=author, content=f"liked {i}") for i in range(POSTS)])
+        for post in posts:
+            Like.objects.bulk_create([Like(user=liker, post=post) for liker in likers], batch_size=5000)
+            Comment.objects.bulk_create(
+                [Comment(post=post, author=liker, content="nice") for liker in likers[:COMMENTS_PER_POST]]
+            )
+        fill_root_comment_paths()
+    return author, likers[0]
+
+
+def footprint(fn):
+    """(model instances built, peak traced memory in KiB) of one call to fn."""
+    rows = 0
+
+    def count(**kwargs):
+        nonlocal rows
+        rows += 1
+
+    post_init.connect(count, weak=False, dispatch_uid="bench_footprint")
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        post_init.disconnect(dispatch_uid="bench_footprint")
+    return rows, peak // 1024
+
+
+def prefetch_page(author, viewer):
+    """The page as the list resolvers used to load it."""
+    posts = Post.objects.filter(author=author).select_related("author").prefetch_related("likes", "comments")[:20]
+    return [
+        (post.pk, post.author.username, post.likes.count(), post.comments.count(),
+         any(like.user_id == viewer.pk for like in post.likes.all()))
+        for post in posts
+    ]
+
+
+def planned_page(author, viewer):
+    request = RequestFactory().post("/graphql/")
+    request.user = viewer
+    result = schema.execute(PAGE_QUERY, variables={"userId": author.pk}, context_value=request)
+    assert not result.errors
+    return result.data
+
+
+@pytest.mark.parametrize("strategy", ["prefetch", "planned"])
+def test_liked_posts_page(measure, benchmark, liked_posts, strategy):
+    author, viewer = liked_posts
+    page = {"prefetch": prefetch_page, "planned": planned_page}[strategy]
+
+    rows, peak_kib = footprint(lambda: page(author, viewer))
+    benchmark.extra_info.update(rows=rows, peak_kib=peak_kib)
+    if strategy == "planned":
+        # One Post and one author per post, whatever the like count
+        assert rows <= 2 * POSTS
+    measure(lambda: page(author, viewer))
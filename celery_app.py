@@ -1,13 +1,2 @@
-from __future__ import absolute_import, unicode_literals
-import os
-from celery import Celery
-
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "social_media_feed.settings")
-
-app = Celery("social_media_feed")
-app.config_from_object("django.conf:settings", namespace="CELERY")
-app.autodiscover_tasks()
-
-@app.task(bind=True)
-def debug_task(self):
-    print(f"Request: {self.request!r}")
+# Kept for `celery -A celery_app ...`; the app lives in social_media_feed/celery.py
+from social_media_feed.celery import app, debug_task  # noqa: F401
@@ -1,17 +1,25 @@
 #!/bin/bash
 set -euo pipefail
 
-# Apply DB migrations
-echo "🔄 Applying migrations..."
-python manage.py migrate --noinput
-
-# ✅ Fix invalid notification_type values (idempotent + safe)
-echo "🧹 Fixing notification types..."
-python manage.py fix_notification_types || true
-
-# Collect static files
-echo "📦 Collecting static files..."
-python manage.py collectstatic --noinput
+# Deploy steps run once per container, before the workers start.
+# Set RUN_MIGRATIONS=0 when a release job has already applied them.
+if [ "${RUN_MIGRATIONS:-1}" = "1" ]; then
+    echo "🔄 Applying migrations..."
+    python manage.py migrate --noinput
+
+    # Register periodic tasks (notification clean-up etc. run from Celery beat)
+    echo "⏰ Syncing periodic tasks..."
+    python manage.py sync_periodic_tasks
+fi
+
+# Static files are collected when the image is built (docker/Dockerfile)
+
+# GUNICORN_PRELOAD=1 imports and warms the app once in the master; workers
+# fork from it instead of each importing Django and the schema themselves
+GUNICORN_FLAGS=""
+if [ "${GUNICORN_PRELOAD:-0}" = "1" ]; then
+    GUNICORN_FLAGS="--preload"
+fi
 
 # Ensure Gunicorn socket permissions
 touch /tmp/gunicorn.sock
@@ -26,11 +34,23 @@ chmod 777 /tmp/gunicorn.sock
 # -------------------------
 # 3️⃣ Start Gunicorn (Django web server)
 # -------------------------
-echo "🚀 Starting Gunicorn..."
-gunicorn social_media_feed.wsgi:application \
-    --bind 0.0.0.0:${PORT} \
-    --workers 4 \
-    --timeout 120
+# SERVER_MODE=asgi serves the async GraphQL view from uvicorn workers
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    echo "🚀 Starting Gunicorn (ASGI / uvicorn workers)..."
+    gunicorn social_media_feed.asgi:application \
+        -k uvicorn_worker.UvicornWorker \
+        --bind 0.0.0.0:${PORT} \
+        --workers 4 \
+        --timeout 120 \
+        $GUNICORN_FLAGS
+else
+    echo "🚀 Starting Gunicorn..."
+    gunicorn social_media_feed.wsgi:application \
+        --bind 0.0.0.0:${PORT} \
+        --workers 4 \
+        --timeout 120 \
+        $GUNICORN_FLAGS
+fi
 
 
 # # Start supervisord
@@ -45,10 +65,10 @@ gunicorn social_media_feed.wsgi:application \
 # mkdir -p /celerybeat
 
 # # Start Celery Worker in background
-# celery -A celery_app worker --loglevel=INFO &
+# celery -A social_media_feed worker -Q default,email,media,maintenance --loglevel=INFO &
 
 # # Start Celery Beat in foreground (so container stays alive)
-# celery -A celery_app beat \
+# celery -A social_media_feed beat \
 #     --loglevel=INFO \
 #     --scheduler django_celery_beat.schedulers:DatabaseScheduler \
 #     --pidfile=/celerybeat/celerybeat.pid
@@ -1,14 +1,14 @@
 #!/usr/bin/env bash
 set -e
 
-echo "🔄 Applying migrations..."
-python manage.py migrate --noinput
+if [ "${RUN_MIGRATIONS:-1}" = "1" ]; then
+    echo "🔄 Applying migrations..."
+    python manage.py migrate --noinput
 
-echo "🧹 Fixing notification types..."
-python manage.py fix_notification_types || true
-
-echo "📦 Collecting static files..."
-python manage.py collectstatic --noinput
+    echo "⏰ Syncing periodic tasks..."
+    python manage.py sync_periodic_tasks
+fi
 
 echo "🚀 Starting Gunicorn..."
-exec gunicorn YOUR_PROJECT.wsgi:application --bind 0.0.0.0:${PORT:-10000}
+exec gunicorn social_media_feed.wsgi:application --bind 0.0.0.0:${PORT:-10000} \
+    $([ "${GUNICORN_PRELOAD:-0}" = "1" ] && echo --preload)
@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_media_feed.settings')
+# Under ASGI, serve GraphQL queries from the async view
+os.environ.setdefault('GRAPHQL_ASYNC', '1')
 
 application = get_asgi_application()
+
+from .startup import warm_up  # noqa: E402
+warm_up()
@@ -0,0 +1,77 @@
+"""
+The project's Celery app (`celery -A social_media_feed worker ...`).
+
+Tasks are routed by CELERY_TASK_ROUTES to the default, email, media and
+maintenance queues. CELERY_QUEUE_OPTIONS tunes each queue:
+ - acks_late is applied to every task routed to the queue,
+ - prefetch_multiplier is applied to workers started for the queue
+   (`-Q email`); a worker consuming several queues uses the smallest.
+Run one worker per queue so slow maintenance jobs never hold up emails.
+
+Without REDIS_URL tasks run eagerly (in-memory broker), see settings.
+"""
+import fnmatch
+import os
+
+from celery import Celery
+from celery.signals import celeryd_init
+from django.conf import settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "social_media_feed.settings")
+
+app = Celery("social_media_feed")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
+
+# Connects the latency signal handlers in every process using the app
+import apps.common.task_metrics  # noqa: E402,F401
+
+
+def queue_for(task_name):
+    """The queue CELERY_TASK_ROUTES sends `task_name` to (exact names first, like Celery)."""
+    routes = app.conf.task_routes or {}
+    if task_name in routes:
+        return routes[task_name].get("queue", app.conf.task_default_queue)
+    for pattern, route in routes.items():
+        if fnmatch.fnmatchcase(task_name, pattern):
+            return route.get("queue", app.conf.task_default_queue)
+    return app.conf.task_default_queue
+
+
+def queue_options(queue):
+    return getattr(settings, "CELERY_QUEUE_OPTIONS", {}).get(queue, {})
+
+
+class QueueAnnotations:
+    """task_annotations entry giving each task its queue's ack settings."""
+
+    def annotate(self, task):
+        options = queue_options(queue_for(task.name))
+        if "acks_late" not in options:
+            return None
+        return {
+            "acks_late": options["acks_late"],
+            # A late-acked task whose worker died is redelivered, not failed
+            "reject_on_worker_lost": options["acks_late"],
+        }
+
+
+app.conf.task_annotations = (QueueAnnotations(),)
+
+
+@celeryd_init.connect
+def configure_worker_prefetch(sender=None, conf=None, options=None, **kwargs):
+    queues = (options or {}).get("queues") or [app.conf.task_default_queue]
+    if isinstance(queues, str):
+        queues = queues.split(",")
+    multipliers = [
+        queue_options(queue)["prefetch_multiplier"]
+        for queue in queues if "prefetch_multiplier" in queue_options(queue)
+    ]
+    if multipliers:
+        conf.worker_prefetch_multiplier = min(multipliers)
+
+
+@app.task(bind=True)
+def debug_task(self):
+    print(f"Request: {self.request!r}")
@@ -0,0 +1,77 @@
+"""
+Read-replica routing.
+
+Reads go to a replica only inside `read_from_replica()`, which the GraphQL
+view enters for query operations. Everything else (mutations, admin, Celery
+tasks, management commands) uses the primary.
+
+After a user's own write, their reads stay on the primary for
+REPLICA_PIN_SECONDS so they never see replication lag on data they just
+changed.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_aliases():
+    return getattr(settings, "REPLICA_DATABASES", [])
+
+
+def pin_cache_key(user_id):
+    return f"db_pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """Route this user's reads to the primary for REPLICA_PIN_SECONDS."""
+    if user_id and replica_aliases():
+        cache.set(pin_cache_key(user_id), 1, timeout=getattr(settings, "REPLICA_PIN_SECONDS", 5))
+
+
+def is_pinned(user_id):
+    return bool(user_id) and cache.get(pin_cache_key(user_id)) is not None
+
+
+def replica_allowed(user=None):
+    """True if `user`'s reads may go to a replica (there is one and they are not pinned)."""
+    return bool(replica_aliases()) and not is_pinned(getattr(user, "pk", None))
+
+
+@contextmanager
+def read_from_replica(user=None, allowed=None):
+    """
+    Send reads in this block to a replica, unless `user` is pinned to the
+    primary. Async callers pass `allowed` (replica_allowed() run off the
+    event loop), since checking the pin is a cache read.
+    """
+    token = _use_replica.set(replica_allowed(user) if allowed is None else allowed)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Route reads to replicas inside read_from_replica(), everything else to default."""
+
+    def db_for_read(self, model, **hints):
+        aliases = replica_aliases()
+        if aliases and _use_replica.get():
+            return random.choice(aliases)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()
@@ -1,3 +1,7 @@
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+
+
 class DisableCSRFMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -6,3 +10,30 @@ class DisableCSRFMiddleware:
         if request.path.startswith("/graphql"):
             setattr(request, "_dont_enforce_csrf_checks", True)
         return self.get_response(request)
+
+
+class ReadinessMiddleware:
+    """
+    /ready/ for load balancer probes: 200 while the database answers, 503
+    while it does not. Answered here, ahead of sessions, auth and the
+    URLconf. The process is already warmed up by then: wsgi.py / asgi.py
+    run startup.warm_up() before the server accepts requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path == "/ready/":
+            ready = database_ready()
+            return JsonResponse({"status": "ready" if ready else "unavailable"}, status=200 if ready else 503)
+        return self.get_response(request)
+
+
+def database_ready():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return False
+    return True
@@ -14,6 +14,7 @@ from datetime import timedelta
 from pathlib import Path
 import os
 import dj_database_url
+from celery.schedules import crontab
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -27,13 +28,52 @@ if not os.environ.get("DATABASE_URL"):
 
 DEBUG = int(os.environ.get("DEBUG", 1))  # 1 = True, 0 = False
 
+# Connection management:
+#  - DB_POOL=1 uses Django's psycopg connection pool (one pool per process,
+#    sized by DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE) instead of persistent
+#    per-thread connections.
+#  - DB_PGBOUNCER=1 is for PgBouncer in transaction mode: server-side cursors
+#    can't survive across transactions there, so they are disabled.
+DB_POOL = os.environ.get("DB_POOL") == "1"
+DB_PGBOUNCER = os.environ.get("DB_PGBOUNCER") == "1"
+
+
+def database_config(url):
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+        conn_health_checks=True,
+        ssl_require=not DEBUG,
+    )
+    if "postgresql" in config["ENGINE"]:
+        if DB_POOL:
+            config.setdefault("OPTIONS", {})["pool"] = {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            }
+        if DB_PGBOUNCER:
+            config["DISABLE_SERVER_SIDE_CURSORS"] = True
+    return config
+
+
 DATABASES = {
-        "default": dj_database_url.config(
-            default=os.environ.get("DATABASE_URL"),
-            conn_max_age=600,
-            ssl_require=not DEBUG
-        )
-    }
+    "default": database_config(os.environ.get("DATABASE_URL")),
+}
+
+# Read replicas for GraphQL query operations (social_media_feed/db_router.py).
+# Comma separated; each URL becomes a "replica", "replica2", ... alias.
+REPLICA_DATABASES = []
+for i, url in enumerate(filter(None, os.environ.get("REPLICA_DATABASE_URL", "").split(","))):
+    alias = "replica" if i == 0 else f"replica{i + 1}"
+    DATABASES[alias] = database_config(url)
+    # Tests run against the primary's test database through the same connection
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["social_media_feed.db_router.ReplicaRouter"]
+# How long a user's reads stay on the primary after their own write
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -57,8 +97,6 @@ INSTALLED_APPS = [
     "rest_framework",     
     "rest_framework_simplejwt",  
 
-    "cloudinary",
-    "cloudinary_storage",
     'corsheaders', 
     'graphene_django',
 
@@ -67,11 +105,15 @@ INSTALLED_APPS = [
     "apps.follows",
     "apps.notifications",
     "apps.search",
+    "apps.media",
+    "apps.common",
 ]
 
 AUTH_USER_MODEL = "users.CustomUser"
 
 MIDDLEWARE = [
+    # Answers /ready/ before anything else runs (social_media_feed/middleware.py)
+    "social_media_feed.middleware.ReadinessMiddleware",
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -117,9 +159,58 @@ GRAPHENE = {
     "SCHEMA": "social_media_feed.schema.schema",
     "MIDDLEWARE": [
         "graphql_jwt.middleware.JSONWebTokenMiddleware",
+        "apps.common.rate_limit.RateLimitMiddleware",
     ],
 }
 
+# Serve /graphql/ through the async view (set by asgi.py, see apps/common/async_views.py)
+GRAPHQL_ASYNC = os.environ.get("GRAPHQL_ASYNC") == "1"
+
+# Automatic persisted queries + parsed document cache (apps/common/persisted_queries.py)
+GRAPHQL_PERSISTED_QUERIES = {
+    # Production can lock /graphql/ down to the queries in the manifest
+    "ALLOWLIST_ONLY": os.environ.get("GRAPHQL_ALLOWLIST_ONLY") == "1",
+    "MANIFEST": os.environ.get("GRAPHQL_QUERY_MANIFEST"),
+    "DOCUMENT_CACHE_SIZE": 256,
+    "TIMEOUT": 60 * 60 * 24,
+}
+
+# Query cost / depth limits (apps/common/query_cost.py)
+GRAPHQL_QUERY_COST = {
+    "MAX_COST": int(os.environ.get("GRAPHQL_MAX_COST", 5000)),
+    "MAX_DEPTH": int(os.environ.get("GRAPHQL_MAX_DEPTH", 8)),
+    # Size of list fields called without a `limit`, and the most any list
+    # resolver returns whatever `limit` asks for (page_size())
+    "DEFAULT_LIST_SIZE": 100,
+    "MAX_LIST_SIZE": 100,
+    "FIELD_WEIGHTS": {
+        "Query.feed": 5,
+        "Query.search": 5,
+        "Query.trendingPosts": 5,
+        "Query.userStats": 2,
+        "PostType.likesCount": 1,
+        "PostType.commentsCount": 1,
+        "PostType.isLikedByUser": 1,
+        "UserType.followersCount": 1,
+        "UserType.followingCount": 1,
+        "UserType.postsCount": 1,
+    },
+}
+
+# Response cache for anonymous public queries (apps/common/response_cache.py)
+# Root field -> TTL hint in seconds and the tags it is invalidated by.
+GRAPHQL_RESPONSE_CACHE = {
+    "ENABLED": os.environ.get("GRAPHQL_RESPONSE_CACHE", "1") == "1",
+    "FIELDS": {
+        "posts": {"ttl": 30, "tags": ["posts"]},
+        "post": {"ttl": 60, "tags": ["post:{id}"]},
+        "trendingPosts": {"ttl": 60, "tags": ["posts"]},
+        "user": {"ttl": 60, "tags": ["user:{userId}"]},
+        "search": {"ttl": 30, "tags": ["posts", "users"]},
+        "userStats": {"ttl": 60, "tags": ["user:{userId}"]},
+    },
+}
+
 GRAPHQL_JWT = {
     "JWT_VERIFY_EXPIRATION": True,
 
@@ -181,6 +272,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'social_media_feed.wsgi.application'
 
+# Apply migrations when a server process starts (social_media_feed/startup.py).
+# Off by default: docker/entrypoint.sh migrates once before starting gunicorn.
+RUN_MIGRATIONS_ON_BOOT = os.environ.get("RUN_MIGRATIONS_ON_BOOT") == "1"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -232,23 +327,194 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 #     "SECURE": True,
 # }
 
+# Media uploads go through apps.media.storage, which imports cloudinary only
+# when uploading; "cloudinary"/"cloudinary_storage" are no longer installed
+# apps, so re-add them before enabling this.
 # DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'mediafiles'
 
+# Uploaded images (apps.media): where originals and variants are stored,
+# the variant sizes (longest side, px) and the encoded formats.
+# Cloudinary is configured by CLOUDINARY_URL or by CLOUDINARY_CLOUD_NAME /
+# CLOUDINARY_API_KEY / CLOUDINARY_API_SECRET (both read by the SDK).
+CLOUDINARY_CONFIGURED = bool(
+    os.environ.get("CLOUDINARY_URL")
+    or all(os.environ.get(f"CLOUDINARY_{name}") for name in ("CLOUD_NAME", "API_KEY", "API_SECRET"))
+)
+MEDIA_STORAGE_BACKEND = os.environ.get(
+    "MEDIA_STORAGE_BACKEND",
+    "apps.media.storage.CloudinaryMediaStorage" if CLOUDINARY_CONFIGURED
+    else "apps.media.storage.LocalMediaStorage",
+)
+# Local files live on the container's ephemeral disk and /media/ is only
+# served with DEBUG on: refuse to fall back to them silently in production.
+if not DEBUG and "MEDIA_STORAGE_BACKEND" not in os.environ and not CLOUDINARY_CONFIGURED:
+    raise RuntimeError(
+        "No media storage configured: set CLOUDINARY_URL (or CLOUDINARY_CLOUD_NAME, "
+        "CLOUDINARY_API_KEY and CLOUDINARY_API_SECRET), or MEDIA_STORAGE_BACKEND explicitly."
+    )
+IMAGE_VARIANT_SIZES = {"thumb": 160, "medium": 640, "large": 1280}
+IMAGE_VARIANT_FORMATS = ["webp", "avif"]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# Media files
-CELERY_BROKER_URL = os.environ.get("REDIS_URL")
-CELERY_RESULT_BACKEND = os.environ.get("REDIS_URL")
+REDIS_URL = os.environ.get("REDIS_URL")
+
+# The response cache, persisted queries, read-your-writes pins, the token
+# blacklist, login backoff and the trending/user-stats warmers all expect
+# every web and Celery process to see the same cache: use Redis whenever it
+# is configured. LocMemCache is per process, so it is only correct for a
+# single process (tests, runserver).
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Celery (social_media_feed/celery.py). Without Redis, tasks run eagerly in-process.
+CELERY_BROKER_URL = REDIS_URL or "memory://"
+CELERY_RESULT_BACKEND = REDIS_URL
+CELERY_TASK_ALWAYS_EAGER = os.environ.get("CELERY_TASK_ALWAYS_EAGER", "0" if REDIS_URL else "1") == "1"
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "apps.notifications.tasks.fix_notification_types": {"queue": "maintenance"},
+    "apps.notifications.tasks.dedupe_notifications": {"queue": "maintenance"},
+    "apps.notifications.tasks.*": {"queue": "email"},
+    "apps.media.tasks.*": {"queue": "media"},
+    "apps.users.tasks.export_user_data": {"queue": "media"},
+    "apps.posts.tasks.rebuild_user_stats": {"queue": "maintenance"},
+    "apps.posts.tasks.run_deletion": {"queue": "maintenance"},
+    "apps.posts.tasks.resume_deletion_jobs": {"queue": "maintenance"},
+    "apps.users.tasks.purge_expired_tokens": {"queue": "maintenance"},
+    "apps.posts.tasks.update_trending": {"queue": "maintenance"},
+    "apps.posts.tasks.warm_user_stats": {"queue": "maintenance"},
+}
+# Per-queue worker tuning; run one worker per queue, e.g.
+#   celery -A social_media_feed worker -Q email --concurrency 8
+CELERY_QUEUE_OPTIONS = {
+    # Short tasks (like flushes): prefetch a few, ack on receipt
+    "default": {"prefetch_multiplier": 4, "acks_late": False},
+    # I/O bound sends: prefetch more; redeliver if the worker dies mid-send
+    # (batched emails travel in the task message, see apps/common/task_batching.py)
+    "email": {"prefetch_multiplier": 8, "acks_late": True},
+    # Long, CPU or disk bound: one at a time so work spreads across workers
+    "media": {"prefetch_multiplier": 1, "acks_late": True},
+    "maintenance": {"prefetch_multiplier": 1, "acks_late": True},
+}
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
+# The periodic task registry. Beat runs with django_celery_beat's
+# DatabaseScheduler; `manage.py sync_periodic_tasks` (run on deploy) makes
+# the database match this dict. Incremental jobs only look at rows changed
+# since their last run (apps/common/watermarks.py).
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    "rebuild-user-stats-nightly": {
+        "task": "apps.posts.tasks.rebuild_user_stats",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "resume-deletion-jobs": {
+        "task": "apps.posts.tasks.resume_deletion_jobs",
+        "schedule": crontab(minute="*/10"),
+    },
+    "purge-expired-tokens": {
+        "task": "apps.users.tasks.purge_expired_tokens",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "fix-notification-types": {
+        "task": "apps.notifications.tasks.fix_notification_types",
+        "schedule": crontab(minute="*/10"),
+    },
+    # After the type fixes, which can turn rows into duplicates
+    "dedupe-notifications": {
+        "task": "apps.notifications.tasks.dedupe_notifications",
+        "schedule": crontab(minute="5-59/10"),
+    },
+    "warm-user-stats": {
+        "task": "apps.posts.tasks.warm_user_stats",
+        "schedule": 60.0,
+    },
+    "update-trending": {
+        "task": "apps.posts.tasks.update_trending",
+        "schedule": 60.0,
+    },
+    "rebuild-trending": {
+        "task": "apps.posts.tasks.update_trending",
+        "schedule": crontab(minute=30),
+        "kwargs": {"full": True},
+    },
+}
+
+# Task batching and metrics (apps/common/task_batching.py, task_metrics.py)
+TASK_BATCH_BACKEND = os.environ.get("TASK_BATCH_BACKEND", "redis" if REDIS_URL else "memory")
+TASK_METRICS_BACKEND = os.environ.get("TASK_METRICS_BACKEND", "redis" if REDIS_URL else "memory")
+
+# Write-behind likes (apps/posts/like_buffer.py): likePost appends intents to
+# a buffer that the flush_likes task applies in batches.
+LIKE_WRITE_BEHIND = os.environ.get("LIKE_WRITE_BEHIND") == "1"
+LIKE_BUFFER_BACKEND = os.environ.get("LIKE_BUFFER_BACKEND", "redis" if REDIS_URL else "memory")
+LIKE_BUFFER_BATCH_SIZE = 1000
+LIKE_FLUSH_INTERVAL = float(os.environ.get("LIKE_FLUSH_INTERVAL", 2))
+# flush_likes runs in a Celery worker: a per-process buffer in the web
+# process would never be read, so every buffered like would be lost.
+if LIKE_WRITE_BEHIND and LIKE_BUFFER_BACKEND == "memory":
+    raise RuntimeError(
+        "LIKE_WRITE_BEHIND=1 needs a shared like buffer: set REDIS_URL (or LIKE_BUFFER_BACKEND=redis)."
+    )
+if LIKE_WRITE_BEHIND:
+    CELERY_BEAT_SCHEDULE["flush-likes"] = {
+        "task": "apps.posts.tasks.flush_likes",
+        "schedule": LIKE_FLUSH_INTERVAL,
+    }
+
+# Token-bucket rate limits per GraphQL root field (apps/common/rate_limit.py):
+# field name -> (burst capacity, tokens refilled per minute)
+GRAPHQL_RATE_LIMITS = {
+    "likePost": (60, 60),
+    "createComment": (20, 10),
+    "followUser": (30, 20),
+    "search": (30, 30),
+}
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "redis" if REDIS_URL else "memory")
+# Per-IP buckets are this many times a user's budget (users behind one NAT share an IP)
+RATE_LIMIT_IP_MULTIPLIER = 5
+# Number of reverse proxies in front of the app that append to
+# X-Forwarded-For (Render's load balancer: 1). Rate limits and login backoff
+# key on the client address that many hops from the right; 0 uses
+# REMOTE_ADDR. Too high a value lets clients pick their own address.
+TRUSTED_PROXY_COUNT = int(os.environ.get("TRUSTED_PROXY_COUNT", 0))
+
+# Password hashing pool and failed-login backoff (apps/users/passwords.py)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+# Hashes running or queued at once across all processes; more fail fast.
+# Keep it below WEB_CONCURRENCY so a login burst never holds every worker.
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", 2))
+PASSWORD_HASH_SLOTS_BACKEND = os.environ.get("PASSWORD_HASH_SLOTS_BACKEND", "redis" if REDIS_URL else "memory")
+PASSWORD_HASH_TIMEOUT = 10
+LOGIN_FAILURE_THRESHOLD = 5
+LOGIN_IP_FAILURE_THRESHOLD = 20
+LOGIN_FAILURE_WINDOW = 60 * 60
+LOGIN_BACKOFF_MAX_SECONDS = 15 * 60
+
+# Refresh-token blacklist (apps/users/token_blacklist.py)
+TOKEN_BLACKLIST_BLOOM_REFRESH = 60
+TOKEN_PURGE_CHUNK_SIZE = 5000
 
 # Email settings (example using Gmail)
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
@@ -0,0 +1,14 @@
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite:////tmp/smf_test.db")
+from .settings import *  # noqa
+
+DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_BROKER_URL = "memory://"
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+from celery import current_app as _celery
+_celery.conf.task_always_eager = True
+_celery.conf.broker_url = "memory://"
@@ -1,8 +1,38 @@
-import sys
+"""
+Process start-up for the web server (wsgi.py / asgi.py).
+
+Migrations are a deploy step, not a boot step: they only run here with
+RUN_MIGRATIONS_ON_BOOT=1 (docker/entrypoint.sh runs them once per container
+instead of once per worker). warm_up() pays the one-off import cost of
+the GraphQL schema before the first request. Under `gunicorn --preload`
+it runs once in the master and the workers fork from the warmed process.
+"""
+from django.conf import settings
 from django.core.management import call_command
+from django.db import connections
+
 
 def run_migrations():
     try:
         call_command("migrate", interactive=False)
     except Exception as e:
         print("Migration error:", e)
+
+
+def warm_up():
+    """Import the schema and URLconf; safe to call before forking."""
+    if settings.RUN_MIGRATIONS_ON_BOOT:
+        run_migrations()
+    from django.urls import get_resolver
+    from graphene_django.settings import graphene_settings
+
+    get_resolver().url_patterns
+    graphene_settings.SCHEMA
+    # Connections opened while warming up must not be shared by forked
+    # workers; with DB_POOL that includes the pool's own connections and
+    # worker threads, which close() alone would keep open.
+    for conn in connections.all(initialized_only=True):
+        conn.close()
+        # conn.pool would create a pool just to close it
+        if conn.alias in getattr(conn, "_connection_pools", ()):
+            conn.close_pool()
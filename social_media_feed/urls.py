@@ -17,26 +17,60 @@ Including another URLconf
 
 from django.contrib import admin
 from django.http import JsonResponse
+from django.db import connections
 from django.urls import path
 from apps.common.views import AuthenticatedGraphQLView
+from apps.common.async_views import AsyncAuthenticatedGraphQLView
+from apps.common.db import connection_stats
+from apps.common.task_metrics import queue_depths, task_stats
+from apps.users.views import export_my_data
 from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import render
 from django.conf.urls.static import static
 
 from social_media_feed import settings
+from social_media_feed.celery import app as celery_app
 
 
 def health(request):
     return JsonResponse({"status": "ok"})
 
+def db_health(request):
+    """Connection / pool metrics for every configured database."""
+    try:
+        databases = [connection_stats(alias) for alias in connections]
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=503)
+    return JsonResponse({"status": "ok", "databases": databases})
+
+def celery_health(request):
+    """Queue depths and per-task latency metrics."""
+    app = celery_app
+    queues = sorted({app.conf.task_default_queue, *settings.CELERY_QUEUE_OPTIONS})
+    try:
+        depths = {} if app.conf.task_always_eager else queue_depths(app, queues)
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=503)
+    return JsonResponse({
+        "status": "ok",
+        "eager": app.conf.task_always_eager,
+        "queues": depths,
+        "tasks": task_stats(),
+    })
+
 def landing_page(request):
     return render(request, "landing.html")
 
+GraphQLView = AsyncAuthenticatedGraphQLView if settings.GRAPHQL_ASYNC else AuthenticatedGraphQLView
+
 urlpatterns = [
     path("", landing_page),
     path("admin/", admin.site.urls),
-    path('graphql/', csrf_exempt(AuthenticatedGraphQLView.as_view(graphiql=True))),
+    path('graphql/', csrf_exempt(GraphQLView.as_view(graphiql=True))),
     path("health/", health),
+    path("health/db/", db_health),
+    path("health/celery/", celery_health),
+    path("users/me/export/", export_my_data),
 ]
 
 if settings.DEBUG:
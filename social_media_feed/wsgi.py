@@ -15,6 +15,6 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_media_feed.settings')
 
 application = get_wsgi_application()
 
-# ✅ Run migrations on startup (Render Free fix)
-from .startup import run_migrations
-run_migrations()
\ No newline at end of file
+# Migrations run from docker/entrypoint.sh, not here (see startup.py)
+from .startup import warm_up  # noqa: E402
+warm_up()
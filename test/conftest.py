@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 from pathlib import Path
@@ -12,6 +13,35 @@ django.setup()
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Rate limit buckets are per process; start every test with full ones."""
+    from apps.common.rate_limit import reset_rate_limiter
+    reset_rate_limiter()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """The default cache is shared by every test; start and end each with an empty one."""
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def graphql():
+    """POST a GraphQL request to /graphql/ and return the decoded response."""
+    def post_graphql(client, query=None, variables=None, **payload):
+        if query is not None:
+            payload['query'] = query
+        if variables is not None:
+            payload['variables'] = variables
+        response = client.post('/graphql/', data=json.dumps(payload), content_type='application/json')
+        return response.json()
+    return post_graphql
+
+
 @pytest.fixture
 def api_client():
     """GraphQL API client."""
@@ -0,0 +1,88 @@
+# test/test_async_graphql.py
+import pytest
+import json
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.common.async_views import AsyncAuthenticatedGraphQLView
+from apps.notifications.models import Notification
+from apps.posts.models import Post
+
+
+@pytest.fixture
+def async_graphql():
+    """Call the async GraphQL view directly, as the ASGI handler would."""
+    view = AsyncAuthenticatedGraphQLView.as_view()
+    factory = RequestFactory()
+
+    def call(query, variables=None, user=None):
+        headers = {}
+        if user is not None:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(user).access_token}'
+        request = factory.post(
+            '/graphql/',
+            data=json.dumps({'query': query, 'variables': variables or {}}),
+            content_type='application/json',
+            **headers
+        )
+        response = async_to_sync(view)(request)
+        return json.loads(response.content)
+    return call
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncGraphQLView:
+    """Test the ASGI execution path for /graphql/."""
+
+    def test_view_is_async(self):
+        assert AsyncAuthenticatedGraphQLView.view_is_async
+
+    def test_feed(self, async_graphql, user, other_user, post_factory, follow_factory):
+        follow_factory(follower=user, followed=other_user)
+        post_factory(author=other_user, content="hello from other")
+
+        result = async_graphql("query { feed(limit: 5) { content author { username } } }", user=user)
+
+        assert 'errors' not in result
+        assert result['data']['feed'] == [
+            {'content': 'hello from other', 'author': {'username': 'otheruser'}}
+        ]
+
+    def test_feed_requires_authentication(self, async_graphql):
+        result = async_graphql("query { feed { id } }")
+        assert result['errors'][0]['message'] == "Authentication required"
+
+    def test_notifications_and_search_in_one_operation(self, async_graphql, user, other_user, post):
+        Notification.objects.create(
+            recipient=user, sender=other_user, notification_type='like', post=post
+        )
+        query = """
+            query {
+                notifications { notificationType sender { username } }
+                unreadNotifications { id }
+                search(q: "Test") { posts { content } users { username } }
+            }
+        """
+        result = async_graphql(query, user=user)
+
+        assert 'errors' not in result
+        assert result['data']['notifications'] == [
+            {'notificationType': 'LIKE', 'sender': {'username': 'otheruser'}}
+        ]
+        assert len(result['data']['unreadNotifications']) == 1
+        assert result['data']['search']['posts'] == [{'content': 'Test post content'}]
+
+    def test_sync_resolvers_still_work(self, async_graphql, post):
+        result = async_graphql("query { posts(limit: 5) { id likesCount author { username } } }")
+
+        assert 'errors' not in result
+        assert result['data']['posts'][0]['author']['username'] == 'testuser'
+
+    def test_mutation_falls_back_to_sync_view(self, async_graphql, user):
+        mutation = """
+            mutation { createPost(content: "Written via ASGI") { post { content } } }
+        """
+        result = async_graphql(mutation, user=user)
+
+        assert 'errors' not in result
+        assert Post.objects.filter(content="Written via ASGI").exists()
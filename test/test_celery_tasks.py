@@ -0,0 +1,101 @@
+# test/test_celery_tasks.py
+import pytest
+from django.core import mail
+from django.test import override_settings
+
+from apps.common.task_batching import get_batch_buffer, reset_batch_buffer
+from apps.common.task_metrics import reset_task_metrics, task_stats
+from apps.notifications.services import create_notification
+from apps.notifications.tasks import send_notification_emails
+from apps.posts.tasks import flush_likes
+from social_media_feed.celery import app, queue_for
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    reset_batch_buffer()
+    reset_task_metrics()
+    yield
+    reset_batch_buffer()
+    reset_task_metrics()
+
+
+class TestRouting:
+    """Test queue routing and per-queue ack settings."""
+
+    def test_tasks_are_routed_to_queues(self):
+        assert queue_for("apps.notifications.tasks.send_notification_emails") == "email"
+        assert queue_for("apps.users.tasks.purge_expired_tokens") == "maintenance"
+        assert queue_for("apps.posts.tasks.flush_likes") == "default"
+
+    def test_queue_ack_settings_are_applied(self):
+        assert app.tasks["apps.notifications.tasks.send_notification_emails"].acks_late is True
+        assert flush_likes.acks_late is False
+
+
+@pytest.mark.django_db
+class TestBatchTask:
+    """Test batched notification emails."""
+
+    def test_buffered_items_are_sent_in_batches(self, monkeypatch):
+        monkeypatch.setattr(send_notification_emails, "batch_size", 2)
+        sent = []
+        monkeypatch.setattr(send_notification_emails, "run", lambda items: sent.append(items))
+        buffer = get_batch_buffer()
+        for i in range(5):
+            buffer.push(send_notification_emails.name, ["subject", f"body {i}", f"user{i}@example.com"])
+
+        send_notification_emails.apply()
+
+        assert [len(batch) for batch in sent] == [2, 2, 1]
+        assert buffer.size(send_notification_emails.name) == 0
+
+    def test_add_schedules_one_flush(self, monkeypatch):
+        scheduled = []
+        monkeypatch.setattr(send_notification_emails, "apply_async", lambda **kwargs: scheduled.append(kwargs))
+
+        with override_settings(CELERY_TASK_ALWAYS_EAGER=False):
+            for i in range(3):
+                send_notification_emails.add("subject", "body", f"user{i}@example.com")
+
+        assert scheduled == [{"countdown": send_notification_emails.flush_after}]
+        assert get_batch_buffer().size(send_notification_emails.name) == 3
+
+    def test_flush_publishes_items_in_messages(self, monkeypatch):
+        monkeypatch.setattr(send_notification_emails, "batch_size", 2)
+        published = []
+        monkeypatch.setattr(send_notification_emails, "apply_async", lambda **kwargs: published.append(kwargs))
+        buffer = get_batch_buffer()
+        items = [["subject", "body", f"user{i}@example.com"] for i in range(3)]
+        for item in items:
+            buffer.push(send_notification_emails.name, item)
+
+        with override_settings(CELERY_TASK_ALWAYS_EAGER=False):
+            assert send_notification_emails.flush() == 3
+
+        # A redelivered message still carries its emails
+        assert published == [{"args": [items[:2]]}, {"args": [items[2:]]}]
+        assert buffer.size(send_notification_emails.name) == 0
+
+    def test_notification_email_is_sent(self, user, other_user):
+        create_notification(recipient=user, actor=other_user, verb="follow")
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [user.email]
+
+
+@pytest.mark.django_db
+class TestTaskMetrics:
+    """Test task latency metrics and the /health/celery/ endpoint."""
+
+    def test_runs_are_recorded(self, api_client, user, other_user):
+        create_notification(recipient=user, actor=other_user, verb="follow")
+
+        stats = task_stats()["apps.notifications.tasks.send_notification_emails"]
+        assert stats["runs"] == 1 and stats["failures"] == 0
+        assert stats["avg_runtime_ms"] >= 0
+
+        response = api_client.get("/health/celery/")
+        body = response.json()
+        assert response.status_code == 200 and body["eager"] is True
+        assert "apps.notifications.tasks.send_notification_emails" in body["tasks"]
@@ -0,0 +1,148 @@
+# test/test_comment_threads.py
+import pytest
+from apps.posts.deletion import create_deletion_job, run_deletion_job
+from apps.posts.models import Comment, DeletionJob
+from apps.posts.services import (
+    create_comment, delete_comment, comment_page, get_user_stats, fill_root_comment_paths,
+)
+
+
+@pytest.fixture
+def thread(post, user, other_user):
+    """
+    a
+    ├── a1
+    │   └── a1x
+    └── a2
+    b
+    """
+    a = create_comment(post, other_user, "a")
+    b = create_comment(post, user, "b")
+    a1 = create_comment(post, user, "a1", parent=a)
+    a2 = create_comment(post, other_user, "a2", parent=a)
+    a1x = create_comment(post, other_user, "a1x", parent=a1)
+    return {c.content: Comment.objects.get(pk=c.pk) for c in (a, b, a1, a2, a1x)}
+
+
+def contents(comments):
+    return [c.content for c in comments]
+
+
+@pytest.mark.django_db
+class TestCommentThreads:
+    """Test materialized-path replies."""
+
+    def test_reply_sets_path_depth_and_count(self, thread):
+        assert thread['a1x'].path.startswith(thread['a1'].path)
+        assert thread['a1'].path.startswith(thread['a'].path)
+        assert (thread['a'].depth, thread['a1'].depth, thread['a1x'].depth) == (0, 1, 2)
+        assert thread['a'].replies_count == 2
+        assert thread['a1'].replies_count == 1
+        assert thread['b'].replies_count == 0
+
+    def test_thread_is_depth_first(self, post, thread):
+        comments, _, has_next = comment_page(post.pk, first=10)
+
+        assert contents(comments) == ['a', 'a1', 'a1x', 'a2', 'b']
+        assert has_next is False
+
+    def test_cursor_pagination(self, post, thread):
+        first, cursor, has_next = comment_page(post.pk, first=2)
+        second, _, _ = comment_page(post.pk, first=10, after=cursor)
+
+        assert contents(first) == ['a', 'a1']
+        assert has_next is True
+        assert contents(second) == ['a1x', 'a2', 'b']
+
+    def test_max_depth_and_replies(self, post, thread, django_assert_num_queries):
+        top, _, _ = comment_page(post.pk, first=10, max_depth=0)
+        assert contents(top) == ['a', 'b']
+
+        with django_assert_num_queries(1):
+            replies, _, _ = comment_page(post.pk, first=10, root=thread['a'])
+        assert contents(replies) == ['a1', 'a1x', 'a2']
+
+    def test_reply_must_be_on_same_post(self, post_factory, user, thread):
+        other_post = post_factory(author=user)
+
+        with pytest.raises(ValueError):
+            create_comment(other_post, user, "nope", parent=thread['a'])
+
+    def test_delete_removes_replies_and_updates_counts(self, post, user, thread):
+        assert get_user_stats(user.id)['total_comments_received'] == 5
+
+        delete_comment(thread['a1'])
+
+        assert not Comment.objects.filter(content__in=['a1', 'a1x']).exists()
+        assert Comment.objects.get(pk=thread['a'].pk).replies_count == 1
+        assert get_user_stats(user.id)['total_comments_received'] == 3
+
+        # A concurrent second delete finds nothing left to count
+        delete_comment(thread['a1'])
+        assert Comment.objects.get(pk=thread['a'].pk).replies_count == 1
+        assert get_user_stats(user.id)['total_comments_received'] == 3
+
+    def test_deletion_job_removes_threads(self, post, user, thread):
+        job = create_deletion_job(DeletionJob.KIND_POST, user.id, post_id=post.pk)
+
+        run_deletion_job(job, chunk_size=2)
+
+        assert job.deleted['comments'] == 5
+        assert not Comment.objects.exists()
+
+    def test_fill_paths_after_bulk_create(self, post, user):
+        Comment.objects.bulk_create([Comment(post=post, author=user, content="bulk")])
+
+        assert fill_root_comment_paths() == 1
+        comment = Comment.objects.get()
+        assert int(comment.path) == comment.pk
+
+
+@pytest.mark.django_db
+class TestCommentThreadQueries:
+    """Test thread queries and replying through GraphQL."""
+
+    THREAD = """
+        query Thread($postId: ID!, $after: String) {
+            commentThread(postId: $postId, first: 2, after: $after, maxDepth: 0) {
+                comments {
+                    content
+                    repliesCount
+                    replies(first: 5) { comments { content depth parentId } hasNextPage }
+                }
+                endCursor
+                hasNextPage
+            }
+        }
+    """
+
+    def test_thread_pages(self, api_client, post, thread, graphql):
+        page = graphql(api_client, self.THREAD, {'postId': post.pk})['data']['commentThread']
+
+        assert [c['content'] for c in page['comments']] == ['a', 'b']
+        assert page['comments'][0]['repliesCount'] == 2
+        replies = page['comments'][0]['replies']['comments']
+        assert [(r['content'], r['depth']) for r in replies] == [('a1', 1), ('a1x', 2), ('a2', 1)]
+        assert replies[0]['parentId'] == str(thread['a'].pk)
+        assert page['hasNextPage'] is False
+
+    def test_invalid_cursor(self, api_client, post, graphql):
+        result = graphql(api_client, self.THREAD, {'postId': post.pk, 'after': 'garbage!'})
+
+        assert result['errors'][0]['message'] == 'Invalid cursor'
+
+    def test_reply_mutation(self, authenticated_client, post, other_user, thread, graphql):
+        result = graphql(
+            authenticated_client,
+            """
+            mutation Reply($postId: ID!, $parentId: ID) {
+                createComment(postId: $postId, parentId: $parentId, content: "reply") {
+                    comment { depth parentId }
+                }
+            }
+            """,
+            {'postId': post.pk, 'parentId': thread['b'].pk},
+        )
+
+        assert result['data']['createComment']['comment'] == {'depth': 1, 'parentId': str(thread['b'].pk)}
+        assert Comment.objects.get(pk=thread['b'].pk).replies_count == 1
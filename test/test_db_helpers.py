@@ -0,0 +1,52 @@
+# test/test_db_helpers.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.common.db import iterate_in_chunks
+from apps.posts.models import Post
+
+
+@pytest.mark.django_db
+class TestIterateInChunks:
+    """Test keyset-chunked iteration (no server-side cursors on SQLite)."""
+
+    def test_yields_every_row_in_chunks(self, user, post_factory):
+        for i in range(7):
+            post_factory(author=user, content=f"post {i}")
+
+        with CaptureQueriesContext(connection) as ctx:
+            contents = [p.content for p in iterate_in_chunks(Post.objects.all(), chunk_size=3)]
+
+        assert contents == [f"post {i}" for i in range(7)]
+        assert len(ctx.captured_queries) == 3
+
+    def test_values_queryset(self, user, post_factory):
+        for i in range(4):
+            post_factory(author=user, content=f"post {i}")
+
+        rows = list(iterate_in_chunks(Post.objects.values("id", "content"), chunk_size=2))
+
+        assert [r["content"] for r in rows] == [f"post {i}" for i in range(4)]
+
+    def test_values_without_pk_rejected(self, user, post_factory):
+        for i in range(2):
+            post_factory(author=user)
+
+        with pytest.raises(ValueError):
+            list(iterate_in_chunks(Post.objects.values("content"), chunk_size=1))
+
+
+@pytest.mark.django_db
+class TestDatabaseHealth:
+    """Test the /health/db/ endpoint."""
+
+    def test_reports_connection_stats(self, api_client):
+        response = api_client.get('/health/db/')
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == 'ok'
+        default = data['databases'][0]
+        assert default['alias'] == 'default'
+        assert default['pooled'] is False
+        assert default['checkout_ms'] >= 0
@@ -0,0 +1,92 @@
+# test/test_db_router.py
+import pytest
+from django.db import connections
+from django.test import override_settings
+from apps.posts.models import Post
+from social_media_feed.db_router import ReplicaRouter, is_pinned, pin_to_primary, read_from_replica
+
+
+@pytest.fixture
+def replica():
+    """
+    Configure a "replica" alias mirroring the default test database, the way
+    Django sets up TEST MIRROR databases.
+    """
+    connections.settings["replica"] = connections.settings["default"]
+    connections["replica"] = connections["default"]
+    with override_settings(REPLICA_DATABASES=["replica"]):
+        yield "replica"
+    del connections["replica"]
+    del connections.settings["replica"]
+
+
+@pytest.fixture
+def routed_reads(monkeypatch):
+    """Record the alias chosen by the router for every read."""
+    used = []
+    original = ReplicaRouter.db_for_read
+
+    def db_for_read(self, model, **hints):
+        used.append(original(self, model, **hints))
+        return used[-1]
+    monkeypatch.setattr(ReplicaRouter, 'db_for_read', db_for_read)
+    return used
+
+
+@pytest.mark.django_db(databases=["default"])
+class TestReplicaRouter:
+    """Test routing of reads between primary and replicas."""
+
+    def test_reads_use_primary_by_default(self, replica):
+        assert ReplicaRouter().db_for_read(Post) is None
+        assert Post.objects.all().db == 'default'
+
+    def test_reads_use_replica_inside_context(self, replica, user):
+        with read_from_replica(user):
+            assert Post.objects.all().db == 'replica'
+            assert ReplicaRouter().db_for_write(Post) == 'default'
+
+    def test_no_replica_configured(self, user):
+        with read_from_replica(user):
+            assert Post.objects.all().db == 'default'
+
+    def test_pinned_user_reads_primary(self, replica, user):
+        pin_to_primary(user.pk)
+
+        assert is_pinned(user.pk)
+        with read_from_replica(user):
+            assert Post.objects.all().db == 'default'
+
+    def test_replica_not_migrated(self, replica):
+        router = ReplicaRouter()
+        assert router.allow_migrate('default', 'posts')
+        assert not router.allow_migrate('replica', 'posts')
+
+
+@pytest.mark.django_db(databases=["default"])
+class TestGraphQLRouting:
+    """Test that the GraphQL view routes operations."""
+
+    def test_query_reads_from_replica(self, replica, api_client, post, routed_reads, graphql):
+        result = graphql(api_client, "query { posts(limit: 5) { id author { username } } }")
+
+        assert 'errors' not in result
+        assert 'replica' in routed_reads
+
+    def test_mutation_pins_user_to_primary(self, replica, authenticated_client, user, graphql):
+        result = graphql(
+            authenticated_client,
+            'mutation { createPost(content: "fresh") { post { id } } }'
+        )
+
+        assert 'errors' not in result
+        assert is_pinned(user.pk)
+
+    def test_pinned_user_reads_own_write_from_primary(self, replica, authenticated_client, user, routed_reads, graphql):
+        graphql(authenticated_client, 'mutation { createPost(content: "fresh") { post { id } } }')
+        routed_reads.clear()
+
+        result = graphql(authenticated_client, "query { feed { content } }")
+
+        assert result['data']['feed'] == [{'content': 'fresh'}]
+        assert routed_reads and 'replica' not in routed_reads
@@ -0,0 +1,103 @@
+# test/test_deletion_jobs.py
+import pytest
+import json
+from datetime import timedelta
+from django.core.management import call_command
+from apps.notifications.models import Notification
+from apps.posts import deletion
+from apps.posts.deletion import create_deletion_job, resumable_jobs, run_deletion_job
+from apps.posts.models import Post, Comment, Like, DeletionJob
+from apps.posts.services import get_user_stats, like_post, create_comment
+from apps.posts.tasks import run_deletion
+
+
+@pytest.fixture
+def busy_posts(user, other_user, post_factory):
+    """Three posts by `user`, each liked and commented on by `other_user`."""
+    posts = [post_factory(author=user, content=f"post {i}") for i in range(3)]
+    for post in posts:
+        like_post(post, other_user)
+        create_comment(post, other_user, "hi")
+    return posts
+
+
+@pytest.mark.django_db
+class TestDeletionJobs:
+    """Test chunked, resumable post deletion."""
+
+    def test_delete_post_mutation_removes_children(self, authenticated_client, user, busy_posts, graphql):
+        target = busy_posts[0]
+
+        result = graphql(
+            authenticated_client,
+            'mutation Delete($id: ID!) { deletePost(postId: $id) { success } }',
+            {'id': target.id},
+        )
+
+        assert result['data']['deletePost']['success'] is True
+        assert not Post.objects.filter(pk=target.pk).exists()
+        assert not Like.objects.filter(post_id=target.pk).exists()
+        assert not Comment.objects.filter(post_id=target.pk).exists()
+        assert not Notification.objects.filter(post_id=target.pk).exists()
+        assert Post.objects.filter(author=user).count() == 2
+        assert get_user_stats(user.id)['total_likes_received'] == 2
+
+    def test_user_posts_job_removes_everything(self, authenticated_client, user, busy_posts, graphql):
+        job = create_deletion_job(DeletionJob.KIND_USER_POSTS, user.id, requested_by=user)
+        run_deletion.delay(job.pk)
+
+        assert job.total_posts == 3
+        assert not Post.objects.filter(author=user).exists()
+        assert get_user_stats(user.id)['posts_count'] == 0
+
+        result = graphql(
+            authenticated_client,
+            'query Job($id: ID!) { deletionJob(id: $id) { status stage totalPosts deleted } }',
+            {'id': job.pk},
+        )['data']['deletionJob']
+        assert result['status'] == 'DONE'
+        assert json.loads(result['deleted']) == {'notifications': 6, 'likes': 3, 'comments': 3, 'posts': 3}
+
+    def test_delete_all_user_posts_is_not_exposed(self, authenticated_client, user, graphql):
+        result = graphql(
+            authenticated_client,
+            'mutation Delete($id: ID!) { deleteAllUserPosts(userId: $id) { success } }',
+            {'id': user.id},
+        )
+        assert 'errors' in result
+
+    def test_job_resumes_after_crash(self, user, busy_posts, monkeypatch):
+        job = create_deletion_job(DeletionJob.KIND_USER_POSTS, user.id)
+        original = deletion.invalidate_tags
+        calls = []
+
+        def crash_after_first_posts_chunk(*tags):
+            calls.append(tags)
+            if tags[0].startswith('post:'):
+                raise RuntimeError("worker killed")
+            return original(*tags)
+        monkeypatch.setattr(deletion, 'invalidate_tags', crash_after_first_posts_chunk)
+
+        with pytest.raises(RuntimeError):
+            run_deletion_job(job, chunk_size=1)
+        job.refresh_from_db()
+        assert job.status == DeletionJob.STATUS_FAILED
+        assert job.stage == 'posts'
+        # Not retried by the beat schedule, only by hand
+        assert not resumable_jobs(timedelta(0)).exists()
+        assert Post.objects.filter(author=user).count() == 2
+
+        # Activity on the remaining posts while the job is stopped
+        remaining = Post.objects.filter(author=user).order_by('pk')
+        like_post(remaining[0], user)
+        reply_to = Comment.objects.filter(post=remaining[1]).get()
+        create_comment(remaining[1], user, "reply", parent=reply_to)
+
+        monkeypatch.setattr(deletion, 'invalidate_tags', original)
+        call_command('resume_deletion_jobs', job=job.pk, chunk_size=1)
+
+        job.refresh_from_db()
+        assert job.status == DeletionJob.STATUS_DONE
+        assert job.deleted == {'notifications': 7, 'likes': 4, 'comments': 4, 'posts': 3}
+        assert not Post.objects.filter(author=user).exists()
+        assert not Like.objects.exists() and not Comment.objects.exists()
@@ -0,0 +1,114 @@
+# test/test_like_buffer.py
+import pytest
+import json
+from django.core import mail
+from django.test import override_settings
+from apps.notifications.models import Notification
+from apps.posts.like_buffer import get_like_buffer, reset_like_buffer
+from apps.posts.models import Like
+from apps.posts.services import _insert_likes, flush_like_buffer, get_user_stats
+from apps.posts.tasks import flush_likes
+
+
+LIKE_MUTATION = """
+    mutation LikePost($postId: ID!, $like: Boolean) {
+        likePost(postId: $postId, like: $like) { liked post { isLikedByUser } }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def write_behind():
+    reset_like_buffer()
+    with override_settings(LIKE_WRITE_BEHIND=True, LIKE_BUFFER_BACKEND="memory", LIKE_BUFFER_BATCH_SIZE=2):
+        yield get_like_buffer()
+    reset_like_buffer()
+
+
+def like_via_graphql(client, post, like=None):
+    response = client.post(
+        '/graphql/',
+        data=json.dumps({'query': LIKE_MUTATION, 'variables': {'postId': post.id, 'like': like}}),
+        content_type='application/json'
+    )
+    return response.json()['data']['likePost']
+
+
+@pytest.mark.django_db
+class TestWriteBehindLikes:
+    """Test buffered like intents and their batched flush."""
+
+    def test_like_is_buffered_until_flush(self, authenticated_client, write_behind, other_user, post_factory):
+        post = post_factory(author=other_user)
+
+        result = like_via_graphql(authenticated_client, post, like=True)
+
+        # The viewer sees their like immediately, the table is untouched
+        assert result == {'liked': True, 'post': {'isLikedByUser': True}}
+        assert not Like.objects.exists()
+        assert len(write_behind) == 1
+
+        assert flush_like_buffer() == 1
+        assert Like.objects.filter(post=post).count() == 1
+        assert len(write_behind) == 0
+        assert get_user_stats(other_user.id)['total_likes_received'] == 1
+        assert Notification.objects.filter(recipient=other_user, notification_type='like').count() == 1
+
+    def test_flushed_like_sends_email(self, write_behind, user, other_user, post_factory,
+                                      django_capture_on_commit_callbacks):
+        post = post_factory(author=other_user)
+        write_behind.append(user.id, post.id, True)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            flush_like_buffer()
+
+        # Same email the synchronous like sends through create_notification()
+        assert [message.to for message in mail.outbox] == [[other_user.email]]
+
+    def test_toggle_uses_buffered_state(self, authenticated_client, other_user, post_factory):
+        post = post_factory(author=other_user)
+
+        assert like_via_graphql(authenticated_client, post)['liked'] is True
+        assert like_via_graphql(authenticated_client, post)['liked'] is False
+
+        flush_like_buffer()
+        assert not Like.objects.exists()
+
+    def test_intents_are_merged(self, write_behind, user, other_user, post_factory):
+        post = post_factory(author=other_user)
+        Like.objects.create(user=user, post=post)
+
+        write_behind.append(user.id, post.id, False)
+        write_behind.append(other_user.id, post.id, True)
+        write_behind.append(other_user.id, post.id, False)
+        write_behind.append(other_user.id, post.id, True)
+
+        assert flush_likes() == 4
+        assert list(Like.objects.values_list('user_id', flat=True)) == [other_user.id]
+
+    def test_replayed_intents_are_harmless(self, write_behind, user, other_user, post_factory):
+        post = post_factory(author=other_user)
+        Like.objects.create(user=user, post=post)
+        get_user_stats(other_user.id)
+
+        write_behind.append(user.id, post.id, True)
+        flush_like_buffer()
+
+        assert Like.objects.count() == 1
+        assert get_user_stats(other_user.id)['total_likes_received'] == 1
+
+    def test_only_inserted_likes_are_counted(self, user, other_user, post):
+        # e.g. a synchronous like that landed after the flush read the rows
+        Like.objects.create(user=user, post=post)
+
+        assert _insert_likes([(user.id, post.id), (other_user.id, post.id)]) == [(other_user.id, post.id)]
+        assert Like.objects.filter(post=post).count() == 2
+
+    def test_newer_intent_stays_pending(self, write_behind, user, post):
+        write_behind.append(user.id, post.id, True)
+        batch = write_behind.read_batch(10)
+        write_behind.append(user.id, post.id, False)
+
+        write_behind.ack(batch)
+
+        assert write_behind.pending_state(user.id, [post.id]) == {post.id: False}
@@ -0,0 +1,108 @@
+# test/test_likes.py
+import pytest
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.posts.models import Like
+from apps.posts.services import like_post, unlike_post, get_user_stats
+
+
+LIKE_MUTATION = """
+    mutation LikePost($postId: ID!, $like: Boolean) {
+        likePost(postId: $postId, like: $like) {
+            success
+            liked
+            post { likesCount }
+        }
+    }
+"""
+
+
+def like_via_graphql(client, post, like=None):
+    response = client.post(
+        '/graphql/',
+        data=json.dumps({'query': LIKE_MUTATION, 'variables': {'postId': post.id, 'like': like}}),
+        content_type='application/json'
+    )
+    return response.json()['data']['likePost']
+
+
+@pytest.mark.django_db
+class TestLikeServices:
+    """Test idempotent like/unlike."""
+
+    def test_like_is_idempotent(self, post, other_user):
+        assert like_post(post, other_user) is True
+        assert like_post(post, other_user) is False
+
+        assert Like.objects.filter(post=post).count() == 1
+        assert get_user_stats(post.author_id)['total_likes_received'] == 1
+
+    def test_unlike_is_idempotent(self, post, other_user):
+        like_post(post, other_user)
+
+        assert unlike_post(post, other_user) is True
+        assert unlike_post(post, other_user) is False
+        assert get_user_stats(post.author_id)['total_likes_received'] == 0
+
+    def test_repeated_like_is_a_single_statement(self, post, other_user):
+        like_post(post, other_user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            like_post(post, other_user)
+
+        # PostgreSQL counts the post's likes in the same statement
+        assert len(ctx.captured_queries) == (1 if connection.vendor == 'postgresql' else 2)
+        assert post.likes_count == 1
+
+
+@pytest.mark.django_db
+class TestLikeMutation:
+    """Test likePost with an explicit target state."""
+
+    def test_explicit_like_twice_stays_liked(self, authenticated_client, other_user, post_factory):
+        post = post_factory(author=other_user)
+
+        assert like_via_graphql(authenticated_client, post, like=True)['liked'] is True
+        result = like_via_graphql(authenticated_client, post, like=True)
+
+        assert result == {'success': True, 'liked': True, 'post': {'likesCount': 1}}
+
+    def test_explicit_unlike(self, authenticated_client, other_user, post_factory):
+        post = post_factory(author=other_user)
+        like_via_graphql(authenticated_client, post, like=True)
+
+        result = like_via_graphql(authenticated_client, post, like=False)
+
+        assert result['liked'] is False
+        assert result['post']['likesCount'] == 0
+
+    def test_toggle_without_argument(self, authenticated_client, other_user, post_factory):
+        post = post_factory(author=other_user)
+
+        assert like_via_graphql(authenticated_client, post)['liked'] is True
+        assert like_via_graphql(authenticated_client, post)['liked'] is False
+
+    def test_returned_post_needs_no_queries(self, authenticated_client, other_user, post_factory):
+        post = post_factory(author=other_user)
+        get_user_stats(other_user.id)
+        query = """
+            mutation LikePost($postId: ID!) {
+                likePost(postId: $postId, like: true) { post { likesCount isLikedByUser } }
+            }
+        """
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.post(
+                '/graphql/',
+                data=json.dumps({'query': query, 'variables': {'postId': post.id}}),
+                content_type='application/json'
+            )
+
+        assert response.json()['data']['likePost']['post'] == {'likesCount': 1, 'isLikedByUser': True}
+        # No fresh COUNT/EXISTS on the likes table from the post's resolvers
+        orm_reads = [
+            q['sql'] for q in ctx.captured_queries
+            if Like._meta.db_table in q['sql'] and ('"__count"' in q['sql'] or 'SELECT 1 AS "a"' in q['sql'])
+        ]
+        assert orm_reads == []
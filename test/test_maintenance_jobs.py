@@ -0,0 +1,123 @@
+# test/test_maintenance_jobs.py
+import pytest
+from celery.exceptions import Retry
+from celery.schedules import crontab
+from django.core.cache import cache
+from django_celery_beat.models import IntervalSchedule, PeriodicTask
+
+from apps.common.periodic import MANAGED_DESCRIPTION, sync_periodic_tasks
+from apps.notifications.maintenance import dedupe_new, fix_new_types
+from apps.notifications.models import Notification
+from apps.posts.models import Like
+from apps.posts.services import (
+    TRENDING_LOCK_KEY, TRENDING_SCORES_CACHE_KEY, bump_user_stats, get_trending_posts, get_user_stats, update_trending_scores,
+    user_stats_cache_key, warm_user_stats_cache,
+)
+from apps.posts.tasks import update_trending
+
+
+@pytest.mark.django_db
+class TestPeriodicTaskSync:
+    """Test syncing the beat schedule registry into the database."""
+
+    def test_sync_creates_updates_and_removes(self, settings):
+        every_hour = IntervalSchedule.objects.create(every=1, period=IntervalSchedule.HOURS)
+        PeriodicTask.objects.create(name="hand-made", task="x", interval=every_hour)
+        settings.CELERY_BEAT_SCHEDULE = {
+            "job-a": {"task": "apps.posts.tasks.update_trending", "schedule": 60.0},
+            "job-b": {"task": "apps.posts.tasks.update_trending", "schedule": crontab(minute=30), "kwargs": {"full": True}},
+        }
+        sync_periodic_tasks()
+
+        settings.CELERY_BEAT_SCHEDULE = {"job-a": {"task": "apps.posts.tasks.warm_user_stats", "schedule": 60.0}}
+        result = sync_periodic_tasks()
+
+        assert result["removed"] == ["job-b"]
+        job = PeriodicTask.objects.get(name="job-a")
+        assert job.task == "apps.posts.tasks.warm_user_stats" and job.description == MANAGED_DESCRIPTION
+        assert set(PeriodicTask.objects.values_list("name", flat=True)) == {"job-a", "hand-made"}
+
+    def test_registry_syncs(self):
+        result = sync_periodic_tasks()
+
+        assert "dedupe-notifications" in result["synced"]
+        assert PeriodicTask.objects.get(name="rebuild-trending").kwargs == '{"full": true}'
+
+
+@pytest.mark.django_db
+class TestNotificationMaintenance:
+    """Test incremental notification clean-up."""
+
+    def test_fix_types_only_looks_at_new_rows(self, user, other_user, post):
+        old = Notification.objects.create(recipient=user, sender=other_user, notification_type="LIKE", post=post)
+        assert fix_new_types() == 1
+
+        # Rows behind the watermark are not looked at again
+        Notification.objects.filter(pk=old.pk).update(notification_type="LIKE")
+        Notification.objects.create(recipient=user, sender=other_user, notification_type="commented", post=post)
+        assert fix_new_types(chunk_size=1) == 1
+        assert Notification.objects.get(pk=old.pk).notification_type == "LIKE"
+
+    def test_dedupe_keeps_newest(self, user, other_user, post):
+        first = Notification.objects.create(recipient=user, sender=other_user, notification_type="like", post=post)
+        second = Notification.objects.create(recipient=user, sender=other_user, notification_type="like", post=post)
+        Notification.objects.create(recipient=user, sender=other_user, notification_type="follow")
+
+        assert dedupe_new() == 1
+        assert not Notification.objects.filter(pk=first.pk).exists()
+        assert Notification.objects.filter(pk=second.pk).exists()
+        assert dedupe_new() == 0
+
+
+@pytest.mark.django_db
+class TestCachedAggregates:
+    """Test incremental trending scores and user stats cache warming."""
+
+    def test_trending_scores_are_updated_incrementally(self, user, other_user, post_factory):
+        quiet = post_factory(author=user)
+        busy = post_factory(author=user)
+        Like.objects.create(user=other_user, post=quiet)
+        update_trending_scores(full=True)
+
+        Like.objects.create(user=other_user, post=busy)
+        Like.objects.create(user=user, post=busy)
+        assert [p.id for p in get_trending_posts()] == [quiet.id]
+
+        update_trending_scores()
+
+        trending = get_trending_posts()
+        assert [p.id for p in trending] == [busy.id, quiet.id]
+        assert trending[0].likes_count == 2
+
+    def test_incremental_run_skips_while_locked(self, user, other_user, post_factory):
+        Like.objects.create(user=other_user, post=post_factory(author=user))
+        cache.add(TRENDING_LOCK_KEY, "full-run")
+
+        assert update_trending_scores() is None
+        assert get_trending_posts() and cache.get(TRENDING_SCORES_CACHE_KEY) is None
+
+        cache.delete(TRENDING_LOCK_KEY)
+        assert update_trending_scores() == 1
+        assert cache.get(TRENDING_LOCK_KEY) is None
+
+    def test_full_run_retries_while_locked(self):
+        cache.add(TRENDING_LOCK_KEY, "incremental-run")
+
+        with pytest.raises(Retry):
+            update_trending.run(full=True)
+        assert cache.get(TRENDING_SCORES_CACHE_KEY) is None
+
+    def test_warmers_skip_a_per_process_cache(self, settings):
+        settings.CELERY_TASK_ALWAYS_EAGER = False
+
+        assert update_trending.run() == 0
+        assert cache.get(TRENDING_SCORES_CACHE_KEY) is None
+
+    def test_changed_user_stats_are_rewarmed(self, user):
+        get_user_stats(user.id)
+        bump_user_stats(user.id, posts_count=1)
+        assert cache.get(user_stats_cache_key(user.id)) is None
+
+        assert warm_user_stats_cache() >= 1
+
+        assert cache.get(user_stats_cache_key(user.id))["posts_count"] == 1
@@ -0,0 +1,163 @@
+# test/test_media.py
+import io
+import json
+import pytest
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from apps.media.models import Asset
+from apps.media.hashing import dhash, hamming_distance
+from apps.media.processing import InvalidImage
+from apps.media.services import create_image_asset, similar_assets
+from apps.media.storage import reset_media_storage
+
+
+def gradient(width, height):
+    image = Image.new("RGB", (width, height))
+    image.putdata([(x * 255 // width, y * 255 // height, 128) for y in range(height) for x in range(width)])
+    return image
+
+
+def image_upload(width=2000, height=1000, name="photo.png", fmt="PNG", image=None):
+    buffer = io.BytesIO()
+    (image or Image.new("RGB", (width, height), "teal")).save(buffer, fmt)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f"image/{fmt.lower()}")
+
+
+@pytest.fixture(autouse=True)
+def local_media(settings, tmp_path):
+    settings.MEDIA_STORAGE_BACKEND = "apps.media.storage.LocalMediaStorage"
+    settings.MEDIA_ROOT = tmp_path
+    reset_media_storage()
+    yield tmp_path
+    reset_media_storage()
+
+
+@pytest.mark.django_db
+class TestImagePipeline:
+    """Test variant generation and local storage."""
+
+    def test_creates_variants_in_each_format(self, user, local_media):
+        asset = create_image_asset(image_upload(), owner=user)
+
+        assert (asset.width, asset.height) == (2000, 1000)
+        assert asset.variants["thumb"]["w"] == 160
+        assert asset.variants["thumb"]["h"] == 80
+        assert asset.variants["large"]["w"] == 1280
+        for variant in asset.variants.values():
+            assert variant["webp"].endswith(".webp")
+            assert variant["avif"].endswith(".avif")
+        assert asset.original_url.startswith("/media/assets/post/")
+        assert len(list(local_media.rglob("*.webp"))) == 3
+
+    def test_does_not_upscale_small_images(self, user):
+        asset = create_image_asset(image_upload(100, 50), owner=user)
+
+        assert asset.variants["large"]["w"] == 100
+        assert asset.variants["thumb"]["w"] == 100
+
+    def test_rejects_non_images(self, user):
+        with pytest.raises(InvalidImage):
+            create_image_asset(SimpleUploadedFile("x.png", b"not an image"), owner=user)
+        assert not Asset.objects.exists()
+
+    def test_url_and_srcset(self, user):
+        asset = create_image_asset(image_upload(), owner=user)
+
+        assert asset.url("thumb", "avif") == asset.variants["thumb"]["avif"]
+        assert asset.url("missing") == asset.original_url
+        srcset = asset.srcset()
+        assert srcset.startswith(asset.variants["thumb"]["webp"] + " 160w, ")
+        assert srcset.endswith(" 1280w")
+
+
+@pytest.mark.django_db
+class TestUploadDedup:
+    """Test content-addressed reuse of assets."""
+
+    def test_same_file_reuses_asset(self, user, other_user, local_media):
+        first = create_image_asset(image_upload(), owner=user)
+        files = sorted(local_media.rglob("*"))
+
+        second = create_image_asset(image_upload(), owner=other_user, kind=Asset.KIND_PROFILE)
+
+        assert second.pk == first.pk
+        assert Asset.objects.count() == 1
+        assert sorted(local_media.rglob("*")) == files
+        assert len(first.sha256) == 64
+
+    def test_different_file_creates_asset(self, user):
+        first = create_image_asset(image_upload(), owner=user)
+        second = create_image_asset(image_upload(1000, 500), owner=user)
+
+        assert second.pk != first.pk
+
+    def test_perceptual_hash_matches_resized_copy(self, user):
+        picture = gradient(400, 300)
+        original = create_image_asset(image_upload(image=picture), owner=user)
+        resized = create_image_asset(image_upload(image=picture.resize((200, 150)), fmt="JPEG"), owner=user)
+        other = create_image_asset(image_upload(image=gradient(400, 300).transpose(Image.Transpose.ROTATE_180)), owner=user)
+
+        assert original.sha256 != resized.sha256
+        assert hamming_distance(original.phash, resized.phash) <= 6
+        assert similar_assets(original) == [resized]
+        assert hamming_distance(original.phash, other.phash) > 6
+        assert dhash(picture) == original.phash
+
+
+@pytest.mark.django_db
+class TestImageFields:
+    """Test imageUrl/srcset on posts and users."""
+
+    QUERY = """
+        query {
+            posts(limit: 5) {
+                imageUrl
+                thumb: imageUrl(size: THUMB, format: AVIF)
+                srcset
+                author { imageUrl(size: THUMB) cover: imageUrl(kind: COVER) }
+            }
+        }
+    """
+
+    def query(self, client):
+        response = client.post('/graphql/', data=json.dumps({'query': self.QUERY}), content_type='application/json')
+        return response.json()['data']['posts'][0]
+
+    def test_post_image_sizes(self, api_client, user, post_factory):
+        asset = create_image_asset(image_upload(), owner=user)
+        user.profile_image_asset = create_image_asset(image_upload(400, 400), owner=user, kind=Asset.KIND_PROFILE)
+        user.save()
+        post_factory(author=user, image=asset.original_url, image_asset=asset)
+
+        data = self.query(api_client)
+
+        assert data['imageUrl'] == asset.original_url
+        assert data['thumb'] == asset.variants['thumb']['avif']
+        assert data['srcset'] == asset.srcset()
+        assert data['author']['imageUrl'] == user.profile_image_asset.variants['thumb']['webp']
+        assert data['author']['cover'] is None
+
+    def test_legacy_url_without_asset(self, api_client, user, post_factory):
+        post_factory(author=user, image="https://example.com/old.jpg")
+
+        data = self.query(api_client)
+
+        assert data['imageUrl'] == "https://example.com/old.jpg"
+        assert data['thumb'] == "https://example.com/old.jpg"
+        assert data['srcset'] is None
+
+    def test_create_post_with_upload(self, authenticated_client, user):
+        operations = {
+            'query': 'mutation($image: Upload) { createPost(content: "hi", image: $image) { post { imageUrl(size: MEDIUM) } } }',
+            'variables': {'image': None},
+        }
+        response = authenticated_client.post('/graphql/', data={
+            'operations': json.dumps(operations),
+            'map': json.dumps({'0': ['variables.image']}),
+            '0': image_upload(),
+        })
+
+        url = response.json()['data']['createPost']['post']['imageUrl']
+        asset = Asset.objects.get(owner=user)
+        assert url == asset.variants['medium']['webp']
+        assert user.posts.get().image == asset.original_url
@@ -0,0 +1,144 @@
+# test/test_password_hashing.py
+import pytest
+import json
+import threading
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from apps.users import passwords
+from apps.users.passwords import PasswordHashingBusy, hash_password, reset_password_pool, submit
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = 1000
+
+
+LOGIN_MUTATION = """
+    mutation Login($username: String!, $password: String!) {
+        login(username: $username, password: $password) { token }
+    }
+"""
+
+
+def login(client, username, password, **extra):
+    response = client.post(
+        '/graphql/',
+        data=json.dumps({'query': LOGIN_MUTATION, 'variables': {'username': username, 'password': password}}),
+        content_type='application/json',
+        **extra
+    )
+    return response.json()
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(settings):
+    reset_password_pool()
+    settings.LOGIN_FAILURE_THRESHOLD = 3
+    yield
+    reset_password_pool()
+
+
+class TestHashingPool:
+    """Test the bounded hashing pool."""
+
+    def test_hashes_on_pool_threads(self):
+        thread_names = []
+        submit(lambda: thread_names.append(threading.current_thread().name)).result()
+
+        assert thread_names[0].startswith("password-hash")
+        assert hash_password("secret").startswith("md5$")
+
+    def test_full_queue_fails_fast(self, settings):
+        settings.PASSWORD_HASH_WORKERS = 2
+        settings.PASSWORD_HASH_CONCURRENCY = 1
+        release = threading.Event()
+        blocked = submit(release.wait)
+
+        with pytest.raises(PasswordHashingBusy):
+            hash_password("secret")
+
+        release.set()
+        blocked.result()
+        assert hash_password("secret")
+
+    def test_inline_hashing_shares_the_slots(self, settings):
+        settings.PASSWORD_HASH_WORKERS = 0
+        settings.PASSWORD_HASH_CONCURRENCY = 1
+        _, slots = passwords._get_pool()
+        token = slots.acquire()
+
+        with pytest.raises(PasswordHashingBusy):
+            hash_password("secret")
+
+        slots.release(token)
+        assert hash_password("secret")
+
+    def test_timeout_is_reported_as_busy(self, settings):
+        settings.PASSWORD_HASH_TIMEOUT = 0.01
+        release = threading.Event()
+
+        with pytest.raises(PasswordHashingBusy):
+            passwords.run_hashing(release.wait)
+        release.set()
+
+
+@pytest.mark.django_db
+class TestLoginBackoff:
+    """Test failed-login lockout by username and IP."""
+
+    def test_username_locked_after_failures(self, api_client, user, monkeypatch):
+        for _ in range(3):
+            assert login(api_client, "testuser", "wrong")['errors'][0]['message'] == "Invalid credentials"
+
+        checks = []
+        monkeypatch.setattr(passwords, "check_password", lambda *args: checks.append(args) or True)
+        error = login(api_client, "testuser", "testpass123")['errors'][0]
+
+        assert error['extensions']['code'] == 'LOGIN_THROTTLED'
+        assert error['extensions']['retryAfter'] >= 1
+        assert checks == []
+
+    def test_success_resets_username_failures(self, api_client, user):
+        login(api_client, "testuser", "wrong")
+        login(api_client, "testuser", "wrong")
+        assert 'errors' not in login(api_client, "testuser", "testpass123")
+
+        login(api_client, "testuser", "wrong")
+        assert 'errors' not in login(api_client, "testuser", "testpass123")
+
+    def test_ip_locked_across_usernames(self, api_client, user, settings):
+        settings.LOGIN_IP_FAILURE_THRESHOLD = 4
+        for n in range(4):
+            login(api_client, f"nobody{n}", "guess")
+
+        assert login(api_client, "testuser", "testpass123")['errors'][0]['extensions']['code'] == 'LOGIN_THROTTLED'
+        assert 'errors' not in login(api_client, "testuser", "testpass123", REMOTE_ADDR='10.0.0.9')
+
+
+@pytest.mark.django_db
+class TestHashUpgrade:
+    """Test that stale hashes are upgraded after login."""
+
+    def test_upgrade_after_login(self, api_client, user, settings):
+        settings.PASSWORD_HASHERS = [
+            "test.test_password_hashing.FastPBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+        # Pool threads use their own DB connection, outside the test transaction
+        settings.PASSWORD_HASH_WORKERS = 0
+        user.password = make_password("testpass123", hasher="md5")
+        user.save()
+
+        assert 'errors' not in login(api_client, "testuser", "testpass123")
+
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$1000$")
+        assert user.check_password("testpass123")
+
+    def test_signup_hashes_on_pool(self, api_client):
+        response = api_client.post(
+            '/graphql/',
+            data=json.dumps({'query': 'mutation { signup(username: "New", email: "New@EXAMPLE.com", password: "pw12345!") { user { email } } }'}),
+            content_type='application/json',
+        ).json()
+
+        assert response['data']['signup']['user']['email'] == "New@example.com"
+        assert 'errors' not in login(api_client, "New", "pw12345!")
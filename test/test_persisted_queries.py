@@ -0,0 +1,96 @@
+# test/test_persisted_queries.py
+import pytest
+import json
+from django.test import override_settings
+from apps.common import persisted_queries
+from apps.common.persisted_queries import document_cache, query_hash
+
+QUERY = "query Me { me { username } }"
+
+
+def apq_extensions(query):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}}
+
+
+@pytest.fixture(autouse=True)
+def reset_stores():
+    document_cache.clear()
+    persisted_queries.reset_manifest()
+    yield
+    persisted_queries.reset_manifest()
+
+
+@pytest.mark.django_db
+class TestAutomaticPersistedQueries:
+    """Test the APQ register / lookup flow."""
+
+    def test_unknown_hash_not_found(self, authenticated_client, graphql):
+        data = graphql(authenticated_client, extensions=apq_extensions(QUERY))
+        assert data['errors'][0]['message'] == 'PersistedQueryNotFound'
+
+    def test_register_then_hash_only(self, authenticated_client, user, graphql):
+        data = graphql(authenticated_client, query=QUERY, extensions=apq_extensions(QUERY))
+        assert 'errors' not in data
+        assert data['data']['me']['username'] == user.username
+
+        data = graphql(authenticated_client, extensions=apq_extensions(QUERY))
+        assert 'errors' not in data
+        assert data['data']['me']['username'] == user.username
+
+    def test_hash_mismatch_rejected(self, authenticated_client, graphql):
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": "0" * 64}}
+        data = graphql(authenticated_client, query=QUERY, extensions=extensions)
+        assert 'does not match' in data['errors'][0]['message']
+
+    def test_get_request_with_hash(self, authenticated_client, user, graphql):
+        graphql(authenticated_client, query=QUERY, extensions=apq_extensions(QUERY))
+
+        response = authenticated_client.get(
+            '/graphql/',
+            {'extensions': json.dumps(apq_extensions(QUERY))},
+            HTTP_ACCEPT='application/json',
+        )
+        data = response.json()
+        assert data['data']['me']['username'] == user.username
+
+
+@pytest.mark.django_db
+class TestDocumentCache:
+    """Test reuse of parsed and validated documents."""
+
+    def test_repeated_query_hits_cache(self, authenticated_client, graphql):
+        graphql(authenticated_client, query=QUERY)
+        graphql(authenticated_client, query=QUERY)
+
+        assert document_cache.misses == 1
+        assert document_cache.hits == 1
+
+    def test_validation_errors_are_cached(self, authenticated_client, graphql):
+        bad_query = "query { me { notAField } }"
+        first = graphql(authenticated_client, query=bad_query)
+        second = graphql(authenticated_client, query=bad_query)
+
+        assert first['errors'] == second['errors']
+        assert document_cache.hits == 1
+
+
+@pytest.mark.django_db
+class TestAllowlistMode:
+    """Test production allowlist mode."""
+
+    @pytest.fixture
+    def manifest(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({query_hash(QUERY): QUERY}))
+        return str(path)
+
+    def test_listed_query_runs_by_hash(self, authenticated_client, user, manifest, graphql):
+        with override_settings(GRAPHQL_PERSISTED_QUERIES={"ALLOWLIST_ONLY": True, "MANIFEST": manifest}):
+            data = graphql(authenticated_client, extensions=apq_extensions(QUERY))
+        assert data['data']['me']['username'] == user.username
+
+    def test_unlisted_query_rejected(self, authenticated_client, manifest, graphql):
+        other = "query { users { id } }"
+        with override_settings(GRAPHQL_PERSISTED_QUERIES={"ALLOWLIST_ONLY": True, "MANIFEST": manifest}):
+            data = graphql(authenticated_client, query=other, extensions=apq_extensions(other))
+        assert data['errors'][0]['message'] == 'PersistedQueryNotAllowed'
@@ -0,0 +1,77 @@
+# test/test_post_planner.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.posts.models import Like
+
+
+def post_queries(ctx):
+    return [q['sql'] for q in ctx.captured_queries if 'posts_post' in q['sql']]
+
+
+@pytest.mark.django_db
+class TestPostPlanner:
+    """post(id) and postsByIds fetch exactly what the query selects."""
+
+    def test_plain_fields_need_no_joins(self, api_client, post, graphql):
+        with CaptureQueriesContext(connection) as ctx:
+            result = graphql(api_client, 'query($id: ID!) { post(id: $id) { id content } }', {'id': post.id})
+
+        assert result['data']['post']['content'] == post.content
+        [sql] = post_queries(ctx)
+        assert 'JOIN' not in sql and 'posts_like' not in sql and 'posts_comment' not in sql
+
+    def test_everything_in_one_query(self, authenticated_client, user, other_user, post_factory, comment_factory, graphql):
+        post = post_factory(author=other_user)
+        Like.objects.create(user=user, post=post)
+        Like.objects.create(user=other_user, post=post)
+        comment_factory(post=post, author=user)
+        query = """
+            query($id: ID!) {
+                post(id: $id) { ...Engagement author { username imageUrl } }
+            }
+            fragment Engagement on PostType { likesCount commentsCount isLikedByUser imageUrl }
+        """
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = graphql(authenticated_client, query, {'id': post.id})
+
+        data = result['data']['post']
+        assert data['likesCount'] == 2 and data['commentsCount'] == 1 and data['isLikedByUser'] is True
+        assert data['author']['username'] == other_user.username
+        # Besides the JWT user lookup
+        assert len([q for q in ctx.captured_queries if 'posts_' in q['sql']]) == 1
+
+    def test_missing_post(self, api_client, graphql):
+        result = graphql(api_client, '{ post(id: 999999) { id } }')
+
+        assert result['errors']
+        assert result['data']['post'] is None
+
+    def test_posts_by_ids_skips_unselected_counts(self, api_client, user, post_factory, graphql):
+        posts = [post_factory(author=user) for _ in range(3)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = graphql(
+                api_client, 'query($ids: [ID!]!) { postsByIds(ids: $ids) { id likesCount } }',
+                {'ids': [p.id for p in posts]},
+            )
+
+        assert [p['likesCount'] for p in result['data']['postsByIds']] == [0, 0, 0]
+        [sql] = post_queries(ctx)
+        assert 'posts_like' in sql and 'posts_comment' not in sql
+
+    def test_feed_ranks_without_prefetching(self, authenticated_client, user, other_user, post_factory, follow_factory, graphql):
+        follow_factory(follower=user, followed=other_user)
+        quiet = post_factory(author=other_user, content="quiet")
+        liked = post_factory(author=other_user, content="liked")
+        for liker in (user, other_user):
+            Like.objects.create(user=liker, post=liked)
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = graphql(authenticated_client, '{ feed(limit: 10) { id likesCount isLikedByUser } }')
+
+        feed = result['data']['feed']
+        assert [p['id'] for p in feed] == [str(liked.id), str(quiet.id)]
+        assert feed[0]['likesCount'] == 2 and feed[0]['isLikedByUser'] is True
+        assert len([q for q in ctx.captured_queries if 'posts_' in q['sql']]) == 1
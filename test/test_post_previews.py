@@ -0,0 +1,68 @@
+# test/test_post_previews.py
+import pytest
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.posts.services import like_post, create_comment
+
+
+PREVIEW_QUERY = """
+    query Posts($limit: Int) {
+        posts(limit: $limit) {
+            id
+            likesCount
+            recentLikes(limit: 2) { user { username } }
+            recentComments { content author { username } }
+        }
+    }
+"""
+
+
+def fetch_previews(client, limit=20):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(
+            '/graphql/',
+            data=json.dumps({'query': PREVIEW_QUERY, 'variables': {'limit': limit}}),
+            content_type='application/json'
+        )
+    return response.json()['data']['posts'], len(queries)
+
+
+@pytest.fixture
+def engaged_posts(user_factory, post_factory):
+    """Five posts, each liked by three users and commented on four times."""
+    fans = [user_factory(username=f"fan{i}", email=f"fan{i}@example.com") for i in range(3)]
+    posts = [post_factory(author=fans[0], content=f"post {i}") for i in range(5)]
+    for post in posts:
+        for fan in fans:
+            like_post(post, fan)
+        for n in range(4):
+            create_comment(post, fans[n % 3], f"comment {n} on {post.content}")
+    return posts
+
+
+@pytest.mark.django_db
+class TestPostPreviews:
+    """Test batched recentLikes/recentComments."""
+
+    def test_previews_are_newest_first_and_limited(self, api_client, engaged_posts):
+        posts, _ = fetch_previews(api_client)
+
+        post = next(p for p in posts if p['id'] == str(engaged_posts[0].pk))
+        assert post['likesCount'] == 3
+        assert [like['user']['username'] for like in post['recentLikes']] == ['fan2', 'fan1']
+        assert [c['content'] for c in post['recentComments']] == [
+            'comment 3 on post 0', 'comment 2 on post 0', 'comment 1 on post 0',
+        ]
+
+    def test_query_count_does_not_grow_with_page_size(self, api_client, engaged_posts):
+        _, two_posts = fetch_previews(api_client, limit=2)
+        _, five_posts = fetch_previews(api_client, limit=5)
+
+        assert five_posts == two_posts
+
+    def test_posts_without_engagement(self, api_client, post):
+        posts, _ = fetch_previews(api_client)
+
+        assert posts[0]['recentLikes'] == []
+        assert posts[0]['recentComments'] == []
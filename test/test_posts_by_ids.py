@@ -0,0 +1,61 @@
+# test/test_posts_by_ids.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.posts.models import Like
+
+POSTS_BY_IDS = """
+    query PostsByIds($ids: [ID!]!) {
+        postsByIds(ids: $ids) {
+            id content likesCount commentsCount isLikedByUser
+            author { username }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+class TestPostsByIds:
+    """Test batch post retrieval."""
+
+    def test_keeps_order_and_returns_null_for_missing(self, api_client, user, post_factory, graphql):
+        first = post_factory(author=user, content="first")
+        second = post_factory(author=user, content="second")
+
+        result = graphql(api_client, POSTS_BY_IDS, {'ids': [second.id, 999999, first.id]})
+
+        posts = result['data']['postsByIds']
+        assert [p and p['content'] for p in posts] == ['second', None, 'first']
+
+    def test_single_query_with_counts(self, authenticated_client, user, other_user, post_factory, comment_factory, graphql):
+        posts = [post_factory(author=other_user, content=f"post {i}") for i in range(5)]
+        Like.objects.create(user=user, post=posts[0])
+        comment_factory(post=posts[1], author=user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = graphql(authenticated_client, POSTS_BY_IDS, {'ids': [p.id for p in posts]})
+
+        data = result['data']['postsByIds']
+        assert data[0]['likesCount'] == 1 and data[0]['isLikedByUser'] is True
+        assert data[1]['commentsCount'] == 1 and data[1]['isLikedByUser'] is False
+        post_queries = [q for q in ctx.captured_queries if 'posts_post' in q['sql']]
+        assert len(post_queries) == 1
+
+    def test_repeated_ids_are_free(self, api_client, user, post, graphql):
+        query = """
+            query Repeated($ids: [ID!]!, $more: [ID!]!) {
+                a: postsByIds(ids: $ids) { id }
+                b: postsByIds(ids: $more) { id }
+            }
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            result = graphql(api_client, query, {'ids': [post.id, post.id], 'more': [post.id]})
+
+        assert result['data']['a'] == [{'id': str(post.id)}] * 2
+        assert result['data']['b'] == [{'id': str(post.id)}]
+        assert len([q for q in ctx.captured_queries if 'posts_post' in q['sql']]) == 1
+
+    def test_too_many_ids(self, api_client, graphql):
+        result = graphql(api_client, POSTS_BY_IDS, {'ids': list(range(101))})
+
+        assert 'at most 100 ids' in result['errors'][0]['message']
@@ -0,0 +1,78 @@
+# test/test_query_cost.py
+import pytest
+from django.test import override_settings
+from apps.posts.services import like_post
+
+
+@pytest.mark.django_db
+class TestQueryCost:
+    """Test query cost estimation and limits."""
+
+    def test_cost_reported_in_extensions(self, authenticated_client, graphql):
+        data = graphql(authenticated_client, "query { posts(limit: 10) { id content } }")
+        assert 'errors' not in data
+        # posts (1) + 10 posts of scalars (at least 1 each)
+        assert data['extensions']['cost']['requestedQueryCost'] == 11
+        assert data['extensions']['cost']['depth'] == 2
+
+    def test_huge_limit_is_capped(self, authenticated_client, graphql):
+        data = graphql(authenticated_client, "query { posts(limit: 1000000) { id content } }")
+        # posts (1) + MAX_LIST_SIZE (100) posts: the resolver returns no more
+        assert data['extensions']['cost']['requestedQueryCost'] == 101
+
+    def test_nested_list_takes_page_size(self, authenticated_client, post, graphql):
+        data = graphql(
+            authenticated_client,
+            "query { commentThread(postId: %d, first: 5) { comments { content } } }" % post.pk,
+        )
+        # commentThread (1) + comments (1) + 5 comments
+        assert data['extensions']['cost']['requestedQueryCost'] == 7
+
+    def test_list_limit_multiplies_nested_cost(self, authenticated_client, graphql):
+        query = """
+            query Posts($limit: Int) {
+                posts(limit: $limit) { id likesCount author { username } }
+            }
+        """
+        data = graphql(authenticated_client, query, {"limit": 10})
+        # posts (1) + 10 * (likesCount (1) + author (1))
+        assert data['extensions']['cost']['requestedQueryCost'] == 21
+
+    def test_unbounded_list_uses_default_size(self, authenticated_client, graphql):
+        data = graphql(authenticated_client, "query { users { id postsCount } }")
+        # users (1) + DEFAULT_LIST_SIZE (100) * postsCount (1)
+        assert data['extensions']['cost']['requestedQueryCost'] == 101
+
+    def test_fragments_are_counted(self, authenticated_client, graphql):
+        query = """
+            query { posts(limit: 5) { ...PostFields } }
+            fragment PostFields on PostType { likesCount commentsCount }
+        """
+        data = graphql(authenticated_client, query)
+        assert data['extensions']['cost']['requestedQueryCost'] == 11
+
+    @override_settings(GRAPHQL_QUERY_COST={"MAX_COST": 50})
+    def test_expensive_query_rejected(self, authenticated_client, graphql):
+        query = "query { likes(postId: 1) { id user { username } } }"
+        data = graphql(authenticated_client, query)
+        assert data['errors'][0]['extensions']['code'] == 'QUERY_TOO_COMPLEX'
+        assert data.get('data') is None
+
+    @override_settings(GRAPHQL_QUERY_COST={"MAX_DEPTH": 3})
+    def test_deep_query_rejected(self, authenticated_client, graphql):
+        query = "query { likes(postId: 1, limit: 1) { post { author { username } } } }"
+        data = graphql(authenticated_client, query)
+        assert data['errors'][0]['extensions']['code'] == 'QUERY_TOO_DEEP'
+
+    @override_settings(GRAPHQL_QUERY_COST={"MAX_LIST_SIZE": 1})
+    def test_unbounded_lists_return_at_most_max_size(self, authenticated_client, user, other_user, post, graphql):
+        like_post(post, user)
+        like_post(post, other_user)
+
+        data = graphql(authenticated_client, "query { likes(postId: %d) { id } users { id } }" % post.pk)
+        assert len(data['data']['likes']) == 1
+        assert len(data['data']['users']) == 1
+
+    def test_users_limit(self, authenticated_client, user, other_user, graphql):
+        data = graphql(authenticated_client, "query { users(limit: 1) { id } }")
+        assert len(data['data']['users']) == 1
@@ -0,0 +1,116 @@
+# test/test_rate_limit.py
+import pytest
+import json
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import RequestFactory
+from apps.common.async_views import AsyncAuthenticatedGraphQLView
+from apps.common.rate_limit import MemoryRateLimiter, client_ip
+
+
+LIKE_MUTATION = 'mutation Like($postId: ID!) { likePost(postId: $postId, like: true) { success } }'
+SEARCH_QUERY = '{ search(q: "hello") { posts { id } } }'
+
+
+def graphql_response(client, query, variables=None, **extra):
+    return client.post(
+        '/graphql/',
+        data=json.dumps({'query': query, 'variables': variables or {}}),
+        content_type='application/json',
+        **extra
+    )
+
+
+@pytest.fixture(autouse=True)
+def tight_limits(settings):
+    settings.RATE_LIMIT_ENABLED = True
+    settings.RATE_LIMIT_BACKEND = "memory"
+    settings.RATE_LIMIT_IP_MULTIPLIER = 2
+    settings.GRAPHQL_RATE_LIMITS = {"likePost": (2, 1), "search": (1, 60)}
+
+
+class TestTokenBucket:
+    """Test the in-memory token bucket."""
+
+    def test_burst_then_refill(self):
+        limiter = MemoryRateLimiter()
+        bucket = [("k", 2, 1.0)]
+
+        assert limiter.hit(bucket, now=0).allowed
+        assert limiter.hit(bucket, now=0).remaining == 0
+        denied = limiter.hit(bucket, now=0.5)
+        assert not denied.allowed
+        assert denied.retry_after == pytest.approx(0.5)
+        assert limiter.hit(bucket, now=1.0).allowed
+
+    def test_denied_call_charges_no_bucket(self):
+        limiter = MemoryRateLimiter()
+        limiter.hit([("user", 1, 1.0)], now=0)
+
+        assert not limiter.hit([("user", 1, 1.0), ("ip", 10, 1.0)], now=0).allowed
+        assert limiter.hit([("ip", 10, 1.0)], now=0).remaining == 9
+
+
+class TestClientIp:
+    """Test which address per-IP buckets are keyed on."""
+
+    def request(self, forwarded):
+        return RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=forwarded)
+
+    def test_ignores_forwarded_for_without_trusted_proxies(self, settings):
+        settings.TRUSTED_PROXY_COUNT = 0
+
+        assert client_ip(self.request('1.2.3.4')) == '10.0.0.1'
+
+    def test_takes_address_added_by_trusted_proxy(self, settings):
+        settings.TRUSTED_PROXY_COUNT = 1
+
+        # The client sent "X-Forwarded-For: 6.6.6.6"; the proxy appended 1.2.3.4
+        assert client_ip(self.request('6.6.6.6, 1.2.3.4')) == '1.2.3.4'
+
+    def test_counts_hops_from_the_right(self, settings):
+        settings.TRUSTED_PROXY_COUNT = 2
+
+        assert client_ip(self.request('6.6.6.6, 1.2.3.4, 172.16.0.9')) == '1.2.3.4'
+        assert client_ip(self.request('1.2.3.4')) == '1.2.3.4'
+
+
+@pytest.mark.django_db
+class TestRateLimitMiddleware:
+    """Test per-operation budgets on GraphQL root fields."""
+
+    def test_mutation_is_limited_per_user(self, authenticated_client, post):
+        responses = [graphql_response(authenticated_client, LIKE_MUTATION, {'postId': post.pk}) for _ in range(3)]
+
+        assert [r['X-RateLimit-Remaining'] for r in responses] == ['1', '0', '0']
+        assert responses[0]['X-RateLimit-Limit'] == '2'
+        assert 'errors' not in responses[1].json()
+        error = responses[2].json()['errors'][0]
+        assert error['extensions']['code'] == 'RATE_LIMITED'
+        assert responses[2]['Retry-After'] == '60'
+
+    def test_anonymous_clients_are_limited_per_ip(self, api_client):
+        assert 'errors' not in graphql_response(api_client, SEARCH_QUERY).json()
+        cache.clear()
+        limited = graphql_response(api_client, SEARCH_QUERY).json()
+        other_ip = graphql_response(api_client, SEARCH_QUERY, REMOTE_ADDR='10.0.0.2').json()
+
+        assert limited['errors'][0]['extensions']['code'] == 'RATE_LIMITED'
+        assert 'errors' not in other_ip
+
+    def test_unlimited_fields_have_no_headers(self, api_client, post):
+        response = graphql_response(api_client, '{ posts { id } }')
+
+        assert 'X-RateLimit-Limit' not in response
+
+    def test_async_view_limits_async_resolvers(self, rf):
+        view = AsyncAuthenticatedGraphQLView.as_view()
+
+        def search():
+            request = rf.post('/graphql/', data=json.dumps({'query': SEARCH_QUERY}), content_type='application/json')
+            cache.clear()
+            return async_to_sync(view)(request)
+
+        assert search()['X-RateLimit-Remaining'] == '0'
+        response = search()
+        assert json.loads(response.content)['errors'][0]['extensions']['code'] == 'RATE_LIMITED'
@@ -0,0 +1,84 @@
+# test/test_response_cache.py
+import pytest
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.posts.services import toggle_like
+
+POSTS_QUERY = "query { posts(limit: 10) { id content } }"
+POST_QUERY = "query Post($id: ID!) { post(id: $id) { id likesCount } }"
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Test caching of anonymous public queries."""
+
+    def test_anonymous_query_served_from_cache(self, api_client, post, graphql):
+        first = graphql(api_client, POSTS_QUERY)
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = graphql(api_client, POSTS_QUERY)
+
+        assert first['data'] == second['data']
+        assert len(ctx.captured_queries) == 0
+
+    def test_authenticated_query_not_cached(self, authenticated_client, post, graphql):
+        graphql(authenticated_client, POSTS_QUERY)
+
+        with CaptureQueriesContext(connection) as ctx:
+            graphql(authenticated_client, POSTS_QUERY)
+
+        assert len(ctx.captured_queries) > 0
+
+    def test_new_post_invalidates_lists(self, api_client, user, post, post_factory, graphql):
+        graphql(api_client, POSTS_QUERY)
+        post_factory(author=user, content="Fresh post")
+
+        data = graphql(api_client, POSTS_QUERY)
+        assert len(data['data']['posts']) == 2
+
+    def test_like_invalidates_single_post(self, api_client, post, other_user, graphql):
+        variables = {"id": str(post.id)}
+        assert graphql(api_client, POST_QUERY, variables)['data']['post']['likesCount'] == 0
+
+        toggle_like(post, other_user)
+
+        assert graphql(api_client, POST_QUERY, variables)['data']['post']['likesCount'] == 1
+
+    def test_private_fields_not_cached(self, api_client, graphql):
+        data = graphql(api_client, "query { posts(limit: 1) { id } me { id } }")
+        assert 'errors' not in data
+
+        with CaptureQueriesContext(connection) as ctx:
+            graphql(api_client, "query { posts(limit: 1) { id } me { id } }")
+        assert len(ctx.captured_queries) > 0
+
+
+@pytest.mark.django_db
+class TestHttpCaching:
+    """Test Cache-Control / ETag handling for GET requests."""
+
+    def get_graphql(self, client, **headers):
+        return client.get('/graphql/', {'query': POSTS_QUERY}, HTTP_ACCEPT='application/json', **headers)
+
+    def test_get_sets_cache_headers(self, api_client, post):
+        response = self.get_graphql(api_client)
+
+        assert response.status_code == 200
+        assert 'public' in response['Cache-Control']
+        assert 'max-age=30' in response['Cache-Control']
+        assert response.has_header('ETag')
+
+    def test_if_none_match_returns_304(self, api_client, post):
+        etag = self.get_graphql(api_client)['ETag']
+
+        response = self.get_graphql(api_client, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_post_requests_have_no_cache_headers(self, api_client, post):
+        response = api_client.post(
+            '/graphql/',
+            data=json.dumps({'query': POSTS_QUERY}),
+            content_type='application/json'
+        )
+        assert not response.has_header('ETag')
@@ -0,0 +1,47 @@
+# test/test_startup.py
+import pytest
+from django.db import DatabaseError
+from django.test import override_settings
+
+from social_media_feed import middleware, startup
+
+
+class TestReadiness:
+    """Test the /ready/ probe and warm_up()."""
+
+    @pytest.mark.django_db
+    def test_ready_while_database_answers(self, client):
+        response = client.get('/ready/')
+
+        assert response.status_code == 200
+        assert response.json() == {'status': 'ready'}
+
+    def test_unavailable_without_database(self, client, monkeypatch):
+        def unreachable():
+            raise DatabaseError("connection refused")
+        monkeypatch.setattr(middleware.connection, "cursor", unreachable)
+
+        response = client.get('/ready/')
+
+        assert response.status_code == 503
+        assert response.json() == {'status': 'unavailable'}
+
+    @pytest.mark.django_db
+    def test_warm_up_skips_migrations_by_default(self, monkeypatch):
+        migrations = []
+        monkeypatch.setattr(startup, "run_migrations", lambda: migrations.append(True))
+
+        startup.warm_up()
+
+        # Migrations are a deploy step unless explicitly enabled
+        assert migrations == []
+
+    @pytest.mark.django_db
+    def test_migrates_on_boot_when_enabled(self, monkeypatch):
+        migrations = []
+        monkeypatch.setattr(startup, "run_migrations", lambda: migrations.append(True))
+
+        with override_settings(RUN_MIGRATIONS_ON_BOOT=True):
+            startup.warm_up()
+
+        assert migrations == [True]
@@ -0,0 +1,37 @@
+# test/test_synthetic_data.py
+import pytest
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from apps.follows.models import Follow
+from apps.posts.models import Post, Like, UserStats
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestGenerateSocialGraph:
+    """Test the synthetic social graph generator."""
+
+    def test_generates_graph(self):
+        call_command(
+            'generate_social_graph', users=50, posts_per_user=2, likes_per_post=3,
+            comments_per_post=1, follows_per_user=10, prefix='gen', seed=1
+        )
+
+        users = User.objects.filter(username__startswith='gen_')
+        assert users.count() == 50
+        assert Post.objects.filter(author__in=users).count() == 100
+        assert Like.objects.exists()
+        assert not Follow.objects.filter(follower_id=F('followed_id')).exists()
+
+    def test_follower_distribution_is_skewed(self):
+        call_command('generate_social_graph', users=200, posts_per_user=1, prefix='gen', seed=1)
+
+        counts = sorted(
+            UserStats.objects.filter(user__username__startswith='gen_')
+            .values_list('followers_count', flat=True),
+            reverse=True,
+        )
+        # The most followed user has far more followers than the median user
+        assert counts[0] > 5 * max(counts[len(counts) // 2], 1)
@@ -0,0 +1,137 @@
+# test/test_token_blacklist.py
+import pytest
+import uuid
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.users import token_blacklist
+from apps.users.tasks import purge_expired_tokens
+from apps.users.token_blacklist import (
+    BloomFilter, CachedBlacklistRefreshToken, is_blacklisted, reset_blacklist_index,
+)
+
+
+REFRESH_MUTATION = """
+    mutation Refresh($token: String!) {
+        refreshToken(refreshToken: $token) { token refreshToken }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    reset_blacklist_index()
+    yield
+    reset_blacklist_index()
+
+
+class TestBloomFilter:
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(capacity=1000)
+        members = [uuid.uuid4().hex for _ in range(1000)]
+        for member in members:
+            bloom.add(member)
+
+        assert all(member in bloom for member in members)
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(2000))
+        assert false_positives < 100
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """Treat the test LocMemCache as if it were shared by all processes."""
+    monkeypatch.setattr(token_blacklist, "cache_is_shared", lambda: True)
+
+
+@pytest.mark.django_db
+class TestTokenBlacklist:
+    """Test cached blacklist checks, rotation and logout."""
+
+    def test_rotation_blacklists_old_token(self, api_client, user, graphql):
+        old = str(CachedBlacklistRefreshToken.for_user(user))
+
+        rotated = graphql(api_client, REFRESH_MUTATION, {'token': old})['data']['refreshToken']
+        again = graphql(api_client, REFRESH_MUTATION, {'token': old})
+
+        assert rotated['refreshToken'] != old
+        assert 'blacklisted' in again['errors'][0]['message']
+        assert 'errors' not in graphql(api_client, REFRESH_MUTATION, {'token': rotated['refreshToken']})
+
+    def test_unknown_jti_needs_no_query(self, user, shared_cache):
+        CachedBlacklistRefreshToken.for_user(user).blacklist()
+        is_blacklisted("warm-up")
+
+        with CaptureQueriesContext(connection) as queries:
+            assert is_blacklisted(uuid.uuid4().hex) is False
+        assert len(queries) == 0
+
+    def test_blacklisted_found_without_cache(self, user, shared_cache):
+        token = CachedBlacklistRefreshToken.for_user(user)
+        token.blacklist()
+        jti = token.payload['jti']
+        assert is_blacklisted(jti)
+
+        # Another process: no cache key, filter rebuilt from the database
+        cache.clear()
+        reset_blacklist_index()
+        assert is_blacklisted(jti)
+
+    def test_per_process_cache_checks_database(self, user):
+        token = CachedBlacklistRefreshToken.for_user(user)
+        jti = token.payload['jti']
+        # Filter built before another worker blacklists the token; this
+        # process never sees that worker's cache key
+        assert is_blacklisted(jti) is False
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=jti))
+
+        assert is_blacklisted(jti)
+
+    def test_logout(self, api_client, user, graphql):
+        refresh = str(CachedBlacklistRefreshToken.for_user(user))
+
+        result = graphql(
+            api_client,
+            'mutation Logout($token: String!) { logout(refreshToken: $token) { success } }',
+            {'token': refresh},
+        )
+
+        assert result['data']['logout']['success'] is True
+        assert 'errors' in graphql(api_client, REFRESH_MUTATION, {'token': refresh})
+
+
+@pytest.mark.django_db
+class TestTokenPurge:
+    """Test the chunked purge of expired tokens."""
+
+    def make_tokens(self, user, count, expires_at, blacklist=False):
+        for n in range(count):
+            token = OutstandingToken.objects.create(
+                user=user, jti=uuid.uuid4().hex, token=f"t{n}", expires_at=expires_at,
+            )
+            if blacklist:
+                BlacklistedToken.objects.create(token=token)
+
+    def test_purges_only_expired_tokens(self, user, settings):
+        settings.TOKEN_PURGE_CHUNK_SIZE = 2
+        past = timezone.now() - timedelta(days=1)
+        self.make_tokens(user, 3, past, blacklist=True)
+        self.make_tokens(user, 2, past)
+        self.make_tokens(user, 1, timezone.now() + timedelta(days=1), blacklist=True)
+
+        result = purge_expired_tokens.delay().get()
+
+        assert result['deleted'] == 5
+        assert result['before'] == {'outstanding': 6, 'blacklisted': 4}
+        assert result['after'] == {'outstanding': 1, 'blacklisted': 1}
+
+    def test_command(self, user, capsys):
+        self.make_tokens(user, 2, timezone.now() - timedelta(days=1))
+
+        call_command('purge_expired_tokens', '--chunk-size', '1')
+
+        assert 'Purged 2 expired tokens' in capsys.readouterr().out
+        assert not OutstandingToken.objects.exists()
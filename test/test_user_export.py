@@ -0,0 +1,73 @@
+# test/test_user_export.py
+import pytest
+import csv
+import io
+import json
+from django.core.management import call_command
+from apps.posts.models import Like
+from apps.users.tasks import export_user_data
+
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.fixture
+def user_data(user, other_user, post_factory, comment_factory, follow_factory):
+    post = post_factory(author=user, content="my post")
+    theirs = post_factory(author=other_user, content="their post")
+    comment_factory(post=theirs, author=user, content="nice")
+    Like.objects.create(user=user, post=theirs)
+    follow_factory(follower=user, followed=other_user)
+    follow_factory(follower=other_user, followed=user)
+    return post
+
+
+@pytest.mark.django_db
+class TestExportEndpoint:
+    """Test the streaming /users/me/export/ endpoint."""
+
+    def test_requires_authentication(self, api_client):
+        assert api_client.get('/users/me/export/').status_code == 401
+
+    def test_ndjson_export(self, authenticated_client, user_data):
+        response = authenticated_client.get('/users/me/export/')
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        records = [json.loads(line) for line in read_stream(response).splitlines()]
+        assert [r['type'] for r in records] == ['post', 'comment', 'like', 'following', 'follower']
+        assert records[0]['content'] == 'my post'
+        assert records[3]['followed__username'] == 'otheruser'
+
+    def test_csv_export(self, authenticated_client, user_data):
+        response = authenticated_client.get('/users/me/export/?format=csv')
+
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert response['Content-Type'] == 'text/csv'
+        assert len(rows) == 5
+        assert rows[1]['type'] == 'comment' and rows[1]['content'] == 'nice'
+
+    def test_unknown_format(self, authenticated_client):
+        assert authenticated_client.get('/users/me/export/?format=xml').status_code == 400
+
+
+@pytest.mark.django_db
+class TestExportCommandAndTask:
+    """Test the management command and background task."""
+
+    def test_command_writes_ndjson(self, user, user_data):
+        out = io.StringIO()
+        call_command('export_user_data', user.username, stdout=out, stderr=io.StringIO())
+
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 5
+        assert json.loads(lines[2])['type'] == 'like'
+
+    def test_task_writes_file(self, user, user_data, tmp_path):
+        path = tmp_path / "export.csv"
+        result = export_user_data.delay(user.id, "csv", str(path)).get()
+
+        assert result == {'path': str(path), 'lines': 6}
+        assert path.read_text().startswith('type,id,post_id')
@@ -0,0 +1,101 @@
+# test/test_user_stats.py
+import pytest
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.posts.models import Like, UserStats
+from apps.posts.services import (
+    get_user_stats,
+    toggle_like,
+    create_comment,
+    delete_comment,
+    compute_user_stats,
+    rebuild_all_user_stats,
+)
+from apps.follows.services import follow_user, unfollow_user
+
+
+@pytest.mark.django_db
+class TestUserStatsCounters:
+    """Test incremental maintenance of the materialized stats row."""
+
+    def test_stats_built_on_first_read(self, user, other_user, post_factory):
+        post_factory(author=user)
+        stats = get_user_stats(user.id)
+        assert stats['posts_count'] == 1
+        assert UserStats.objects.filter(user=user).exists()
+
+    def test_like_and_unlike_update_counters(self, user, other_user, post):
+        get_user_stats(user.id)
+
+        toggle_like(post, other_user)
+        assert get_user_stats(user.id)['total_likes_received'] == 1
+
+        toggle_like(post, other_user)
+        assert get_user_stats(user.id)['total_likes_received'] == 0
+
+    def test_comments_update_counters(self, user, other_user, post):
+        get_user_stats(user.id)
+
+        comment = create_comment(post, other_user, "Nice")
+        assert get_user_stats(user.id)['total_comments_received'] == 1
+
+        delete_comment(comment)
+        assert get_user_stats(user.id)['total_comments_received'] == 0
+
+    def test_follow_updates_both_users(self, user, other_user):
+        get_user_stats(user.id)
+        get_user_stats(other_user.id)
+
+        follow_user(user, other_user)
+        assert get_user_stats(user.id)['following_count'] == 1
+        assert get_user_stats(other_user.id)['followers_count'] == 1
+
+        unfollow_user(user, other_user)
+        assert get_user_stats(user.id)['following_count'] == 0
+        assert get_user_stats(other_user.id)['followers_count'] == 0
+
+    def test_rebuild_corrects_drift(self, user, other_user, post):
+        get_user_stats(user.id)
+        # Write behind the services' back so the row drifts
+        Like.objects.create(post=post, user=other_user)
+
+        rebuild_all_user_stats(chunk_size=1)
+
+        assert get_user_stats(user.id) == compute_user_stats(user.id)
+        assert get_user_stats(user.id)['total_likes_received'] == 1
+
+    def test_cached_read_is_query_free(self, user):
+        get_user_stats(user.id)
+        with CaptureQueriesContext(connection) as ctx:
+            get_user_stats(user.id)
+        assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+class TestUserStatsQuery:
+    """Test the userStats GraphQL query."""
+
+    def test_user_stats_query(self, authenticated_client, user, other_user, post):
+        toggle_like(post, other_user)
+
+        query = """
+            query UserStats($userId: ID!) {
+                userStats(userId: $userId) {
+                    postsCount
+                    totalLikesReceived
+                    totalCommentsReceived
+                }
+            }
+        """
+        response = authenticated_client.post(
+            '/graphql/',
+            data=json.dumps({'query': query, 'variables': {"userId": str(user.id)}}),
+            content_type='application/json'
+        )
+
+        data = response.json()
+        assert 'errors' not in data
+        assert data['data']['userStats']['postsCount'] == 1
+        assert data['data']['userStats']['totalLikesReceived'] == 1
+        assert data['data']['userStats']['totalCommentsReceived'] == 0